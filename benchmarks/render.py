@@ -0,0 +1,392 @@
+"""
+Headless rendering benchmarks for the pygame UI.
+
+Drives every screen through scripted frames under the dummy video driver and
+reports the median time per frame, memory allocated per frame and time per
+draw helper, then compares the numbers with benchmarks/baseline.json.
+
+    python -m benchmarks.render                      # run and compare
+    python -m benchmarks.render --update-baseline    # run and store the baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from flagguessr.presentation.gui import GUI  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+HELPER_PREFIXES = ("draw_", "_draw_", "_paint_", "render_text")
+
+
+class ScriptedInput:
+    """Deterministic stand-in for the mouse position and the millisecond clock."""
+
+    def __init__(self):
+        self.mouse = (0, 0)
+        self.ticks = 0
+
+    def get_pos(self):
+        return self.mouse
+
+    def get_ticks(self):
+        return self.ticks
+
+
+class HelperTimer:
+    """Inclusive wall time and call count of every draw helper on one GUI."""
+
+    def __init__(self, ui: GUI):
+        self.totals: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        for name in dir(type(ui)):
+            if name.startswith(HELPER_PREFIXES) and callable(getattr(ui, name)):
+                setattr(ui, name, self._wrap(name, getattr(ui, name)))
+
+    def _wrap(self, name, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+                self.calls[name] = self.calls.get(name, 0) + 1
+
+        return timed
+
+    def reset(self):
+        self.totals.clear()
+        self.calls.clear()
+
+
+def _sample_flags(ui: GUI, count: int) -> dict[str, pygame.Surface]:
+    flags = {}
+    for i in range(count):
+        surface = pygame.Surface(ui.getFlagSize())
+        surface.fill(((i * 53) % 256, (i * 97) % 256, (i * 151) % 256))
+        flags[f"country{i}"] = surface
+    return flags
+
+
+def _sample_scores(rows: int) -> list[tuple]:
+    modes = ("normal", "endless", "blitz")
+    return [
+        (
+            rows - i,
+            f"2026-02-{1 + i % 28:02d} 10:{i % 60:02d}:00",
+            "europe",
+            "italy,france,spain",
+            "germany" if i % 2 else "",
+            modes[i % 3],
+            (i * 7) % 60,
+            3 + i % 20,
+            '{"completion": true}' if i % 5 == 0 else "{}",
+        )
+        for i in range(rows)
+    ]
+
+
+def build_scenarios(ui: GUI, scripted: ScriptedInput, rows: int) -> dict[str, Callable[[int], None]]:
+    """Scenario name -> frame(i) callable. Each frame mutates what a real user would."""
+    gamemodes = ["global", "europe", "oceania", "africa", "asia", "america"]
+    flags = _sample_flags(ui, 16)
+    countries = list(flags)
+    scores = _sample_scores(rows)
+    splash_buttons = [ui.play_button_rect, ui.splash_rankings_button_rect, ui.splash_quit_button_rect]
+    mode_cards = [ui.mode_normal_button_rect, ui.mode_endless_button_rect, ui.mode_blitz_button_rect]
+    letters = "abcdefghij"
+
+    def hover(rects, i, every=10):
+        rect = rects[(i // every) % len(rects)]
+        scripted.mouse = rect.center
+        ui.set_mouse_x_y(scripted.mouse)
+
+    def splash_idle(i):
+        ui.showSplashScreen()
+
+    def splash_full_repaint(i):
+        ui.invalidate()
+        ui.showSplashScreen()
+
+    def splash_hover(i):
+        hover(splash_buttons, i)
+        ui.showSplashScreen()
+
+    def mode_selection(i):
+        hover(mode_cards, i)
+        ui.mode_map_dropdown_open = (i // 30) % 2 == 1
+        ui.showModeSelection(gamemodes)
+
+    def loading(i):
+        # The spinner turns every frame; the panel only changes as flags come in.
+        step = i % 90
+        if step < 30:
+            ui.showLoading("normal", "europe", "Loading countries")
+        else:
+            ui.showLoading("normal", "europe", "Preparing first flags", min(4, (step - 30) // 15), 4)
+
+    def game_typing(i):
+        if i % 12 == 0:
+            ui.set_input_text("")
+            if i % 24 == 0:
+                ui.show_error_message(f"Wrong! It was: {countries[i % len(countries)]}")
+        else:
+            ui.set_input_text(ui.get_input_text() + letters[i % len(letters)])
+        current = countries[(i // 12) % len(countries)]
+        ui.showGame(current, i // 12, flags, 3, "normal", 0, 60, i // 12)
+
+    def game_blitz(i):
+        current = countries[(i // 30) % len(countries)]
+        ui.showGame(current, i // 30, flags, 3, "blitz", 1, 60, 1 + i // 30)
+
+    def rankings_scroll(i):
+        ui.showRankings(scores, "europe")
+        ui.scroll_y = (i * 14) % max(1, int(ui.max_scroll_y) + 1)
+
+    def rankings_map_selection(i):
+        hover([ui.rank_mode_global_button_rect, ui.rank_mode_asia_button_rect, ui.rank_mode_africa_button_rect], i)
+        ui.showModeSelectionScreen()
+
+    def game_over(i):
+        hover([ui.quit_button_rect, ui.rankings_button_rect, ui.main_menu_button_rect], i)
+        ui.showGameOver(i // 40, countries[:5], "europe")
+
+    def victory(i):
+        hover([ui.quit_button_rect, ui.rankings_button_rect, ui.main_menu_button_rect], i)
+        ui.showVictory(len(countries), "europe")
+
+    return {
+        "splash_idle": splash_idle,
+        "splash_full_repaint": splash_full_repaint,
+        "splash_hover": splash_hover,
+        "mode_selection": mode_selection,
+        "loading": loading,
+        "game_typing": game_typing,
+        "game_blitz": game_blitz,
+        "rankings_scroll": rankings_scroll,
+        "rankings_map_selection": rankings_map_selection,
+        "game_over": game_over,
+        "victory": victory,
+    }
+
+
+def _reset_ui(ui: GUI, scripted: ScriptedInput) -> None:
+    scripted.mouse = (0, 0)
+    scripted.ticks = 0
+    ui.set_mouse_x_y(scripted.mouse)
+    ui.set_input_text("")
+    ui.clear_error_message()
+    ui.mode_map_dropdown_open = False
+    ui.music_dropdown_open = False
+    ui.scroll_y = 0
+    ui.selected_rankings_filter = "all"
+    ui.invalidate()
+
+
+def _warm_up(ui, scripted, frame, warmup):
+    _reset_ui(ui, scripted)
+    for i in range(warmup):
+        scripted.ticks = i * 16
+        frame(i)
+
+
+class ScenarioTimings:
+    """Frame times and helper totals of one scenario, over every timing pass."""
+
+    def __init__(self):
+        self.passes: list[list[float]] = []
+        self.helper_totals: dict[str, float] = {}
+        self.helper_calls: dict[str, int] = {}
+
+    def add_pass(self, durations: list[float], timer: HelperTimer) -> None:
+        self.passes.append(durations)
+        for name, total in timer.totals.items():
+            self.helper_totals[name] = self.helper_totals.get(name, 0.0) + total
+            self.helper_calls[name] = self.helper_calls.get(name, 0) + timer.calls[name]
+
+
+def time_pass(ui, scripted, timer, frame, frames, warmup, timings: ScenarioTimings) -> None:
+    _warm_up(ui, scripted, frame, warmup)
+    timer.reset()
+    durations = []
+    for i in range(frames):
+        scripted.ticks = (warmup + i) * 16
+        start = time.perf_counter()
+        frame(warmup + i)
+        durations.append(time.perf_counter() - start)
+    timings.add_pass(durations, timer)
+
+
+def measure_allocations(ui, scripted, frame, frames, warmup) -> list[int]:
+    # tracemalloc slows everything down, so allocations get their own pass.
+    _warm_up(ui, scripted, frame, warmup)
+    allocated = []
+    tracemalloc.start()
+    try:
+        for i in range(frames):
+            scripted.ticks = (warmup + i) * 16
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            frame(warmup + i)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return allocated
+
+
+def summarize(timings: ScenarioTimings, allocated: list[int]) -> dict:
+    durations = [duration for durations in timings.passes for duration in durations]
+    total = sum(durations)
+    measured = len(durations)
+    helpers = {
+        name: {
+            "ms_per_frame": round(timings.helper_totals[name] * 1000 / measured, 4),
+            "calls_per_frame": round(timings.helper_calls[name] / measured, 2),
+        }
+        for name in sorted(timings.helper_totals, key=timings.helper_totals.get, reverse=True)
+    }
+    return {
+        "frames": len(timings.passes[0]),
+        "repeats": len(timings.passes),
+        "fps": round(measured / total, 1) if total else None,
+        # Median of the per-pass medians: one pass of sub-0.1 ms frames is mostly scheduler noise.
+        "ms_per_frame_p50": round(statistics.median(statistics.median(p) for p in timings.passes) * 1000, 4),
+        "ms_per_frame_max": round(max(durations) * 1000, 4),
+        "alloc_kib_per_frame": round(statistics.mean(allocated) / 1024, 2),
+        "helpers": helpers,
+    }
+
+
+def run_benchmarks(frames: int, warmup: int, rows: int, only: list[str] | None = None, repeats: int = 5) -> dict:
+    pygame.init()
+    scripted = ScriptedInput()
+    real_get_pos, real_get_ticks = pygame.mouse.get_pos, pygame.time.get_ticks
+    pygame.mouse.get_pos, pygame.time.get_ticks = scripted.get_pos, scripted.get_ticks
+    try:
+        ui = GUI()
+        timer = HelperTimer(ui)
+        scenarios = {
+            name: frame
+            for name, frame in build_scenarios(ui, scripted, rows).items()
+            if not only or name in only
+        }
+        timings = {name: ScenarioTimings() for name in scenarios}
+        # Passes are interleaved across scenarios, so a slow spell on the machine
+        # lands on one pass of each scenario instead of every pass of one.
+        for _ in range(repeats):
+            for name, frame in scenarios.items():
+                time_pass(ui, scripted, timer, frame, frames, warmup, timings[name])
+        results = {}
+        for name, frame in scenarios.items():
+            results[name] = summarize(timings[name], measure_allocations(ui, scripted, frame, frames, warmup))
+            print(
+                f"{name:<24} {results[name]['ms_per_frame_p50']:>8.4f} ms/frame  {results[name]['fps']:>9} fps"
+                f"  {results[name]['alloc_kib_per_frame']:>8} KiB/frame"
+            )
+    finally:
+        pygame.mouse.get_pos, pygame.time.get_ticks = real_get_pos, real_get_ticks
+        pygame.quit()
+
+    return {
+        "meta": {
+            "frames": frames,
+            "warmup": warmup,
+            "repeats": repeats,
+            "rankings_rows": rows,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float) -> list[str]:
+    """
+    Scenarios slower or allocating more than `tolerance` (a fraction) versus the
+    baseline. Frame time only counts as slower when the median also grew by at
+    least `min_ms`, so noise on very cheap frames is not reported.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        before, after = previous.get("ms_per_frame_p50"), current["ms_per_frame_p50"]
+        if before and after > before * (1 + tolerance) and after - before >= min_ms:
+            regressions.append(f"{name}: {after} ms/frame > baseline {before} ms/frame")
+        if current["alloc_kib_per_frame"] > previous["alloc_kib_per_frame"] * (1 + tolerance) + 1:
+            regressions.append(
+                f"{name}: {current['alloc_kib_per_frame']} KiB/frame > baseline {previous['alloc_kib_per_frame']} KiB/frame"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless FlagGuessr rendering benchmarks.")
+    parser.add_argument("--frames", type=int, default=120, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured frames per scenario")
+    parser.add_argument("--repeats", type=int, default=5, help="timing passes per scenario")
+    parser.add_argument("--rows", type=int, default=200, help="rows in the rankings table")
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="allowed regression, as a fraction")
+    parser.add_argument("--min-ms", type=float, default=0.05, help="ignore frame time differences below this")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--output", help="also write the full results to this JSON file")
+    parser.add_argument("--helpers", type=int, default=5, help="slowest draw helpers to print per scenario")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.frames, args.warmup, args.rows, args.scenario, args.repeats)
+
+    if args.helpers:
+        for name, scenario in results["scenarios"].items():
+            slowest = list(scenario["helpers"].items())[: args.helpers]
+            print(f"\n{name}")
+            for helper, stats in slowest:
+                print(f"  {helper:<32} {stats['ms_per_frame']:>8.4f} ms/frame  {stats['calls_per_frame']:>6} calls")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.min_ms)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
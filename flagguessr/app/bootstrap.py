@@ -1,19 +1,37 @@
 from __future__ import annotations
 
+import os
+import time
+
 import pygame
 
 from flagguessr.infrastructure import audio
 from flagguessr.application.use_cases import GameService
 from flagguessr.domain.models import GameConfig
 from flagguessr.infrastructure.flag_catalog import SQLiteFlagCatalog
+from flagguessr.infrastructure.flag_disk_cache import FlagDiskCache
+from flagguessr.infrastructure.remote_scores import RemoteScoreRepository
 from flagguessr.infrastructure.repositories import SQLiteScoreRepository
+from flagguessr.infrastructure.score_writer import WriteBehindScoreRepository
 from flagguessr.presentation.controller import GameController
 from flagguessr.presentation.gui import GUI
 from flagguessr.shared.paths import get_user_data_path, resource_path
 
 
-def create_game_controller() -> GameController:
-    pygame.init()
+def _init_pygame() -> None:
+    # Only what the splash screen needs. pygame.init() would also open the audio
+    # device; the music worker opens the mixer instead.
+    pygame.display.init()
+    pygame.font.init()
+    # pygame.time.get_ticks() reads 0 until SDL's timer subsystem is up, and
+    # outside pygame.init() only set_timer() starts it.
+    pygame.time.set_timer(pygame.USEREVENT, 60_000)
+    pygame.time.set_timer(pygame.USEREVENT, 0)
+
+
+def create_game_controller(started_at: float | None = None) -> GameController:
+    started_at = time.perf_counter() if started_at is None else started_at
+    _init_pygame()
     try:
         icon = pygame.image.load(resource_path("data/icon.ico"))
         pygame.display.set_icon(icon)
@@ -23,8 +41,22 @@ def create_game_controller() -> GameController:
     scores_db_path = get_user_data_path("scores.db")
     flags_db_path = get_user_data_path("flags.db")
 
-    score_repository = SQLiteScoreRepository(scores_db_path)
-    flag_catalog = SQLiteFlagCatalog(flags_db_path)
+    # Kiosks sharing one leaderboard point this at a running score_server.
+    score_server_url = os.environ.get("FLAGGUESSR_SCORE_SERVER", "").strip()
+    if score_server_url:
+        score_repository = RemoteScoreRepository(
+            score_server_url,
+            spool_path=get_user_data_path("unsent_scores.jsonl"),
+        )
+    else:
+        score_repository = WriteBehindScoreRepository(
+            SQLiteScoreRepository(scores_db_path),
+            journal_path=get_user_data_path("scores.journal"),
+        )
+    flag_catalog = SQLiteFlagCatalog(
+        flags_db_path,
+        disk_cache=FlagDiskCache(get_user_data_path("flag_cache")),
+    )
     config = GameConfig()
 
     game_service = GameService(
@@ -32,11 +64,14 @@ def create_game_controller() -> GameController:
         flag_catalog=flag_catalog,
         config=config,
     )
-    game_service.initialize()
-
-    if not audio.init_mixer():
-        print("Warning: Audio mixer failed to initialize. Music will not work.")
-    audio.play_music(random_song=True)
+    # Migrations and the flags DB sync run while the splash screen is up;
+    # start_game() and get_rankings() wait for them.
+    if isinstance(score_repository, RemoteScoreRepository):
+        # Rankings change without a local save when other kiosks submit scores.
+        score_repository.on_update.append(game_service.rankings_cache.clear)
+    game_service.initialize_in_background()
+    # The library scan and the audio device setup run on their own worker too.
+    audio.play_music_in_background(random_song=True)
 
     game_gui = GUI()
     return GameController(
@@ -44,4 +79,5 @@ def create_game_controller() -> GameController:
         game_service=game_service,
         config=config,
         gamemodes=["global", "europe", "oceania", "africa", "asia", "america"],
+        started_at=started_at,
     )
@@ -0,0 +1,281 @@
+"""
+Simulate large numbers of games across processes and aggregate the results.
+
+    python -m flagguessr.app.simulate --games 1000000 --map europe
+    python -m flagguessr.app.simulate --mode blitz --think-ms 1500 4000 -o blitz.json.gz
+
+Games are split into fixed-size chunks, each played by the headless engine
+with its own seed derived from --seed, so results do not depend on the
+number of workers. Per-mode outcomes, score histograms and per-country error
+rates are merged in the parent and written as gzipped column-oriented JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from flagguessr.application.headless import (
+    HeadlessFlagCatalog,
+    NullScoreRepository,
+    RandomPlayer,
+    SessionResult,
+    create_headless_engine,
+)
+from flagguessr.domain.models import GameConfig
+from flagguessr.infrastructure import db
+from flagguessr.shared.paths import get_user_data_path
+
+FORMAT = "flagguessr-simulation/1"
+MODES = ("normal", "endless", "blitz")
+OUTCOMES = ("victory", "game_over", "timed_out", "gave_up", "capped")
+
+
+@dataclass
+class ModeStats:
+    games: int = 0
+    guesses: int = 0
+    wrong: int = 0
+    duration_ms: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    # score -> number of games
+    scores: Counter = field(default_factory=Counter)
+
+    def add(self, result: SessionResult) -> None:
+        self.games += 1
+        self.guesses += result.guesses
+        self.wrong += result.wrong
+        self.duration_ms += result.duration_ms
+        self.outcomes[result.outcome] += 1
+        self.scores[result.score] += 1
+
+    def merge(self, other: "ModeStats") -> None:
+        self.games += other.games
+        self.guesses += other.guesses
+        self.wrong += other.wrong
+        self.duration_ms += other.duration_ms
+        self.outcomes.update(other.outcomes)
+        self.scores.update(other.scores)
+
+    def score_percentile(self, fraction: float) -> int:
+        target = fraction * self.games
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen >= target:
+                return score
+        return 0
+
+
+@dataclass
+class SimulationStats:
+    modes: dict[str, ModeStats] = field(default_factory=dict)
+    # country -> guesses on its flag / wrong guesses on its flag
+    asked: Counter = field(default_factory=Counter)
+    missed: Counter = field(default_factory=Counter)
+
+    def add(self, result: SessionResult) -> None:
+        self.modes.setdefault(result.mode, ModeStats()).add(result)
+        self.asked.update(result.answered)
+        self.missed.update(result.wrong_countries)
+
+    def merge(self, other: "SimulationStats") -> None:
+        for mode, stats in other.modes.items():
+            self.modes.setdefault(mode, ModeStats()).merge(stats)
+        self.asked.update(other.asked)
+        self.missed.update(other.missed)
+
+    @property
+    def games(self) -> int:
+        return sum(stats.games for stats in self.modes.values())
+
+    def columns(self) -> dict[str, dict[str, list[Any]]]:
+        """The results as tables of parallel columns."""
+        modes = sorted(self.modes)
+        mode_table: dict[str, list[Any]] = {"mode": modes}
+        mode_table["games"] = [self.modes[mode].games for mode in modes]
+        for outcome in OUTCOMES:
+            mode_table[outcome] = [self.modes[mode].outcomes[outcome] for mode in modes]
+        mode_table["completion_rate"] = [
+            round(self.modes[mode].outcomes["victory"] / self.modes[mode].games, 6) for mode in modes
+        ]
+        mode_table["score_mean"] = [
+            round(sum(score * n for score, n in self.modes[mode].scores.items()) / self.modes[mode].games, 4)
+            for mode in modes
+        ]
+        for name, fraction in (("score_p50", 0.5), ("score_p90", 0.9), ("score_p99", 0.99)):
+            mode_table[name] = [self.modes[mode].score_percentile(fraction) for mode in modes]
+        mode_table["guesses_per_game"] = [round(self.modes[mode].guesses / self.modes[mode].games, 4) for mode in modes]
+        mode_table["duration_ms_mean"] = [round(self.modes[mode].duration_ms / self.modes[mode].games, 1) for mode in modes]
+
+        score_table: dict[str, list[Any]] = {"mode": [], "score": [], "games": []}
+        for mode in modes:
+            for score, games in sorted(self.modes[mode].scores.items()):
+                score_table["mode"].append(mode)
+                score_table["score"].append(score)
+                score_table["games"].append(games)
+
+        countries = sorted(self.asked)
+        country_table = {
+            "country": countries,
+            "asked": [self.asked[country] for country in countries],
+            "wrong": [self.missed[country] for country in countries],
+            "error_rate": [round(self.missed[country] / self.asked[country], 6) for country in countries],
+        }
+        return {"modes": mode_table, "scores": score_table, "countries": country_table}
+
+
+@dataclass(frozen=True)
+class SimulationTask:
+    mode: str
+    map_name: str
+    games: int
+    seed: int
+    player: RandomPlayer
+    config: GameConfig
+
+
+# Set once per worker process by _init_worker, so tasks only carry their own parameters.
+_worker_catalog: HeadlessFlagCatalog | None = None
+
+
+def _init_worker(countries: dict[str, str], aliases: dict[str, list[str]]) -> None:
+    global _worker_catalog
+    _worker_catalog = HeadlessFlagCatalog(countries, aliases)
+
+
+def run_task(task: SimulationTask) -> SimulationStats:
+    engine = create_headless_engine(
+        _worker_catalog,
+        score_repository=NullScoreRepository(),
+        config=task.config,
+        seed=task.seed,
+    )
+    stats = SimulationStats()
+    for _ in range(task.games):
+        stats.add(engine.play(task.mode, task.map_name, task.player))
+    return stats
+
+
+def plan_tasks(
+    modes: list[str],
+    map_name: str,
+    games: int,
+    chunk_size: int,
+    seed: int,
+    player: RandomPlayer,
+    config: GameConfig,
+) -> list[SimulationTask]:
+    """`games` games per mode, in chunks that each get a seed drawn from `seed`."""
+    seeds = random.Random(seed)
+    tasks = []
+    for mode in modes:
+        for start in range(0, games, chunk_size):
+            tasks.append(
+                SimulationTask(mode, map_name, min(chunk_size, games - start), seeds.getrandbits(64), player, config)
+            )
+    return tasks
+
+
+def run_simulation(
+    tasks: list[SimulationTask],
+    countries: dict[str, str],
+    aliases: dict[str, list[str]],
+    workers: int = 1,
+    progress: bool = False,
+) -> SimulationStats:
+    total = SimulationStats()
+    if workers <= 1:
+        _init_worker(countries, aliases)
+        for task in tasks:
+            total.merge(run_task(task))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(countries, aliases)) as pool:
+        futures = [pool.submit(run_task, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            total.merge(future.result())
+            if progress:
+                print(f"\r{done}/{len(futures)} chunks", end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    return total
+
+
+def write_results(path: str, stats: SimulationStats, meta: dict[str, Any]) -> None:
+    payload = {"format": FORMAT, "meta": meta, **stats.columns()}
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+
+
+def load_catalog(flags_db_path: str) -> tuple[dict[str, str], dict[str, list[str]]]:
+    db.populate_flags_database(flags_db_path)
+    return db.get_countries(flags_db_path), db.get_country_aliases(flags_db_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate FlagGuessr games across processes.")
+    parser.add_argument("--games", type=int, default=100_000, help="games per mode")
+    parser.add_argument("--mode", action="append", choices=MODES, help="mode to simulate (repeatable; default all)")
+    parser.add_argument("--map", default="europe", help="map to play (a continent or global)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=5_000, help="games per task")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the per-chunk seeds")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance a simulated player answers correctly")
+    parser.add_argument("--think-ms", type=int, nargs=2, default=(800, 2500), metavar=("MIN", "MAX"))
+    parser.add_argument("--typo-rate", type=float, default=0.0, help="share of correct answers typed with a typo")
+    parser.add_argument("--blitz-seconds", type=int, default=GameConfig.blitz_time_limit_seconds)
+    parser.add_argument("--lives", type=int, default=GameConfig.max_lives)
+    parser.add_argument("--flags-db", default=None, help="flags database (default: the game's)")
+    parser.add_argument("-o", "--output", default="simulation.json.gz", help="gzipped JSON results")
+    args = parser.parse_args(argv)
+
+    countries, aliases = load_catalog(args.flags_db or get_user_data_path("flags.db"))
+    map_countries = HeadlessFlagCatalog(countries).load_countries(args.map)
+    if not map_countries:
+        print(f"No countries found for map {args.map!r}.", file=sys.stderr)
+        return 1
+
+    modes = args.mode or list(MODES)
+    player = RandomPlayer(accuracy=args.accuracy, think_ms=tuple(args.think_ms), typo_rate=args.typo_rate)
+    config = GameConfig(max_lives=args.lives, blitz_time_limit_seconds=args.blitz_seconds, flag_prefetch_count=0)
+    tasks = plan_tasks(modes, args.map, args.games, args.chunk_size, args.seed, player, config)
+
+    started = time.perf_counter()
+    stats = run_simulation(tasks, countries, aliases, workers=args.workers, progress=sys.stderr.isatty())
+    elapsed = time.perf_counter() - started
+
+    meta = {
+        "games": stats.games,
+        "map": args.map,
+        "seed": args.seed,
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "player": asdict(player),
+        "config": asdict(config),
+        "elapsed_s": round(elapsed, 3),
+        "games_per_s": round(stats.games / elapsed, 1) if elapsed else None,
+    }
+    write_results(args.output, stats, meta)
+
+    table = stats.columns()["modes"]
+    print(f"{stats.games} games in {elapsed:.1f} s ({meta['games_per_s']} games/s) -> {args.output}")
+    print(f"{'mode':<8} {'games':>9} {'complete':>9} {'mean':>8} {'p50':>5} {'p90':>5} {'p99':>5}")
+    for i, mode in enumerate(table["mode"]):
+        print(
+            f"{mode:<8} {table['games'][i]:>9} {table['completion_rate'][i]:>9.3%} {table['score_mean'][i]:>8.2f}"
+            f" {table['score_p50'][i]:>5} {table['score_p90'][i]:>5} {table['score_p99'][i]:>5}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
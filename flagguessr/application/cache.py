@@ -0,0 +1,108 @@
+"""Read-side caches for application use cases."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from flagguessr.domain.matching import PrefixTrie
+
+RankingsKey = tuple[str, str, int]
+
+
+@dataclass
+class RankingsCache:
+    """
+    Top-score query results keyed by (map, filter, limit).
+
+    Thread-safe, so a repository that refreshes its data in the background can
+    clear() it from its own thread.
+    """
+
+    entries: dict[RankingsKey, list[tuple[Any, ...]]] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def get_or_load(
+        self,
+        map_name: str,
+        filter_mode: str,
+        limit: int,
+        loader: Callable[[], list[tuple[Any, ...]]],
+    ) -> list[tuple[Any, ...]]:
+        key = (map_name, filter_mode, limit)
+        with self._lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            # Loaded under the lock so a concurrent clear() cannot be undone by a stale result.
+            self.misses += 1
+            rows = list(loader())
+            self.entries[key] = rows
+            return rows
+
+    def invalidate(self, map_name: str, game_mode: str) -> None:
+        """Drop only the entries a new score for (map, mode) can change."""
+        with self._lock:
+            stale = [
+                key for key in self.entries
+                if key[0] == map_name and key[1] in ("all", game_mode)
+            ]
+            for key in stale:
+                del self.entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+@dataclass
+class AutocompleteCache:
+    """
+    One autocomplete trie per map, for the countries that map was last played
+    with; least recently used maps are evicted past max_entries.
+
+    Thread-safe: games start on the loading worker and in headless engines.
+    """
+
+    max_entries: int = 8
+    entries: OrderedDict[str, tuple[frozenset[str], PrefixTrie]] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def get_or_build(
+        self,
+        map_name: str,
+        countries: frozenset[str],
+        builder: Callable[[], PrefixTrie],
+    ) -> PrefixTrie:
+        with self._lock:
+            cached = self.entries.get(map_name)
+            if cached is not None and cached[0] == countries:
+                self.hits += 1
+                self.entries.move_to_end(map_name)
+                return cached[1]
+
+            # Tries are read-only once built, so every game on the map shares one.
+            self.misses += 1
+            trie = builder()
+            self.entries[map_name] = (countries, trie)
+            self.entries.move_to_end(map_name)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return trie
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
@@ -0,0 +1,330 @@
+"""
+Headless game engine.
+
+Drives GameService with the same strategies and sessions as the pygame UI, but
+with an injectable clock, no flag images and scripted or random players, so
+thousands of games can be played per second without a display. Used for
+balancing blitz timing and for load-testing score repositories.
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from flagguessr.application.ports import FlagCatalog, ScoreRepository
+from flagguessr.application.use_cases import GameService
+from flagguessr.domain.models import GameConfig, GameSession, GuessStatus
+
+# Submitted by players that answer wrong on purpose; never a country name.
+WRONG_ANSWER = "?"
+
+
+class Clock(Protocol):
+    def now_ms(self) -> int:
+        ...
+
+    def advance(self, ms: int) -> None:
+        ...
+
+
+class ManualClock:
+    """Simulated millisecond clock that only moves when advanced."""
+
+    def __init__(self, start_ms: int = 1000):
+        # Sessions treat a start time of 0 as "not started", so never begin there.
+        self._now_ms = max(1, int(start_ms))
+
+    def now_ms(self) -> int:
+        return self._now_ms
+
+    def advance(self, ms: int) -> None:
+        self._now_ms += max(0, int(ms))
+
+
+class HeadlessFlagCatalog:
+    """FlagCatalog over an in-memory {country: continent} map that loads no images."""
+
+    def __init__(self, countries: Mapping[str, str], aliases: Mapping[str, list[str]] | None = None):
+        self.countries = dict(countries)
+        self.aliases = {country: list(names) for country, names in (aliases or {}).items()}
+
+    @classmethod
+    def from_catalog(cls, catalog: FlagCatalog) -> "HeadlessFlagCatalog":
+        """Snapshot the countries and aliases of an initialized catalog."""
+        return cls(catalog.load_countries("global"), catalog.load_aliases())
+
+    def initialize(self) -> None:
+        return None
+
+    def load_countries(self, map_name: str) -> dict[str, str]:
+        map_name = map_name.lower()
+        if map_name == "global":
+            return dict(self.countries)
+        return {country: continent for country, continent in self.countries.items() if continent == map_name}
+
+    def load_flag_images(self, countries: dict[str, str], size: tuple[int, int]) -> dict[str, None]:
+        return dict.fromkeys(countries)
+
+    def prefetch_flags(self, flag_images, countries: list[str]) -> None:
+        return None
+
+    def is_flag_ready(self, flag_images, country: str) -> bool:
+        return True
+
+    def is_flag_available(self, flag_images, country: str) -> bool:
+        return True
+
+    def load_aliases(self) -> dict[str, list[str]]:
+        return self.aliases
+
+    def close(self) -> None:
+        return None
+
+
+class MemoryScoreRepository:
+    """ScoreRepository that keeps saved scores in a list."""
+
+    def __init__(self):
+        self.saved: list[dict[str, Any]] = []
+
+    def initialize(self) -> None:
+        return None
+
+    def save_score(self, session: GameSession, time_taken: int, flags_shown: int, mode_data: dict[str, Any]) -> None:
+        self.saved.append(
+            {
+                "score": session.score,
+                "mode": session.mode.value,
+                "map": session.map_name,
+                "time_taken": time_taken,
+                "flags_shown": flags_shown,
+                "mode_data": mode_data,
+            }
+        )
+
+    def get_top_scores(self, gamemode: str, filter_mode: str = "all", limit: int = 10) -> list[tuple[Any, ...]]:
+        rows = [
+            row
+            for row in self.saved
+            if row["map"] == gamemode and filter_mode in ("all", row["mode"])
+        ]
+        rows.sort(key=lambda row: row["score"], reverse=True)
+        return [(row["score"], row["mode"], row["map"], row["time_taken"], row["flags_shown"]) for row in rows[:limit]]
+
+    def close(self) -> None:
+        return None
+
+
+class NullScoreRepository(MemoryScoreRepository):
+    """ScoreRepository that drops every score, for runs too long to keep them."""
+
+    def save_score(self, session: GameSession, time_taken: int, flags_shown: int, mode_data: dict[str, Any]) -> None:
+        return None
+
+
+class Player(Protocol):
+    def next_guess(self, country: str, session: GameSession, rng: random.Random) -> tuple[str, int] | None:
+        """(guess, thinking time in ms) for the flag of `country`, or None to give up."""
+        ...
+
+
+@dataclass
+class RandomPlayer:
+    """Answers correctly with probability `accuracy` after a uniform thinking time."""
+
+    accuracy: float = 0.8
+    think_ms: tuple[int, int] = (800, 2500)
+    # Share of correct answers submitted with one letter missing, to exercise fuzzy matching.
+    typo_rate: float = 0.0
+
+    def next_guess(self, country: str, session: GameSession, rng: random.Random) -> tuple[str, int]:
+        delay = rng.randint(*self.think_ms)
+        if rng.random() >= self.accuracy:
+            return WRONG_ANSWER, delay
+        if len(country) > 8 and rng.random() < self.typo_rate:
+            cut = rng.randrange(len(country))
+            return country[:cut] + country[cut + 1:], delay
+        return country, delay
+
+
+class ScriptedPlayer:
+    """
+    Replays (answer, thinking time in ms) moves, then gives up. An answer of True
+    names the flag shown, False guesses wrong and a string is submitted as typed.
+    """
+
+    def __init__(self, moves: Iterable[tuple[bool | str, int]]):
+        self._moves = iter(moves)
+
+    def next_guess(self, country: str, session: GameSession, rng: random.Random) -> tuple[str, int] | None:
+        move = next(self._moves, None)
+        if move is None:
+            return None
+        answer, delay = move
+        if answer is True:
+            return country, delay
+        if answer is False:
+            return WRONG_ANSWER, delay
+        return answer, delay
+
+
+@dataclass(frozen=True)
+class SessionResult:
+    mode: str
+    map_name: str
+    # "victory", "game_over", "timed_out", "gave_up" or "capped" (max_guesses reached).
+    outcome: str
+    score: int
+    guesses: int
+    wrong: int
+    duration_ms: int
+    flags_shown: int
+    # The flag of every guess, in order, and the ones guessed wrong.
+    answered: tuple[str, ...] = ()
+    wrong_countries: tuple[str, ...] = ()
+
+
+@dataclass
+class BatchResult:
+    sessions: list[SessionResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        if not self.sessions:
+            return {"sessions": 0}
+        scores = sorted(result.score for result in self.sessions)
+        guesses = sum(result.guesses for result in self.sessions)
+        elapsed = self.elapsed_s or float("nan")
+        return {
+            "sessions": len(self.sessions),
+            "guesses": guesses,
+            "sessions_per_s": round(len(self.sessions) / elapsed, 1),
+            "guesses_per_s": round(guesses / elapsed, 1),
+            "score_mean": round(statistics.fmean(scores), 3),
+            "score_p50": scores[len(scores) // 2],
+            "score_p90": scores[min(len(scores) - 1, int(len(scores) * 0.9))],
+            "score_max": scores[-1],
+            "duration_ms_mean": round(statistics.fmean(result.duration_ms for result in self.sessions), 1),
+            "outcomes": dict(Counter(result.outcome for result in self.sessions)),
+        }
+
+
+class HeadlessEngine:
+    """Plays whole games against a GameService on a simulated clock."""
+
+    def __init__(
+        self,
+        service: GameService,
+        clock: Clock | None = None,
+        rng: random.Random | None = None,
+        max_guesses: int = 10_000,
+    ):
+        self.service = service
+        self.clock = clock if clock is not None else ManualClock()
+        self.rng = rng if rng is not None else random.Random()
+        # Endless games with a perfect player never end on their own.
+        self.max_guesses = max_guesses
+
+    def play(self, mode: str, map_name: str, player: Player) -> SessionResult:
+        service = self.service
+        clock = self.clock
+        start = service.start_game(mode, map_name, (0, 0), clock.now_ms())
+        if not start.success:
+            raise ValueError(start.error)
+
+        running_game = start.running_game
+        session = running_game.session
+        started_at = clock.now_ms()
+        service.begin_game(running_game, started_at)
+
+        outcome = "capped"
+        guesses = 0
+        while guesses < self.max_guesses:
+            move = player.next_guess(running_game.current_country, session, self.rng)
+            if move is None:
+                outcome = "gave_up"
+                break
+            guess, delay = move
+            clock.advance(delay)
+            if service.tick_game(running_game, clock.now_ms()):
+                outcome = "timed_out"
+                break
+
+            result = service.submit_guess(running_game, guess, clock.now_ms())
+            guesses += 1
+            if result.status == GuessStatus.VICTORY:
+                outcome = "victory"
+                break
+            if result.status == GuessStatus.GAME_OVER:
+                outcome = "game_over"
+                break
+
+        return SessionResult(
+            mode=session.mode.value,
+            map_name=session.map_name,
+            outcome=outcome,
+            score=session.score,
+            guesses=guesses,
+            # A wrong answer on the last flag of a normal game still ends in VICTORY.
+            wrong=len(session.wrong_countries),
+            duration_ms=clock.now_ms() - started_at,
+            flags_shown=max(session.flags_shown_count, len(session.countries_sequence)),
+            # Every guess either moves to the next flag or ends the game.
+            answered=tuple(session.countries_sequence[:guesses]),
+            wrong_countries=tuple(session.wrong_countries),
+        )
+
+    def run_batch(
+        self,
+        mode: str,
+        map_name: str,
+        player: Player | Callable[[int], Player],
+        sessions: int,
+    ) -> BatchResult:
+        """
+        Play `sessions` games back to back. `player` is either shared by every
+        game or a factory called with the session number (for scripted players).
+        """
+        if hasattr(player, "next_guess"):
+            shared = player
+            make_player = lambda _: shared  # noqa: E731
+        else:
+            make_player = player
+        batch = BatchResult()
+        started = time.perf_counter()
+        for i in range(sessions):
+            batch.sessions.append(self.play(mode, map_name, make_player(i)))
+        batch.elapsed_s = time.perf_counter() - started
+        return batch
+
+
+def create_headless_engine(
+    countries: Mapping[str, str] | FlagCatalog,
+    aliases: Mapping[str, list[str]] | None = None,
+    score_repository: ScoreRepository | None = None,
+    config: GameConfig | None = None,
+    seed: int | None = None,
+    clock: Clock | None = None,
+) -> HeadlessEngine:
+    """
+    Engine over a {country: continent} map or an initialized FlagCatalog, with
+    scores kept in memory unless a repository is given. One seed drives both the
+    strategies and the players, so a seeded batch is reproducible.
+    """
+    if isinstance(countries, Mapping):
+        catalog = HeadlessFlagCatalog(countries, aliases)
+    else:
+        catalog = HeadlessFlagCatalog.from_catalog(countries)
+    rng = random.Random(seed)
+    service = GameService(
+        score_repository if score_repository is not None else MemoryScoreRepository(),
+        catalog,
+        config or GameConfig(),
+        rng=random.Random(rng.random()),
+    )
+    return HeadlessEngine(service, clock=clock, rng=rng)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any, Protocol
 
 from flagguessr.domain.models import GameSession
@@ -21,6 +22,9 @@ class ScoreRepository(Protocol):
     def get_top_scores(self, gamemode: str, filter_mode: str = "all", limit: int = 10) -> list[tuple[Any, ...]]:
         ...
 
+    def close(self) -> None:
+        ...
+
 
 class FlagCatalog(Protocol):
     def initialize(self) -> None:
@@ -29,5 +33,20 @@ class FlagCatalog(Protocol):
     def load_countries(self, map_name: str) -> dict[str, str]:
         ...
 
-    def load_flag_images(self, countries: dict[str, str], size: tuple[int, int]) -> dict[str, Any]:
+    def load_flag_images(self, countries: dict[str, str], size: tuple[int, int]) -> Mapping[str, Any]:
+        ...
+
+    def prefetch_flags(self, flag_images: Mapping[str, Any], countries: list[str]) -> None:
+        ...
+
+    def is_flag_ready(self, flag_images: Mapping[str, Any], country: str) -> bool:
+        ...
+
+    def is_flag_available(self, flag_images: Mapping[str, Any], country: str) -> bool:
+        ...
+
+    def load_aliases(self) -> dict[str, list[str]]:
+        ...
+
+    def close(self) -> None:
         ...
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 
+from flagguessr.application.cache import AutocompleteCache, RankingsCache
 from flagguessr.application.ports import FlagCatalog, ScoreRepository
+from flagguessr.domain.matching import AnswerMatcher, PrefixTrie
 from flagguessr.domain.models import (
     GameConfig,
     GameMode,
@@ -20,11 +25,67 @@ class GameService:
     score_repository: ScoreRepository
     flag_catalog: FlagCatalog
     config: GameConfig
+    rankings_cache: RankingsCache = field(default_factory=RankingsCache)
+    autocomplete_cache: AutocompleteCache = field(default_factory=AutocompleteCache)
+    rng: random.Random | None = None
+    _ready: threading.Event | None = field(default=None, init=False, repr=False)
+    _answer_names: dict[str, list[str]] | None = field(default=None, init=False, repr=False)
+    _matcher: AnswerMatcher | None = field(default=None, init=False, repr=False)
+    _matcher_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _loader: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
 
     def initialize(self) -> None:
         self.score_repository.initialize()
         self.flag_catalog.initialize()
 
+    def initialize_in_background(self) -> threading.Thread:
+        """
+        Run initialize() (schema migrations, flags DB sync) on a worker thread.
+        Calls that need the stores wait for it; everything else proceeds at once.
+        """
+        self._ready = threading.Event()
+        worker = threading.Thread(target=self._initialize_and_signal, name="service-init", daemon=True)
+        worker.start()
+        return worker
+
+    def is_ready(self) -> bool:
+        """Whether background initialization has finished, without waiting for it."""
+        return self._ready is None or self._ready.is_set()
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        if self._ready is None:
+            return True
+        return self._ready.wait(timeout)
+
+    def _initialize_and_signal(self) -> None:
+        try:
+            self.initialize()
+        except Exception as e:
+            print(f"Error initializing game data: {e}")
+        finally:
+            self._ready.set()
+
+    def shutdown(self) -> None:
+        if self._loader is not None:
+            self._loader.shutdown(wait=False, cancel_futures=True)
+        self.score_repository.close()
+        self.flag_catalog.close()
+
+    def start_game_in_background(
+        self,
+        mode_value: str,
+        map_name: str,
+        flag_size: tuple[int, int],
+        now_ms: int,
+    ) -> Future:
+        """
+        Run start_game() on the service's single loader thread.
+        Starts queue behind one another, so a cancelled load never overlaps the next.
+        """
+        if self._loader is None:
+            self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="game-loader")
+        return self._loader.submit(self.start_game, mode_value, map_name, flag_size, now_ms)
+
     def start_game(
         self,
         mode_value: str,
@@ -37,6 +98,7 @@ class GameService:
         except ValueError:
             return StartGameResult(success=False, error=f"Unsupported mode: {mode_value}")
 
+        self.wait_until_ready()
         countries = self.flag_catalog.load_countries(map_name)
         if not countries:
             return StartGameResult(success=False, error="No countries found for the selected map.")
@@ -45,9 +107,13 @@ class GameService:
         if not flag_images:
             return StartGameResult(success=False, error="No flag images available for the selected map.")
 
-        all_countries = list(flag_images.keys())
-        strategy = build_mode_strategy(mode)
-        first_country = strategy.next_country(all_countries, [])
+        # Built here because start_game runs on the loading worker, so neither the
+        # first guess nor the first keystroke pays for indexing.
+        self.answer_matcher()
+        autocomplete = self._autocomplete_for(map_name, flag_images)
+
+        strategy = build_mode_strategy(mode, self.rng)
+        first_country, country_index = self._draw_playable(strategy, flag_images, tuple(flag_images.keys()), [])
         if not first_country:
             return StartGameResult(success=False, error="Unable to select an initial country.")
 
@@ -66,7 +132,11 @@ class GameService:
             countries=countries,
             flag_images=flag_images,
             current_country=first_country,
+            strategy=strategy,
+            country_index=country_index,
+            autocomplete=autocomplete,
         )
+        self._prefetch_flags(running_game)
         return StartGameResult(success=True, running_game=running_game)
 
     def tick_game(self, running_game: RunningGame, now_ms: int) -> bool:
@@ -76,7 +146,7 @@ class GameService:
 
         elapsed = (now_ms - session.start_time_ms) / 1000
         if elapsed >= self.config.blitz_time_limit_seconds:
-            self.score_repository.save_score(
+            self._save_score(
                 session=session,
                 time_taken=self.config.blitz_time_limit_seconds,
                 flags_shown=max(1, session.flags_shown_count),
@@ -87,20 +157,21 @@ class GameService:
 
     def submit_guess(self, running_game: RunningGame, raw_guess: str, now_ms: int) -> GuessResult:
         session = running_game.session
-        strategy = build_mode_strategy(session.mode)
+        if running_game.strategy is None:
+            running_game.strategy = build_mode_strategy(session.mode, self.rng)
+        if not running_game.country_index:
+            running_game.country_index = tuple(running_game.flag_images.keys())
 
         current_country = running_game.current_country
-        guess = raw_guess.strip().lower()
 
-        all_countries = list(running_game.flag_images.keys())
-        if not all_countries:
+        if not running_game.country_index:
             return GuessResult(status=GuessStatus.GAME_OVER, message="No flags loaded.")
 
-        if guess == current_country.lower():
+        if self.answer_matcher().matches(raw_guess, current_country):
             session.score += 1
-            next_country = strategy.next_country(all_countries, session.countries_sequence)
+            next_country = self._next_playable(running_game)
             if next_country is None:
-                self.score_repository.save_score(
+                self._save_score(
                     session=session,
                     time_taken=0,
                     flags_shown=len(session.countries_sequence),
@@ -110,6 +181,7 @@ class GameService:
 
             running_game.current_country = next_country
             session.countries_sequence.append(next_country)
+            self._prefetch_flags(running_game)
             if session.mode != GameMode.NORMAL:
                 session.flags_shown_count += 1
 
@@ -128,7 +200,7 @@ class GameService:
             if flags_shown <= 0:
                 flags_shown = len(session.countries_sequence)
 
-            self.score_repository.save_score(
+            self._save_score(
                 session=session,
                 time_taken=time_taken,
                 flags_shown=flags_shown,
@@ -136,9 +208,9 @@ class GameService:
             )
             return GuessResult(status=GuessStatus.GAME_OVER, message=message)
 
-        next_country = strategy.next_country(all_countries, session.countries_sequence)
+        next_country = self._next_playable(running_game)
         if next_country is None:
-            self.score_repository.save_score(
+            self._save_score(
                 session=session,
                 time_taken=0,
                 flags_shown=len(session.countries_sequence),
@@ -148,10 +220,105 @@ class GameService:
 
         running_game.current_country = next_country
         session.countries_sequence.append(next_country)
+        self._prefetch_flags(running_game)
         if session.mode != GameMode.NORMAL:
             session.flags_shown_count += 1
 
         return GuessResult(status=GuessStatus.WRONG, message=message)
 
     def get_rankings(self, map_name: str, filter_mode: str, limit: int = 10):
-        return self.score_repository.get_top_scores(map_name, filter_mode, limit=limit)
+        self.wait_until_ready()
+        return self.rankings_cache.get_or_load(
+            map_name,
+            filter_mode,
+            limit,
+            lambda: self.score_repository.get_top_scores(map_name, filter_mode, limit=limit),
+        )
+
+    def answer_names(self) -> dict[str, list[str]]:
+        """{country: aliases} for every country in the catalog, loaded once."""
+        with self._matcher_lock:
+            if self._answer_names is None:
+                self.wait_until_ready()
+                names: dict[str, list[str]] = {country: [] for country in self.flag_catalog.load_countries("global")}
+                for country, aliases in self.flag_catalog.load_aliases().items():
+                    names.setdefault(country, []).extend(aliases)
+                self._answer_names = names
+            return self._answer_names
+
+    def answer_matcher(self) -> AnswerMatcher:
+        """The fuzzy answer matcher over every country name and alias, built once."""
+        names = self.answer_names()
+        with self._matcher_lock:
+            if self._matcher is None:
+                self._matcher = AnswerMatcher(names)
+            return self._matcher
+
+    def _autocomplete_for(self, map_name: str, countries) -> PrefixTrie:
+        names = self.answer_names()
+        return self.autocomplete_cache.get_or_build(
+            map_name.lower(),
+            frozenset(countries),
+            lambda: PrefixTrie({country: names.get(country, ()) for country in countries}),
+        )
+
+    def _draw_playable(self, strategy, flag_images, country_index: tuple[str, ...], shown: list[str]):
+        """
+        (next pick, country index) for a strategy, skipping flags that fail to
+        decode. Those are dropped from the returned index, so they are never
+        drawn again; the index is only rebuilt when that happens.
+        """
+        while True:
+            country = strategy.next_country(country_index, shown)
+            if country is None or self.flag_catalog.is_flag_available(flag_images, country):
+                return country, country_index
+            print(f"Skipping {country}: its flag image could not be loaded")
+            country_index = tuple(name for name in country_index if name != country)
+
+    def _next_playable(self, running_game: RunningGame) -> str | None:
+        country, running_game.country_index = self._draw_playable(
+            running_game.strategy,
+            running_game.flag_images,
+            running_game.country_index,
+            running_game.session.countries_sequence,
+        )
+        return country
+
+    def begin_game(self, running_game: RunningGame, now_ms: int) -> None:
+        """Start the clock of a timed game once it is actually on screen."""
+        if running_game.strategy is not None and running_game.strategy.is_timed:
+            running_game.session.start_time_ms = now_ms
+
+    def is_current_flag_ready(self, running_game: RunningGame) -> bool:
+        return self.flag_catalog.is_flag_ready(running_game.flag_images, running_game.current_country)
+
+    def flag_load_progress(self, running_game: RunningGame) -> tuple[int, int]:
+        """
+        (ready, total) over the current flag and the flag_prefetch_count flags queued
+        after it: the prefetch window, not every flag of the map.
+        """
+        targets = self._flag_targets(running_game)
+        ready = sum(
+            1 for country in targets if self.flag_catalog.is_flag_ready(running_game.flag_images, country)
+        )
+        return ready, len(targets)
+
+    def _flag_targets(self, running_game: RunningGame) -> list[str]:
+        upcoming = running_game.strategy.upcoming(
+            running_game.country_index,
+            running_game.session.countries_sequence,
+            self.config.flag_prefetch_count,
+        )
+        return [running_game.current_country, *upcoming]
+
+    def _prefetch_flags(self, running_game: RunningGame) -> None:
+        self.flag_catalog.prefetch_flags(running_game.flag_images, self._flag_targets(running_game))
+
+    def _save_score(self, session: GameSession, time_taken: int, flags_shown: int, mode_data: dict) -> None:
+        self.score_repository.save_score(
+            session=session,
+            time_taken=time_taken,
+            flags_shown=flags_shown,
+            mode_data=mode_data,
+        )
+        self.rankings_cache.invalidate(session.map_name, session.mode.value)
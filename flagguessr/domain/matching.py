@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+
+_SEPARATORS = re.compile(r"[\s\-_/,.]+")
+_DROPPED = re.compile(r"['’`\"()]")
+
+
+def _fold(text: str) -> str:
+    if text.isascii():
+        folded = text.lower()
+    else:
+        decomposed = unicodedata.normalize("NFKD", text)
+        folded = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    folded = _DROPPED.sub("", folded.replace("&", " and "))
+    return _SEPARATORS.sub(" ", folded)
+
+
+@lru_cache(maxsize=4096)
+def normalize_answer(text: str) -> str:
+    """
+    Canonical form of a country name or guess: accents folded, case folded,
+    punctuation dropped, "&" spelled out, whitespace collapsed and a leading
+    article removed ("The Bahamas" -> "bahamas", "Côte d'Ivoire" -> "cote divoire").
+    """
+    folded = _fold(text).strip()
+    if folded.startswith("the "):
+        folded = folded[4:]
+    return folded
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """Edit distance between a and b, or limit + 1 as soon as it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            insert = current[j - 1] + 1
+            delete = previous[j] + 1
+            value = cost if cost < insert else insert
+            if delete < value:
+                value = delete
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def _trigrams(key: str) -> Counter[str]:
+    padded = f"  {key} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    Keys indexed by padded trigram, for bounded edit-distance lookup.
+
+    A string of length n has n + 1 padded trigrams and one edit destroys at most
+    three of them, so a key within distance k of the query shares at least
+    max(len) + 1 - 3k of them (the q-gram count filter).
+    Only keys passing that filter and the length filter reach the exact,
+    early-exit Levenshtein check.
+    """
+
+    __slots__ = ("_keys", "_postings")
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys: list[str] = []
+        # trigram -> key length -> [(key id, occurrences)]; bucketing by length
+        # means a lookup only walks postings that can pass the length filter.
+        self._postings: dict[str, dict[int, list[tuple[int, int]]]] = {}
+        for key in dict.fromkeys(keys):
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str) -> None:
+        key_id = len(self._keys)
+        self._keys.append(key)
+        for gram, count in _trigrams(key).items():
+            self._postings.setdefault(gram, {}).setdefault(len(key), []).append((key_id, count))
+
+    def search(self, query: str, max_distance: int) -> list[tuple[int, str]]:
+        """(distance, key) pairs within max_distance, closest first."""
+        lengths = range(max(0, len(query) - max_distance), len(query) + max_distance + 1)
+        if len(query) + 1 - 3 * max_distance <= 0:
+            # Too short for the count filter to be sound; scan by length instead.
+            candidates = [key for key in self._keys if len(key) in lengths]
+        else:
+            shared: dict[int, int] = {}
+            for gram, query_count in _trigrams(query).items():
+                by_length = self._postings.get(gram)
+                if by_length is None:
+                    continue
+                for length in lengths:
+                    for key_id, key_count in by_length.get(length, ()):
+                        shared[key_id] = shared.get(key_id, 0) + (key_count if key_count < query_count else query_count)
+            base = 1 - 3 * max_distance
+            query_length = len(query)
+            candidates = []
+            for key_id, count in shared.items():
+                key = self._keys[key_id]
+                if count >= (len(key) if len(key) > query_length else query_length) + base:
+                    candidates.append(key)
+
+        found = []
+        for key in candidates:
+            distance = bounded_levenshtein(query, key, max_distance)
+            if distance <= max_distance:
+                found.append((distance, key))
+        found.sort()
+        return found
+
+
+class AnswerMatcher:
+    """
+    Resolves a typed answer to a canonical country name.
+
+    Built once per catalog from {country: aliases}. Exact hits on a normalized
+    name or alias are a dict lookup; otherwise a trigram index returns the keys
+    within a length-dependent edit distance and the guess resolves only if the closest
+    ones agree on a single country.
+    """
+
+    def __init__(self, aliases_by_country: Mapping[str, Iterable[str]]):
+        self._countries: dict[str, set[str]] = {}
+        for country, aliases in aliases_by_country.items():
+            for name in (country, *aliases):
+                key = normalize_answer(name)
+                if key:
+                    self._countries.setdefault(key, set()).add(country)
+        self._index = TrigramIndex(self._countries)
+
+    def __len__(self) -> int:
+        return len(self._countries)
+
+    @staticmethod
+    def tolerance(key: str) -> int:
+        if len(key) <= 4:
+            return 0
+        if len(key) <= 8:
+            return 1
+        return 2
+
+    def candidates(self, guess: str) -> set[str]:
+        """Countries named exactly by the guess, else those tied for the closest fuzzy match."""
+        key = normalize_answer(guess)
+        if not key:
+            return set()
+
+        countries = self._countries.get(key)
+        if countries is not None:
+            return set(countries)
+
+        limit = self.tolerance(key)
+        if limit == 0:
+            return set()
+        matches = self._index.search(key, limit)
+        if not matches:
+            return set()
+        best = matches[0][0]
+        countries = set()
+        for distance, match in matches:
+            if distance != best:
+                break
+            countries |= self._countries[match]
+        return countries
+
+    def resolve(self, guess: str) -> str | None:
+        """The country the guess names, or None when unknown or ambiguous."""
+        countries = self.candidates(guess)
+        if len(countries) != 1:
+            return None
+        return next(iter(countries))
+
+    def matches(self, guess: str, country: str) -> bool:
+        """
+        Whether the guess names `country`. A typo equally close to the answer and
+        to another country still counts, but an exact name of another country never does.
+        """
+        if normalize_answer(guess) == normalize_answer(country):
+            return True
+        return country in self.candidates(guess)
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        # Best completions below this node as sorted (rank, label) pairs, one per label.
+        self.top: list[tuple[tuple[int, str], str]] = []
+
+
+class PrefixTrie:
+    """
+    Autocomplete over normalized names and aliases.
+
+    Every node keeps the top-k distinct labels reachable below it, ranked by
+    the length of their shortest matching key, so a lookup only walks the
+    prefix and its cost does not grow with the catalog.
+    """
+
+    __slots__ = ("top_k", "root")
+
+    def __init__(self, aliases_by_label: Mapping[str, Iterable[str]] | None = None, top_k: int = 5):
+        self.top_k = top_k
+        self.root = _TrieNode()
+        for label, aliases in (aliases_by_label or {}).items():
+            for name in (label, *aliases):
+                # Index both "the bahamas" and "bahamas".
+                for key in {" ".join(_fold(name).split()), normalize_answer(name)}:
+                    if key:
+                        self.insert(key, label)
+
+    def insert(self, key: str, label: str) -> None:
+        rank = (len(key), label)
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._offer(node, rank, label)
+
+    def _offer(self, node: _TrieNode, rank: tuple[int, str], label: str) -> None:
+        top = node.top
+        for i, (existing_rank, existing) in enumerate(top):
+            if existing == label:
+                if existing_rank <= rank:
+                    return
+                del top[i]
+                break
+        if len(top) >= self.top_k and rank >= top[-1][0]:
+            return
+        top.append((rank, label))
+        top.sort()
+        del top[self.top_k:]
+
+    def node_for(self, prefix: str) -> _TrieNode | None:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, text: str) -> list[str]:
+        """Up to top_k labels whose name or alias starts with the typed text."""
+        return PrefixCursor(self, text).suggestions()
+
+
+class PrefixCursor:
+    """
+    Follows typed text through a PrefixTrie one keystroke at a time: typing a
+    character steps one node down, backspace pops back to the previous one.
+    """
+
+    __slots__ = ("trie", "_stack")
+
+    def __init__(self, trie: PrefixTrie, text: str = ""):
+        self.trie = trie
+        # One (node, folded text) entry per typed character, after the root.
+        self._stack: list[tuple[_TrieNode | None, str]] = [(trie.root, "")]
+        self.push(text)
+
+    def push(self, typed: str) -> None:
+        for char in typed:
+            node, folded = self._stack[-1]
+            for piece in _fold(char):
+                if piece == " " and (not folded or folded.endswith(" ")):
+                    continue
+                folded += piece
+                node = node.children.get(piece) if node is not None else None
+            self._stack.append((node, folded))
+
+    def pop(self) -> None:
+        if len(self._stack) > 1:
+            self._stack.pop()
+
+    def reset(self, text: str = "") -> None:
+        del self._stack[1:]
+        self.push(text)
+
+    def suggestions(self) -> list[str]:
+        node, folded = self._stack[-1]
+        if node is None or not folded:
+            return []
+        return [label for _, label in node.top]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .matching import PrefixTrie
+    from .strategies import ModeStrategy
 
 
 class GameMode(str, Enum):
@@ -20,6 +25,7 @@ class GameConfig:
     max_lives: int = 3
     initial_score: int = 0
     blitz_time_limit_seconds: int = 60
+    flag_prefetch_count: int = 3
 
 
 @dataclass
@@ -38,8 +44,13 @@ class GameSession:
 class RunningGame:
     session: GameSession
     countries: dict[str, str]
-    flag_images: dict[str, Any]
+    flag_images: Mapping[str, Any]
     current_country: str
+    strategy: ModeStrategy | None = None
+    # Immutable pick order built once per game; strategies key their state on its identity.
+    country_index: tuple[str, ...] = ()
+    # Input suggestions over this game's countries and their aliases.
+    autocomplete: PrefixTrie | None = None
 
 
 class GuessStatus(str, Enum):
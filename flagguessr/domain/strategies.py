@@ -2,13 +2,28 @@ from __future__ import annotations
 
 import random
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Sequence
 
 from .models import GameMode
 
 
 class ModeStrategy(ABC):
+    """
+    Picks the countries of one game.
+
+    Instances are meant to live as long as the game they serve, so subclasses can
+    keep incremental state between picks instead of recomputing it per guess.
+    """
+
     mode: GameMode
 
+    def __init__(self, rng: random.Random | None = None):
+        # Pass a seeded Random for reproducible sequences.
+        self.rng = rng if rng is not None else random.Random()
+        self._lookahead: deque[str] = deque()
+        self._lookahead_source: Sequence[str] | None = None
+
     @property
     def is_timed(self) -> bool:
         return False
@@ -20,9 +35,32 @@ class ModeStrategy(ABC):
     def initial_flags_shown(self) -> int:
         return 0
 
-    @abstractmethod
-    def next_country(self, all_countries: list[str], shown_sequence: list[str]) -> str | None:
+    def next_country(self, all_countries: Sequence[str], shown_sequence: Sequence[str]) -> str | None:
         """Return next country or None when mode completes."""
+        if self._lookahead and self._lookahead_source is all_countries:
+            return self._lookahead.popleft()
+        self._lookahead.clear()
+        return self._draw(all_countries, shown_sequence, queued=0)
+
+    def upcoming(self, all_countries: Sequence[str], shown_sequence: Sequence[str], count: int) -> list[str]:
+        """
+        Commit to the next `count` picks without consuming them, so callers can
+        warm their assets; next_country() returns them in this order.
+        """
+        if self._lookahead_source is not all_countries:
+            self._lookahead.clear()
+            self._lookahead_source = all_countries
+
+        while len(self._lookahead) < count:
+            country = self._draw(all_countries, shown_sequence, queued=len(self._lookahead))
+            if country is None:
+                break
+            self._lookahead.append(country)
+        return list(self._lookahead)[:count]
+
+    @abstractmethod
+    def _draw(self, all_countries: Sequence[str], shown_sequence: Sequence[str], queued: int) -> str | None:
+        """Pick a fresh country; `queued` picks are already committed beyond shown_sequence."""
 
 
 class NormalModeStrategy(ModeStrategy):
@@ -32,11 +70,33 @@ class NormalModeStrategy(ModeStrategy):
     def uses_unique_countries(self) -> bool:
         return True
 
-    def next_country(self, all_countries: list[str], shown_sequence: list[str]) -> str | None:
-        remaining = [country for country in all_countries if country not in shown_sequence]
-        if not remaining:
+    def __init__(self, rng: random.Random | None = None):
+        super().__init__(rng)
+        self._source: Sequence[str] | None = None
+        self._remaining: list[str] = []
+        self._drawn = 0
+
+    def _draw(self, all_countries: Sequence[str], shown_sequence: Sequence[str], queued: int) -> str | None:
+        # The deck is rebuilt only when the catalog or the shown sequence no longer
+        # matches what this strategy handed out; every other draw is O(1).
+        if all_countries is not self._source or len(shown_sequence) + queued != self._drawn:
+            self._reset_deck(all_countries, shown_sequence)
+
+        if not self._remaining:
             return None
-        return random.choice(remaining)
+
+        # Swap-remove a random slot: an incremental Fisher-Yates shuffle.
+        index = self.rng.randrange(len(self._remaining))
+        self._remaining[index], self._remaining[-1] = self._remaining[-1], self._remaining[index]
+        self._drawn += 1
+        return self._remaining.pop()
+
+    def _reset_deck(self, all_countries: Sequence[str], shown_sequence: Sequence[str]) -> None:
+        shown = set(shown_sequence)
+        shown.update(self._lookahead)
+        self._source = all_countries
+        self._remaining = [country for country in all_countries if country not in shown]
+        self._drawn = len(shown_sequence) + len(self._lookahead)
 
 
 class EndlessModeStrategy(ModeStrategy):
@@ -45,10 +105,10 @@ class EndlessModeStrategy(ModeStrategy):
     def initial_flags_shown(self) -> int:
         return 1
 
-    def next_country(self, all_countries: list[str], shown_sequence: list[str]) -> str | None:
+    def _draw(self, all_countries: Sequence[str], shown_sequence: Sequence[str], queued: int) -> str | None:
         if not all_countries:
             return None
-        return random.choice(all_countries)
+        return self.rng.choice(all_countries)
 
 
 class BlitzModeStrategy(ModeStrategy):
@@ -61,17 +121,17 @@ class BlitzModeStrategy(ModeStrategy):
     def initial_flags_shown(self) -> int:
         return 1
 
-    def next_country(self, all_countries: list[str], shown_sequence: list[str]) -> str | None:
+    def _draw(self, all_countries: Sequence[str], shown_sequence: Sequence[str], queued: int) -> str | None:
         if not all_countries:
             return None
-        return random.choice(all_countries)
+        return self.rng.choice(all_countries)
 
 
-def build_mode_strategy(mode: GameMode) -> ModeStrategy:
+def build_mode_strategy(mode: GameMode, rng: random.Random | None = None) -> ModeStrategy:
     if mode == GameMode.NORMAL:
-        return NormalModeStrategy()
+        return NormalModeStrategy(rng)
     if mode == GameMode.ENDLESS:
-        return EndlessModeStrategy()
+        return EndlessModeStrategy(rng)
     if mode == GameMode.BLITZ:
-        return BlitzModeStrategy()
+        return BlitzModeStrategy(rng)
     raise ValueError(f"Unsupported mode: {mode}")
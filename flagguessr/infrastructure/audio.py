@@ -1,6 +1,11 @@
+import io
 import os
 import random
+import threading
+import time
+from dataclasses import dataclass
 
+import pygame
 from pygame import mixer
 
 from flagguessr.shared.paths import resource_path
@@ -8,134 +13,535 @@ from flagguessr.shared.paths import resource_path
 # Music directory
 music_dir = resource_path("data/music")
 
-# Global variables for music state
-current_song = None
-music_paused = False
-music_volume = 0.5
+# Posted by the mixer when a track ends, and by MusicPlayer when a track is in memory
+# or when play_in_background() has the library and the audio device ready.
+MUSIC_END_EVENT = pygame.event.custom_type()
+MUSIC_READY_EVENT = pygame.event.custom_type()
+MUSIC_START_EVENT = pygame.event.custom_type()
 
-def init_mixer():
-    """Initialize pygame mixer"""
+
+def _display_name(filename):
+    """Clean up a music filename for display."""
+    name = os.path.splitext(filename)[0]  # Remove .mp3
+    # Clean up common patterns
+    name = name.replace("OST - ", "").replace("OST_ ", "")
+    name = name.replace("_ ", " - ").replace("__", " - ")
+    return name
+
+
+# MPEG audio Layer III frame header tables, indexed by the header fields.
+_MP3_BITRATES_KBPS = {
+    "mpeg1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "mpeg2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),  # MPEG 2.5
+}
+
+
+def estimate_mp3_duration(path, size=None):
+    """
+    Estimate an MP3's length in seconds from its first frame header.
+
+    Uses the Xing/Info frame count when the encoder wrote one (VBR files),
+    otherwise assumes a constant bitrate. Returns None when no Layer III
+    frame is found in the first 64 KiB.
+    """
     try:
-        mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-        print("Audio mixer initialized successfully")
+        if size is None:
+            size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(64 * 1024)
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return None
+
+    offset = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        tag_size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+        offset = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        if offset + 4 > len(head):
+            with open(path, "rb") as f:
+                f.seek(offset)
+                head = f.read(64 * 1024)
+            audio_start, offset = offset, 0
+        else:
+            audio_start = offset
+    else:
+        audio_start = 0
+
+    for i in range(offset, len(head) - 4):
+        if head[i] != 0xFF or head[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (head[i + 1] >> 3) & 0x03
+        layer = (head[i + 1] >> 1) & 0x03
+        bitrate_index = head[i + 2] >> 4
+        rate_index = (head[i + 2] >> 2) & 0x03
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+
+        mpeg1 = version == 3
+        bitrate = _MP3_BITRATES_KBPS["mpeg1" if mpeg1 else "mpeg2"][bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+        samples_per_frame = 1152 if mpeg1 else 576
+
+        mono = (head[i + 3] >> 6) == 3
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        xing = i + 4 + side_info
+        if head[xing:xing + 4] in (b"Xing", b"Info") and head[xing + 7] & 0x01:
+            frames = int.from_bytes(head[xing + 8:xing + 12], "big")
+            if frames:
+                return frames * samples_per_frame / sample_rate
+
+        audio_bytes = size - (audio_start + i - offset)
+        return audio_bytes * 8 / bitrate
+    return None
+
+
+@dataclass(frozen=True)
+class Song:
+    filename: str
+    display_name: str
+    path: str
+    size_bytes: int
+    duration_seconds: float | None
+
+
+class SongIndex:
+    """
+    Songs of the music directory, scanned once and rescanned only when the
+    directory's mtime changes. The mtime is polled at most every
+    poll_interval seconds, so per-frame callers never touch the filesystem.
+    """
+
+    def __init__(self, directory, poll_interval=2.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._songs = []
+        self._names = []
+        self._filenames = []
+        self._by_key = {}
+        self._mtime_ns = None
+        self._last_poll = None
+        self._lock = threading.Lock()
+
+    def songs(self):
+        self._poll()
+        return self._songs
+
+    def names(self):
+        """Display names in directory order; the list is shared, do not mutate it."""
+        self._poll()
+        return self._names
+
+    def filenames(self):
+        self._poll()
+        return self._filenames
+
+    def find(self, song_name):
+        """Song by exact display name or filename (case-insensitive), else first partial match."""
+        self._poll()
+        key = song_name.lower()
+        song = self._by_key.get(key)
+        if song is not None:
+            return song
+        for song in self._songs:
+            if key in song.display_name.lower():
+                return song
+        return None
+
+    def random_song(self):
+        songs = self.songs()
+        return random.choice(songs) if songs else None
+
+    def refresh(self, force=False, wait=True):
+        """
+        Rescan if the directory changed (or force); returns whether it rescanned.
+        With wait=False it returns False at once while another thread is scanning.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return False
+        try:
+            return self._refresh(force)
+        finally:
+            self._lock.release()
+
+    def _refresh(self, force):
+        self._last_poll = time.monotonic()
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError as e:
+            if self._mtime_ns is not None or force:
+                print(f"Error loading song list: {e}")
+            self._set_songs([], None)
+            return True
+        if not force and mtime_ns == self._mtime_ns:
+            return False
+
+        try:
+            filenames = sorted(f for f in os.listdir(self.directory) if f.endswith(".mp3"))
+        except OSError as e:
+            print(f"Error loading song list: {e}")
+            filenames = []
+
+        songs = []
+        for filename in filenames:
+            path = os.path.join(self.directory, filename)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            songs.append(Song(filename, _display_name(filename), path, size, estimate_mp3_duration(path, size)))
+        self._set_songs(songs, mtime_ns)
         return True
-    except Exception as e:
-        print(f"Error initializing audio mixer: {e}")
+
+    def _set_songs(self, songs, mtime_ns):
+        by_key = {}
+        for song in songs:
+            by_key.setdefault(song.display_name.lower(), song)
+            by_key.setdefault(song.filename.lower(), song)
+        self._songs = songs
+        self._names = [song.display_name for song in songs]
+        self._filenames = [song.filename for song in songs]
+        self._by_key = by_key
+        self._mtime_ns = mtime_ns
+
+    def defer_poll(self):
+        """Treat the index as just polled, for a caller about to refresh it on another thread."""
+        self._last_poll = time.monotonic()
+
+    def _poll(self):
+        last = self._last_poll
+        if last is None or time.monotonic() - last >= self.poll_interval:
+            # Readers are often the UI thread: never wait behind a scan in progress.
+            self.refresh(wait=False)
+
+
+song_index = SongIndex(music_dir)
+
+
+class MusicPlayer:
+    """
+    Shuffled background-music playlist.
+
+    Tracks are read into memory on a worker thread: the chosen one when the
+    user switches songs, and the next one while the current one plays. The UI
+    thread never waits on the disk. The next track goes to mixer.music.queue(),
+    so SDL switches tracks without a gap. A user switch fades the new track in
+    over fade_ms. pygame has a single music stream, so two tracks cannot
+    overlap, and this is as close to a crossfade as it gets.
+
+    Only the file read is prefetched. mixer.music.load() and queue() still run
+    on the event thread, because the music stream is not safe to drive from two
+    threads; on the in-memory buffer they only parse the stream header (well
+    under a millisecond for the bundled tracks) and decode nothing.
+
+    Workers only post MUSIC_READY_EVENT; every mixer call happens on the thread
+    that feeds events to handle_event(). The one exception is opening the audio
+    device, which play_in_background() does on its worker before any track
+    plays. A play() made while that worker runs is deferred until it is done,
+    rather than opening the device on the calling thread.
+    """
+
+    def __init__(self, index, volume=0.5, fade_ms=600):
+        self.index = index
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.playlist = []
+        self.position = 0
+        self.current = None
+        self.paused = False
+        self._queued = None
+        self._start_pending = False
+        self._buffers = {}
+        self._loading = set()
+        self._lock = threading.Lock()
+        self._mixer_lock = threading.Lock()
+        # Cleared while play_in_background() prepares; play() calls made meanwhile
+        # are kept in _deferred_play and run on MUSIC_START_EVENT.
+        self._prepared = threading.Event()
+        self._prepared.set()
+        self._deferred_play = None
+
+    def init(self):
+        """Initialize pygame mixer"""
+        try:
+            mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            mixer.music.set_endevent(MUSIC_END_EVENT)
+            print("Audio mixer initialized successfully")
+            return True
+        except Exception as e:
+            print(f"Error initializing audio mixer: {e}")
+            return False
+
+    def ensure_mixer(self):
+        """Open the audio device on first use; startup no longer pays for it."""
+        with self._mixer_lock:
+            if mixer.get_init() is not None:
+                return True
+            if self.init():
+                return True
+        print("Warning: Audio mixer failed to initialize. Music will not work.")
         return False
 
-def get_available_songs():
-    """Get list of available music files"""
-    try:
-        song_files = [f for f in os.listdir(music_dir) if f.endswith(".mp3")]
-        return song_files
-    except Exception as e:
-        print(f"Error loading song list: {e}")
-        return []
+    def play_in_background(self, random_song=True):
+        """
+        Start the music without touching the disk or the audio device on the
+        calling thread. A worker scans the library and opens the mixer, then
+        posts MUSIC_START_EVENT, and handle_event() calls play().
+        """
+        self._deferred_play = (None, random_song)
+        self._prepared.clear()
+        self.index.defer_poll()
+        thread = threading.Thread(target=self._prepare, name="music-init", daemon=True)
+        thread.start()
+        return thread
 
-def get_song_names():
-    """Get cleaned song names for display"""
-    songs = get_available_songs()
-    # Clean up filenames for display (remove extension, clean up names)
-    display_names = []
-    for song in songs:
-        name = os.path.splitext(song)[0]  # Remove .mp3
-        # Clean up common patterns
-        name = name.replace("OST - ", "").replace("OST_ ", "")
-        name = name.replace("_ ", " - ").replace("__", " - ")
-        display_names.append(name)
-    return display_names
+    def _prepare(self):
+        ready = False
+        try:
+            self.index.refresh()
+            ready = bool(self.index.songs()) and self.ensure_mixer()
+        except Exception as e:
+            print(f"Error preparing music: {e}")
+        finally:
+            # Set before posting, so a play() that still saw it clear is picked up by the event.
+            self._prepared.set()
+        if ready:
+            pygame.event.post(pygame.event.Event(MUSIC_START_EVENT))
 
-def play_music(song_name=None, random_song=False):
-    """Play music - either specific song or random"""
-    global current_song, music_paused
-    try:
-        song_files = get_available_songs()
-        if not song_files:
+    def play(self, song_name=None, random_song=False):
+        """Play a specific song or a random one; the rest of the library follows shuffled."""
+        if not self._prepared.is_set():
+            # The worker is still opening the device; MUSIC_START_EVENT plays this.
+            self._deferred_play = (song_name, random_song)
+            return True
+        songs = self.index.songs()
+        if not songs:
             print("No music files found!")
             return False
-            
+        if not self.ensure_mixer():
+            return False
+
         if random_song or song_name is None:
-            selected_song = random.choice(song_files)
+            first = random.choice(songs)
         else:
             # Find song by name (either filename or display name)
-            selected_song = None
-            song_names = get_song_names()
-            
-            for i, display_name in enumerate(song_names):
-                if song_name.lower() in display_name.lower() or song_name == song_files[i]:
-                    selected_song = song_files[i]
-                    break
-            
-            if not selected_song:
+            first = self.index.find(song_name)
+            if first is None:
                 print(f"Song '{song_name}' not found, playing random song")
-                selected_song = random.choice(song_files)
-        
-        song_path = os.path.join(music_dir, selected_song)
-        mixer.music.load(song_path)
-        mixer.music.play(-1)  # -1 makes the music loop indefinitely
-        mixer.music.set_volume(music_volume)
-        current_song = selected_song
-        music_paused = False
-        
-        # Get display name
-        display_name = os.path.splitext(selected_song)[0]
-        display_name = display_name.replace("OST - ", "").replace("OST_ ", "")
-        display_name = display_name.replace("_ ", " - ").replace("__", " - ")
-        
-        print(f"Now playing: '{display_name}'")
+                first = random.choice(songs)
+
+        rest = [song for song in songs if song is not first]
+        random.shuffle(rest)
+        self.playlist = [first, *rest]
+        self.position = 0
+        self.current = first
+        self.paused = False
+        self._queued = None
+        self._start_pending = True
+        self._request(first)
         return True
-        
-    except Exception as e:
-        print(f"Error while loading music: {e}")
+
+    def pause(self):
+        """Pause/unpause music"""
+        try:
+            if mixer.music.get_busy() and not self.paused:
+                mixer.music.pause()
+                self.paused = True
+                print("Music paused")
+            elif self.paused:
+                mixer.music.unpause()
+                self.paused = False
+                print("Music resumed")
+        except Exception as e:
+            print(f"Error pausing/resuming music: {e}")
+
+    def stop(self):
+        """Stop music completely"""
+        self.current = None
+        self.paused = False
+        self._queued = None
+        self._start_pending = False
+        try:
+            # Halting posts an end event, which must not read as a finished track.
+            mixer.music.set_endevent()
+            mixer.music.stop()
+            mixer.music.set_endevent(MUSIC_END_EVENT)
+            print("Music stopped")
+        except Exception as e:
+            print(f"Error stopping music: {e}")
+
+    def set_volume(self, volume):
+        """Set music volume (0.0 to 1.0)"""
+        self.volume = max(0.0, min(1.0, volume))
+        try:
+            mixer.music.set_volume(self.volume)
+            print(f"Volume set to {int(self.volume * 100)}%")
+        except Exception as e:
+            print(f"Error setting volume: {e}")
+
+    def is_playing(self):
+        """Check if music is currently playing"""
+        try:
+            return mixer.music.get_busy() and not self.paused
+        except pygame.error:
+            return False
+
+    def handle_event(self, event):
+        """Advance the playlist on mixer/preload events; returns whether the event was ours."""
+        if event.type == MUSIC_START_EVENT:
+            # The user may have picked a song while the library was loading.
+            request, self._deferred_play = self._deferred_play, None
+            if request is not None:
+                self.play(*request)
+            return True
+        if event.type == MUSIC_READY_EVENT:
+            song = next((song for song in self.playlist if song.path == event.path), None)
+            if song is not None:
+                self._on_ready(song)
+            return True
+        if event.type == MUSIC_END_EVENT:
+            self._on_track_end()
+            return True
         return False
 
+    def _next_song(self):
+        if not self.playlist:
+            return None
+        return self.playlist[(self.position + 1) % len(self.playlist)]
+
+    def _request(self, song):
+        with self._lock:
+            ready = song.path in self._buffers
+            if not ready and song.path not in self._loading:
+                self._loading.add(song.path)
+                threading.Thread(target=self._preload, args=(song,), name="music-preload", daemon=True).start()
+        if ready:
+            self._on_ready(song)
+
+    def _preload(self, song):
+        try:
+            with open(song.path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error while loading music: {e}")
+            data = None
+
+        with self._lock:
+            self._loading.discard(song.path)
+            if data is not None:
+                self._buffers[song.path] = data
+        if data is None:
+            return
+        try:
+            pygame.event.post(pygame.event.Event(MUSIC_READY_EVENT, path=song.path))
+        except pygame.error as e:
+            print(f"Error while loading music: {e}")
+
+    def _on_ready(self, song):
+        if song is self.current and self._start_pending:
+            self._start(song)
+        elif song is self._next_song() and self.current is not None and not self._start_pending and self._queued is None:
+            try:
+                mixer.music.queue(self._stream(song), namehint="mp3")
+                self._queued = song
+            except Exception as e:
+                print(f"Error while queueing music: {e}")
+
+    def _start(self, song):
+        self._start_pending = False
+        try:
+            mixer.music.load(self._stream(song), namehint="mp3")
+            mixer.music.set_volume(self.volume)
+            mixer.music.play(fade_ms=self.fade_ms)
+        except Exception as e:
+            print(f"Error while loading music: {e}")
+            return
+        print(f"Now playing: '{song.display_name}'")
+        self._after_track_change()
+
+    def _on_track_end(self):
+        if self.current is None or not self.playlist:
+            return
+
+        queued, self._queued = self._queued, None
+        self.position = (self.position + 1) % len(self.playlist)
+        self.current = self.playlist[self.position]
+        if queued is self.current and self.is_playing():
+            # SDL already started the queued track when the previous one ended.
+            print(f"Now playing: '{self.current.display_name}'")
+            self._after_track_change()
+        else:
+            self._start_pending = True
+            self._request(self.current)
+
+    def _after_track_change(self):
+        # Keep only the playing track and the one after it in memory.
+        upcoming = self._next_song()
+        keep = {self.current.path, upcoming.path}
+        with self._lock:
+            for path in [path for path in self._buffers if path not in keep]:
+                del self._buffers[path]
+        self._request(upcoming)
+
+    def _stream(self, song):
+        with self._lock:
+            return io.BytesIO(self._buffers[song.path])
+
+
+player = MusicPlayer(song_index)
+
+
+def init_mixer():
+    """Initialize pygame mixer"""
+    return player.init()
+
+def get_available_songs():
+    """Get list of available music files"""
+    return song_index.filenames()
+
+def get_song_names():
+    """Get cleaned song names for display"""
+    return song_index.names()
+
+def play_music(song_name=None, random_song=False):
+    """Play music - either specific song or random"""
+    return player.play(song_name=song_name, random_song=random_song)
+
+def play_music_in_background(random_song=True):
+    """Start music once a worker has scanned the library and opened the audio device"""
+    return player.play_in_background(random_song=random_song)
+
 def pause_music():
     """Pause/unpause music"""
-    global music_paused
-    try:
-        if mixer.music.get_busy() and not music_paused:
-            mixer.music.pause()
-            music_paused = True
-            print("Music paused")
-        elif music_paused:
-            mixer.music.unpause()
-            music_paused = False
-            print("Music resumed")
-    except Exception as e:
-        print(f"Error pausing/resuming music: {e}")
+    player.pause()
 
 def stop_music():
     """Stop music completely"""
-    global current_song, music_paused
-    try:
-        mixer.music.stop()
-        current_song = None
-        music_paused = False
-        print("Music stopped")
-    except Exception as e:
-        print(f"Error stopping music: {e}")
+    player.stop()
 
 def set_volume(volume):
     """Set music volume (0.0 to 1.0)"""
-    global music_volume
-    try:
-        music_volume = max(0.0, min(1.0, volume))
-        mixer.music.set_volume(music_volume)
-        print(f"Volume set to {int(music_volume * 100)}%")
-    except Exception as e:
-        print(f"Error setting volume: {e}")
+    player.set_volume(volume)
 
 def is_playing():
     """Check if music is currently playing"""
-    return mixer.music.get_busy() and not music_paused
+    return player.is_playing()
 
 def is_paused():
     """Check if music is paused"""
-    return music_paused
+    return player.paused
 
 def get_current_song():
     """Get currently playing song"""
-    return current_song
+    return player.current.filename if player.current is not None else None
+
+def handle_event(event):
+    """Feed pygame events to the music player; returns whether it consumed the event."""
+    return player.handle_event(event)
 
 
 # Backward-compatible wrappers used by older call sites.
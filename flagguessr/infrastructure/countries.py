@@ -1,49 +1,189 @@
+import hashlib
+import io
 import os
-import sqlite3
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 
+from flagguessr.infrastructure.db import get_countries
+from flagguessr.infrastructure.surface_cache import shared_surface_cache
 from flagguessr.shared.paths import resource_path
 
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flag-prefetch")
+        return _prefetch_executor
+
+
+class LazyFlagImages(Mapping):
+    """
+    Country -> scaled flag surface, decoded on first access.
+
+    Building the mapping only resolves file paths, so starting a game costs the
+    same for every map. prefetch() decodes upcoming flags on a worker thread so
+    they are usually ready before they are shown. Every path is a key, including
+    flags that turn out not to decode; is_available() tells those apart.
+    """
+
+    def __init__(self, loader, countries, size, cache=None):
+        self._loader = loader
+        self._size = tuple(size)
+        self._cache = shared_surface_cache if cache is None else cache
+        self._paths = {
+            country: loader.flag_path(country, continent)
+            for country, continent in countries.items()
+        }
+        self._surfaces = {}
+        self._failed = set()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, country):
+        """
+        The decoded flag, or KeyError if it cannot be decoded. This blocks the
+        calling thread until the flag is decoded: it waits for a prefetch in
+        progress, or decodes inline when none was queued. The game only shows a
+        flag once is_ready() or is_available() has returned, so the render
+        thread normally finds it decoded.
+        """
+        surface = self._surfaces.get(country)
+        if surface is not None:
+            return surface
+        if country not in self._paths or country in self._failed:
+            raise KeyError(country)
+
+        surface = self._cache.get((country, self._size))
+        if surface is not None:
+            self._surfaces[country] = surface
+            return surface
+
+        with self._lock:
+            pending = self._pending.get(country)
+        if pending is not None:
+            pending.result()
+        else:
+            self._decode(country)
+
+        surface = self._surfaces.get(country)
+        if surface is None:
+            raise KeyError(country)
+        return surface
+
+    def __contains__(self, country):
+        return country in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def is_loaded(self, country):
+        return country in self._surfaces
+
+    def is_ready(self, country):
+        """True once looking the country up can no longer block on a decode."""
+        with self._lock:
+            return country in self._surfaces or country in self._failed or country not in self._paths
+
+    def is_available(self, country):
+        """Whether the country's flag decodes, waiting for its decode like a lookup does."""
+        try:
+            self[country]
+        except KeyError:
+            return False
+        return True
+
+    def loaded_count(self):
+        return len(self._surfaces)
+
+    def prefetch(self, countries):
+        """Queue background decodes for countries that are not loaded yet."""
+        executor = _get_prefetch_executor()
+        with self._lock:
+            for country in countries:
+                if (
+                    country not in self._paths
+                    or country in self._surfaces
+                    or country in self._failed
+                    or country in self._pending
+                ):
+                    continue
+                cached = self._cache.get((country, self._size))
+                if cached is not None:
+                    self._surfaces[country] = cached
+                    continue
+                self._pending[country] = executor.submit(self._decode, country)
+
+    def _decode(self, country):
+        surface = self._cache.get((country, self._size))
+        if surface is None:
+            surface = self._loader.load_flag_image(country, self._paths[country], self._size)
+            if surface is not None:
+                self._cache.put((country, self._size), surface)
+        with self._lock:
+            if surface is None:
+                self._failed.add(country)
+            else:
+                self._surfaces[country] = surface
+            self._pending.pop(country, None)
+        return surface
+
 
 class CountryLoader:
-    def __init__(self):
+    def __init__(self, disk_cache=None):
         self.base_flags_path = resource_path("data/flags")
+        self.disk_cache = disk_cache
+
+    def flag_path(self, country, continent):
+        continent_path = os.path.join(self.base_flags_path, continent)
+        # Ensure the path separator is correct for the OS
+        continent_path = os.path.normpath(continent_path)
 
-    def load_flag_images(self, countries, size):
-        flags_images = {}
-        for country, continent in countries.items():
-            continent_path = os.path.join(self.base_flags_path, continent)
-            # Ensure the path separator is correct for the OS
-            continent_path = os.path.normpath(continent_path)
-            
-            flag_path = os.path.join(continent_path, f"{country}.png")
-            flag_path = os.path.normpath(flag_path)
-            
-            try:
-                # The resource_path function is not needed here anymore if base_flags_path is already absolute
-                flag_image = pygame.image.load(flag_path)
-                flags_images[country] = pygame.transform.scale(flag_image, size)
-            except pygame.error as e:
-                print(f"Error loading flag for {country} at {flag_path}: {e}")
-        return flags_images
-
-    def load_countries(self, db_path, gamemode="global"):
+        flag_path = os.path.join(continent_path, f"{country}.png")
+        return os.path.normpath(flag_path)
+
+    def load_flag_image(self, country, flag_path, size):
+        try:
+            with open(flag_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error loading flag for {country} at {flag_path}: {e}")
+            return None
+
+        digest = None
+        if self.disk_cache is not None:
+            digest = hashlib.sha1(data).hexdigest()
+            cached = self.disk_cache.load(country, digest, size)
+            if cached is not None:
+                return cached
+
+        try:
+            # The resource_path function is not needed here anymore if base_flags_path is already absolute
+            flag_image = pygame.image.load(io.BytesIO(data), os.path.basename(flag_path))
+            scaled = pygame.transform.scale(flag_image, size)
+        except pygame.error as e:
+            print(f"Error loading flag for {country} at {flag_path}: {e}")
+            return None
+
+        if self.disk_cache is not None:
+            self.disk_cache.store(country, digest, size, scaled)
+        return scaled
+
+    def load_flag_images(self, countries, size, cache=None):
+        return LazyFlagImages(self, countries, size, cache=cache)
+
+    def load_countries(self, db, gamemode="global"):
         """Load countries from the database based on the selected gamemode"""
-        conn = sqlite3.connect(db_path)
-        if not conn:
-            return {}
-            
-        cursor = conn.cursor()
-        
-        if gamemode == "global":
-            cursor.execute("SELECT country, continent FROM flags")
-        else:
-            cursor.execute("SELECT country, continent FROM flags WHERE continent = ?", (gamemode,))
-            
-        countries_data = {row[0]: row[1] for row in cursor.fetchall()}
-        conn.close()
-        return countries_data
+        return get_countries(db, None if gamemode == "global" else gamemode)
 
 
 # Backward-compatible alias kept for legacy references.
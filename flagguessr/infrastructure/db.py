@@ -1,5 +1,10 @@
+import hashlib
 import sqlite3
 import os
+import threading
+import weakref
+from contextlib import contextmanager
+
 from flagguessr.shared.paths import resource_path
 
 # --- Database Initialization ---
@@ -21,104 +26,376 @@ def create_table(conn, create_table_sql):
     except sqlite3.Error as e:
         print(f"Error creating table: {e}")
 
-# --- Scores Database Management ---
 
-def create_scores_table(db_path):
-    """Create the scores table if it doesn't exist."""
-    sql_create_scores_table = """ CREATE TABLE IF NOT EXISTS scores (
-                                        id integer PRIMARY KEY,
-                                        score integer NOT NULL,
-                                        timestamp text NOT NULL,
-                                        gamemode text NOT NULL,
-                                        game_sequence text,
-                                        mistakes text,
-                                        game_mode text,
-                                        time_taken real,
-                                        flags_shown integer,
-                                        mode_data text
-                                    ); """
-    conn = create_connection(db_path)
-    if conn:
-        create_table(conn, sql_create_scores_table)
-        print(f"Successfully created/updated scores table in {db_path}")
-        conn.close()
-
-def insert_score(db_path, score, game_sequence, wrong_countries, gamemode, game_mode, time_taken, flags_shown, mode_data):
-    """Insert a new score into the scores table."""
-    from datetime import datetime
-    import json
-    
-    conn = create_connection(db_path)
-    if conn:
-        sql = ''' INSERT INTO scores(score, timestamp, gamemode, game_sequence, mistakes, game_mode, time_taken, flags_shown, mode_data)
-                  VALUES(?,?,?,?,?,?,?,?,?) '''
-        cur = conn.cursor()
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sequence_str = ",".join(game_sequence)
-        mistakes_str = ",".join(wrong_countries)
-        mode_data_str = json.dumps(mode_data)
-        
-        cur.execute(sql, (score, now, gamemode, sequence_str, mistakes_str, game_mode, time_taken, flags_shown, mode_data_str))
-        conn.commit()
-        conn.close()
+class _ThreadConnection:
+    """Per-thread holder, so the connection can be closed when its thread exits."""
 
-def get_top_scores(db_path, gamemode, filter_mode="all", limit=10):
-    """Query top scores from the scores table based on gamemode and filter."""
-    conn = create_connection(db_path)
-    if not conn:
-        return []
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionManager:
+    """
+    Keeps long-lived SQLite connections for a single database file.
+
+    Each thread gets its own connection (sqlite3 connections must not be used
+    concurrently), opened lazily in WAL mode and reused until the thread exits
+    or close() is called, whichever comes first.
+    """
+
+    def __init__(self, db_path, wal=True, cached_statements=128):
+        self.db_path = db_path
+        self.wal = wal
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._closed = False
+
+    def connection(self):
+        """Return the calling thread's connection, opening it on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is not None:
+            return holder.conn
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError(f"Connection manager for {self.db_path} is closed")
+            # The manager owns cross-thread shutdown, so the same-thread check is disabled;
+            # each connection is still only ever handed to the thread that opened it.
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            if self.wal:
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                except sqlite3.Error as e:
+                    print(f"Warning: could not enable WAL for {self.db_path}: {e}")
+            self._connections.append(conn)
+        # The thread-local is dropped when the thread exits; close its connection then,
+        # so short-lived threads do not each leave a WAL connection open.
+        holder = _ThreadConnection(conn)
+        weakref.finalize(holder, self._release, conn)
+        self._local.holder = holder
+        return conn
+
+    def _release(self, conn):
+        with self._lock:
+            if conn not in self._connections:
+                return  # Already closed by close().
+            self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error closing database connection: {e}")
 
+    def close(self):
+        """Close every connection opened through this manager."""
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+        self._local = threading.local()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+@contextmanager
+def _connect(db):
+    """
+    Yield a connection for either a database path or a ConnectionManager.
+
+    Paths get a short-lived connection (legacy behaviour); managers hand out
+    their pooled per-thread connection, which is left open afterwards.
+    """
+    if isinstance(db, ConnectionManager):
+        yield db.connection()
+        return
+
+    conn = create_connection(db)
     try:
-        cur = conn.cursor()
-        # Base query
-        query = "SELECT score, timestamp, gamemode, game_sequence, mistakes, game_mode, time_taken, flags_shown, mode_data FROM scores WHERE gamemode = ?"
-        params = [gamemode]
-
-        # Apply filter for specific game modes (normal, endless, blitz)
-        if filter_mode != "all":
-            query += " AND game_mode = ?"
-            params.append(filter_mode)
-
-        # Order by score and select top N
-        query += " ORDER BY score DESC, timestamp DESC LIMIT ?"
-        params.append(limit)
-        
-        cur.execute(query, tuple(params))
-        rows = cur.fetchall()
-        return rows
-    except sqlite3.Error as e:
-        print(f"Database error in get_top_scores: {e}")
-        return []
+        yield conn
     finally:
         if conn:
             conn.close()
 
+# --- Scores Database Management ---
+
+def _scores_v1_create_table(conn):
+    conn.execute(""" CREATE TABLE IF NOT EXISTS scores (
+                        id integer PRIMARY KEY,
+                        score integer NOT NULL,
+                        timestamp text NOT NULL,
+                        gamemode text NOT NULL,
+                        game_sequence text,
+                        mistakes text,
+                        game_mode text,
+                        time_taken real,
+                        flags_shown integer,
+                        mode_data text
+                    ); """)
+
+def _scores_v2_epoch_column(conn):
+    """Add an integer epoch column so leaderboard ties sort without string compares."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(scores)")}
+    if "created_at" not in columns:
+        conn.execute("ALTER TABLE scores ADD COLUMN created_at integer NOT NULL DEFAULT 0")
+    conn.execute(
+        "UPDATE scores SET created_at = COALESCE(CAST(strftime('%s', timestamp, 'utc') AS integer), 0) "
+        "WHERE created_at = 0"
+    )
+
+def _scores_v3_leaderboard_indexes(conn):
+    """Index the leaderboard filters in sort order so top-N reads stop scanning and sorting."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scores_map_rank "
+        "ON scores(gamemode, score DESC, created_at DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scores_map_mode_rank "
+        "ON scores(gamemode, game_mode, score DESC, created_at DESC)"
+    )
+
+# Applied in order; PRAGMA user_version records how many have run.
+SCORES_MIGRATIONS = [
+    _scores_v1_create_table,
+    _scores_v2_epoch_column,
+    _scores_v3_leaderboard_indexes,
+]
+
+def migrate(conn, migrations):
+    """Run pending migrations, each in its own transaction, and bump user_version."""
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, migration in enumerate(migrations[current:], start=current + 1):
+        # Explicit BEGIN so DDL and the version bump commit (or roll back) together.
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        conn.commit()
+    return max(current, len(migrations))
+
+def create_scores_table(db):
+    """Create the scores table if it doesn't exist and bring its schema up to date."""
+    with _connect(db) as conn:
+        if conn:
+            try:
+                version = migrate(conn, SCORES_MIGRATIONS)
+                print(f"Successfully created/updated scores table in {_describe(db)} (schema v{version})")
+            except sqlite3.Error as e:
+                print(f"Error migrating scores table: {e}")
+
+def build_score_row(score, game_sequence, wrong_countries, gamemode, game_mode, time_taken, flags_shown, mode_data):
+    """Snapshot one score as a row for insert_scores(); the timestamp is taken now."""
+    from datetime import datetime
+    import json
+
+    current = datetime.now()
+    now = current.strftime("%Y-%m-%d %H:%M:%S")
+    created_at = int(current.replace(microsecond=0).timestamp())
+    sequence_str = ",".join(game_sequence)
+    mistakes_str = ",".join(wrong_countries)
+    mode_data_str = json.dumps(mode_data)
+    return (score, now, created_at, gamemode, sequence_str, mistakes_str, game_mode, time_taken, flags_shown, mode_data_str)
+
+def insert_scores(db, rows):
+    """Insert rows built by build_score_row() in a single transaction."""
+    with _connect(db) as conn:
+        if conn:
+            sql = ''' INSERT INTO scores(score, timestamp, created_at, gamemode, game_sequence, mistakes, game_mode, time_taken, flags_shown, mode_data)
+                      VALUES(?,?,?,?,?,?,?,?,?,?) '''
+            with conn:
+                conn.executemany(sql, rows)
+
+def insert_score(db, score, game_sequence, wrong_countries, gamemode, game_mode, time_taken, flags_shown, mode_data):
+    """Insert a new score into the scores table."""
+    insert_scores(
+        db,
+        [build_score_row(score, game_sequence, wrong_countries, gamemode, game_mode, time_taken, flags_shown, mode_data)],
+    )
+
+def get_top_scores(db, gamemode, filter_mode="all", limit=10):
+    """Query top scores from the scores table based on gamemode and filter."""
+    with _connect(db) as conn:
+        if not conn:
+            return []
+
+        try:
+            cur = conn.cursor()
+            # Base query
+            query = "SELECT score, timestamp, gamemode, game_sequence, mistakes, game_mode, time_taken, flags_shown, mode_data FROM scores WHERE gamemode = ?"
+            params = [gamemode]
+
+            # Apply filter for specific game modes (normal, endless, blitz)
+            if filter_mode != "all":
+                query += " AND game_mode = ?"
+                params.append(filter_mode)
+
+            # Order by score and select top N
+            query += " ORDER BY score DESC, created_at DESC LIMIT ?"
+            params.append(limit)
+            
+            cur.execute(query, tuple(params))
+            rows = cur.fetchall()
+            return rows
+        except sqlite3.Error as e:
+            print(f"Database error in get_top_scores: {e}")
+            return []
+
+def get_score_maps(db):
+    """Return every map (the scores table's gamemode column) that has a score."""
+    with _connect(db) as conn:
+        if not conn:
+            return []
+        try:
+            return [row[0] for row in conn.execute("SELECT DISTINCT gamemode FROM scores ORDER BY gamemode")]
+        except sqlite3.Error as e:
+            print(f"Database error in get_score_maps: {e}")
+            return []
+
 
 # --- Flags Database Management ---
 
-def populate_flags_database(db_path):
+def get_countries(db, continent=None):
+    """Return {country: continent} for one continent, or for every flag when continent is None."""
+    with _connect(db) as conn:
+        if not conn:
+            return {}
+
+        if continent is None:
+            cursor = conn.execute("SELECT country, continent FROM flags")
+        else:
+            cursor = conn.execute("SELECT country, continent FROM flags WHERE continent = ?", (continent,))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+def get_country_aliases(db):
+    """Return {country: [alias, ...]} for the countries present in the flags table."""
+    with _connect(db) as conn:
+        if not conn:
+            return {}
+        try:
+            cursor = conn.execute(
+                "SELECT f.country, a.alias FROM flag_aliases a "
+                "JOIN flags f ON lower(f.country) = lower(a.country) ORDER BY f.country, a.alias"
+            )
+        except sqlite3.Error as e:
+            print(f"Database error in get_country_aliases: {e}")
+            return {}
+        aliases = {}
+        for country, alias in cursor.fetchall():
+            aliases.setdefault(country, []).append(alias)
+        return aliases
+
+def populate_flags_database(db):
     """
     Populates the flags database from the data folder.
     This should only be run if the database is missing or needs an update.
     """
-    conn = create_connection(db_path)
-    if not conn:
-        return
+    with _connect(db) as conn:
+        if not conn:
+            return
+        try:
+            migrate(conn, FLAGS_MIGRATIONS)
+        except sqlite3.Error as e:
+            print(f"Error migrating flags database: {e}")
+        _sync_flags(conn)
+
+# Alternative answers accepted for a country. Countries are matched
+# case-insensitively against the flags table, so entries for flags that are not
+# bundled are harmless.
+DEFAULT_FLAG_ALIASES = [
+    ("usa", "united states of america"),
+    ("us", "united states of america"),
+    ("united states", "united states of america"),
+    ("uk", "united kingdom"),
+    ("great britain", "united kingdom"),
+    ("britain", "united kingdom"),
+    ("uae", "united arab emirates"),
+    ("emirates", "united arab emirates"),
+    ("czechia", "czech republic"),
+    ("holland", "netherlands"),
+    ("turkiye", "turkey"),
+    ("macedonia", "north macedonia"),
+    ("bosnia", "bosnia and herzegovina"),
+    ("vatican", "vatican city"),
+    ("holy see", "vatican city"),
+    ("burma", "myanmar"),
+    ("timor-leste", "east timor"),
+    ("timor leste", "east timor"),
+    ("dprk", "north korea"),
+    ("rok", "south korea"),
+    ("russian federation", "russia"),
+    ("lao", "laos"),
+    ("kyrgyz republic", "kyrgyzstan"),
+    ("png", "papua new guinea"),
+    ("fsm", "micronesia"),
+    ("federated states of micronesia", "micronesia"),
+    ("st kitts and nevis", "saint kitts and nevis"),
+    ("st lucia", "saint lucia"),
+    ("st vincent and the grenadines", "saint vincent and the grenadines"),
+    ("saint vincent", "saint vincent and the grenadines"),
+    ("trinidad", "trinidad and tobago"),
+    ("antigua", "antigua and barbuda"),
+]
+
+def _flags_v1_aliases(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS flag_aliases (
+                        alias TEXT PRIMARY KEY COLLATE NOCASE,
+                        country TEXT NOT NULL
+                    );""")
+    conn.executemany("INSERT OR IGNORE INTO flag_aliases(alias, country) VALUES(?, ?)", DEFAULT_FLAG_ALIASES)
+
+# Applied in order; PRAGMA user_version records how many have run.
+FLAGS_MIGRATIONS = [
+    _flags_v1_aliases,
+]
+
+FLAG_CONTINENTS = ['africa', 'america', 'asia', 'europe', 'oceania']
 
+def _sync_flags(conn):
     sql_create_flags_table = """CREATE TABLE IF NOT EXISTS flags (
                                 id INTEGER PRIMARY KEY,
                                 country TEXT NOT NULL UNIQUE,
                                 continent TEXT NOT NULL
                             );"""
     create_table(conn, sql_create_flags_table)
+    sql_create_manifest_table = """CREATE TABLE IF NOT EXISTS flags_manifest (
+                                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                                    dir_fingerprint TEXT NOT NULL,
+                                    file_count INTEGER NOT NULL,
+                                    content_hash TEXT NOT NULL
+                                );"""
+    create_table(conn, sql_create_manifest_table)
 
-    cursor = conn.cursor()
-    print("Syncing flags database with asset files...")
     base_flags_path = resource_path("data/flags")
-    continents = ['africa', 'america', 'asia', 'europe', 'oceania']
+    manifest = conn.execute(
+        "SELECT dir_fingerprint, file_count, content_hash FROM flags_manifest WHERE id = 1"
+    ).fetchone()
+
+    # Adding, removing or renaming a flag bumps its continent directory's mtime,
+    # so an unchanged fingerprint means the listing cannot have changed either.
+    dir_fingerprint = _flags_dir_fingerprint(base_flags_path)
+    if manifest and manifest[0] == dir_fingerprint:
+        print("Flags database up to date.")
+        return
 
+    print("Syncing flags database with asset files...")
     discovered = {}
-    for continent in continents:
+    for continent in FLAG_CONTINENTS:
         continent_path = os.path.join(base_flags_path, continent)
         try:
             for filename in os.listdir(continent_path):
@@ -129,26 +406,49 @@ def populate_flags_database(db_path):
             print(f"Warning: Directory not found for continent: {continent}")
             continue
 
-    cursor.execute("SELECT country, continent FROM flags")
-    existing = {country: continent for country, continent in cursor.fetchall()}
+    content_hash = hashlib.sha1(
+        "\n".join(f"{country}\t{continent}" for country, continent in sorted(discovered.items())).encode("utf-8")
+    ).hexdigest()
 
-    inserted = 0
-    updated = 0
-    removed = 0
+    with conn:
+        if manifest and manifest[2] == content_hash:
+            # Directories were touched but the listing is identical.
+            _write_flags_manifest(conn, dir_fingerprint, len(discovered), content_hash)
+            print("Flags database up to date.")
+            return
 
-    for country, continent in discovered.items():
-        if country not in existing:
-            cursor.execute("INSERT INTO flags(country, continent) VALUES(?, ?)", (country, continent))
-            inserted += 1
-        elif existing[country] != continent:
-            cursor.execute("UPDATE flags SET continent = ? WHERE country = ?", (continent, country))
-            updated += 1
+        existing = {country: continent for country, continent in conn.execute("SELECT country, continent FROM flags")}
+        changed = [(country, continent) for country, continent in discovered.items() if existing.get(country) != continent]
+        stale = [(country,) for country in existing.keys() - discovered.keys()]
 
-    stale_countries = set(existing.keys()) - set(discovered.keys())
-    for country in stale_countries:
-        cursor.execute("DELETE FROM flags WHERE country = ?", (country,))
-        removed += 1
+        conn.executemany(
+            "INSERT INTO flags(country, continent) VALUES(?, ?) "
+            "ON CONFLICT(country) DO UPDATE SET continent = excluded.continent",
+            changed,
+        )
+        conn.executemany("DELETE FROM flags WHERE country = ?", stale)
+        _write_flags_manifest(conn, dir_fingerprint, len(discovered), content_hash)
 
-    conn.commit()
-    conn.close()
+    inserted = sum(1 for country, _ in changed if country not in existing)
+    updated = len(changed) - inserted
+    removed = len(stale)
     print(f"Flags database synced. Inserted: {inserted}, Updated: {updated}, Removed: {removed}")
+
+def _flags_dir_fingerprint(base_flags_path):
+    parts = []
+    for continent in FLAG_CONTINENTS:
+        try:
+            mtime = os.stat(os.path.join(base_flags_path, continent)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = "missing"
+        parts.append(f"{continent}:{mtime}")
+    return ";".join(parts)
+
+def _write_flags_manifest(conn, dir_fingerprint, file_count, content_hash):
+    conn.execute(
+        "INSERT OR REPLACE INTO flags_manifest(id, dir_fingerprint, file_count, content_hash) VALUES(1, ?, ?, ?)",
+        (dir_fingerprint, file_count, content_hash),
+    )
+
+def _describe(db):
+    return db.db_path if isinstance(db, ConnectionManager) else db
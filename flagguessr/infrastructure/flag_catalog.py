@@ -1,19 +1,48 @@
 from __future__ import annotations
 
 from flagguessr.infrastructure import db
-from flagguessr.infrastructure.countries import CountryLoader
+from flagguessr.infrastructure.countries import CountryLoader, LazyFlagImages
+from flagguessr.infrastructure.flag_disk_cache import FlagDiskCache
+from flagguessr.infrastructure.surface_cache import SurfaceCache, shared_surface_cache
 
 
 class SQLiteFlagCatalog:
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        surface_cache: SurfaceCache | None = None,
+        disk_cache: FlagDiskCache | None = None,
+    ):
         self.db_path = db_path
-        self.loader = CountryLoader()
+        self.connections = db.ConnectionManager(db_path)
+        self.loader = CountryLoader(disk_cache=disk_cache)
+        self.surface_cache = shared_surface_cache if surface_cache is None else surface_cache
 
     def initialize(self) -> None:
-        db.populate_flags_database(self.db_path)
+        db.populate_flags_database(self.connections)
 
     def load_countries(self, map_name: str) -> dict[str, str]:
-        return self.loader.load_countries(self.db_path, map_name.lower())
+        return self.loader.load_countries(self.connections, map_name.lower())
 
     def load_flag_images(self, countries_map: dict[str, str], size: tuple[int, int]):
-        return self.loader.load_flag_images(countries_map, size)
+        return self.loader.load_flag_images(countries_map, size, cache=self.surface_cache)
+
+    def prefetch_flags(self, flag_images, countries: list[str]) -> None:
+        if isinstance(flag_images, LazyFlagImages):
+            flag_images.prefetch(countries)
+
+    def is_flag_ready(self, flag_images, country: str) -> bool:
+        if isinstance(flag_images, LazyFlagImages):
+            return flag_images.is_ready(country)
+        return True
+
+    def is_flag_available(self, flag_images, country: str) -> bool:
+        if isinstance(flag_images, LazyFlagImages):
+            return flag_images.is_available(country)
+        return country in flag_images
+
+    def load_aliases(self) -> dict[str, list[str]]:
+        return db.get_country_aliases(self.connections)
+
+    def close(self) -> None:
+        self.connections.close()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import glob
+import os
+
+import pygame
+
+_FORMAT = "RGBA"
+_BYTES_PER_PIXEL = 4
+
+
+class FlagDiskCache:
+    """
+    Pre-scaled flag pixels stored as uncompressed RGBA files.
+
+    Entries are named after the source file's content hash and the target size,
+    so editing a flag PNG or changing the flag size simply misses the cache and
+    the stale file for that country is replaced on the next store.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def entry_path(self, country: str, digest: str, size: tuple[int, int]) -> str:
+        return os.path.join(self.root, f"{self._safe_name(country)}-{size[0]}x{size[1]}-{digest}.rgba")
+
+    def load(self, country: str, digest: str, size: tuple[int, int]) -> pygame.Surface | None:
+        path = self.entry_path(country, digest, size)
+        expected = size[0] * size[1] * _BYTES_PER_PIXEL
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if len(data) != expected:
+            # Truncated write or foreign file: drop it and let the caller rebuild.
+            self._remove(path)
+            return None
+        return pygame.image.frombytes(data, size, _FORMAT)
+
+    def store(self, country: str, digest: str, size: tuple[int, int], surface: pygame.Surface) -> None:
+        path = self.entry_path(country, digest, size)
+        pattern = os.path.join(self.root, f"{glob.escape(self._safe_name(country))}-{size[0]}x{size[1]}-*.rgba")
+        for stale in glob.glob(pattern):
+            if stale != path:
+                self._remove(stale)
+
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tobytes(surface, _FORMAT))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write flag cache entry {path}: {e}")
+            self._remove(tmp_path)
+
+    def clear(self) -> None:
+        for path in glob.glob(os.path.join(self.root, "*.rgba")):
+            self._remove(path)
+
+    @staticmethod
+    def _safe_name(country: str) -> str:
+        return country.replace(os.sep, "_").replace("/", "_")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from typing import Any, Callable
+
+from flagguessr.domain.models import GameSession
+from flagguessr.infrastructure import db
+
+# Columns of a db.build_score_row() row that db.get_top_scores() returns.
+_SCORE = 0
+_CREATED_AT = 2
+_MAP = 3
+_MODE = 6
+
+# Client errors worth retrying: the request timed out, or the server asked us to slow down.
+_RETRYABLE_STATUSES = (408, 429)
+
+
+def _as_ranking_row(row: tuple[Any, ...]) -> tuple[Any, ...]:
+    return row[:_CREATED_AT] + row[_CREATED_AT + 1:]
+
+
+class RemoteScoreRepository:
+    """
+    ScoreRepository backed by a shared score_server.
+
+    Nothing here blocks the caller on the network. save_score() queues a row.
+    A sync thread posts the queue in batches and retries failures with
+    exponential backoff. Each batch keeps its id across retries, so the server
+    can drop duplicates. The same thread polls the server's leaderboard
+    snapshot (revalidated with ETags). get_top_scores() answers from that
+    snapshot, merged with this kiosk's scores the snapshot does not show yet.
+    Scores still unsent at close() are spooled to disk and resent next time.
+    A batch the server refuses with a 4xx status (other than 408 and 429) is
+    never retried; it is set aside in a .rejected file next to the spool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        spool_path: str | None = None,
+        batch_size: int = 50,
+        flush_delay: float = 0.2,
+        refresh_interval: float = 5.0,
+        timeout: float = 3.0,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Called on the sync thread whenever a new snapshot arrives.
+        self.on_update: list[Callable[[], None]] = []
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._pending: list[tuple[Any, ...]] = []
+        self._inflight: tuple[str, list[tuple[Any, ...]]] | None = None
+        # Rows the server accepted, with the leaderboard version that includes them,
+        # kept until a snapshot at least that new arrives.
+        self._accepted: list[tuple[int, tuple[Any, ...]]] = []
+        self._snapshot: dict[str, dict[str, list[tuple[Any, ...]]]] = {}
+        self._snapshot_version = -1
+        self._server_id: str | None = None
+        self._snapshot_limit = 10
+        self._etag: str | None = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._refresh_at = 0.0
+        self._sync_thread: threading.Thread | None = None
+
+    def initialize(self) -> None:
+        self._load_spool()
+        with self._lock:
+            if self._sync_thread is not None:
+                return
+            self._sync_thread = threading.Thread(target=self._run, name="score-sync", daemon=True)
+            self._sync_thread.start()
+
+    def save_score(
+        self,
+        session: GameSession,
+        time_taken: int,
+        flags_shown: int,
+        mode_data: dict[str, Any],
+    ) -> None:
+        row = db.build_score_row(
+            session.score,
+            session.countries_sequence,
+            session.wrong_countries,
+            session.map_name,
+            session.mode.value,
+            time_taken,
+            flags_shown,
+            mode_data,
+        )
+        with self._lock:
+            self._pending.append(row)
+        self._wake.set()
+
+    def get_top_scores(self, gamemode: str, filter_mode: str = "all", limit: int = 10):
+        with self._lock:
+            if limit > self._snapshot_limit:
+                self._snapshot_limit = limit
+                self._refresh_at = 0.0
+                self._wake.set()
+            rows = list(self._snapshot.get(gamemode, {}).get(filter_mode, ()))
+            local = [row for row in self._unconfirmed_rows() if row[_MAP] == gamemode and filter_mode in ("all", row[_MODE])]
+
+        if local:
+            # Newest first among equal scores, like the database ordering.
+            local.sort(key=lambda row: row[_CREATED_AT], reverse=True)
+            rows = [_as_ranking_row(row) for row in local] + rows
+            rows.sort(key=lambda row: row[_SCORE], reverse=True)
+        return rows[:limit]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued score has been accepted by the server."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending and self._inflight is None:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._wake.set()
+            time.sleep(0.01)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending) + (len(self._inflight[1]) if self._inflight else 0)
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._sync_thread = self._sync_thread, None
+            self._stopping = True
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+        self._write_spool()
+
+    # --- Sync thread ---
+
+    def _unconfirmed_rows(self) -> list[tuple[Any, ...]]:
+        rows = [row for version, row in self._accepted if version > self._snapshot_version]
+        if self._inflight is not None:
+            rows.extend(self._inflight[1])
+        rows.extend(self._pending)
+        return rows
+
+    def _run(self) -> None:
+        while True:
+            # Cleared before looking for work, so a save during this pass still wakes the next wait.
+            self._wake.clear()
+            with self._lock:
+                stopping = self._stopping
+            now = time.monotonic()
+
+            if self._has_rows() and now >= self._retry_at:
+                if not stopping and self._inflight is None:
+                    # Let scores submitted together go out together.
+                    time.sleep(self.flush_delay)
+                self._send_batch()
+            elif stopping:
+                return
+
+            if stopping:
+                if self._failures:
+                    return
+                continue
+
+            if time.monotonic() >= self._refresh_at:
+                self._refresh_snapshot()
+
+            self._wake.wait(self._next_wake())
+
+    def _has_rows(self) -> bool:
+        with self._lock:
+            return bool(self._pending) or self._inflight is not None
+
+    def _next_wake(self) -> float:
+        now = time.monotonic()
+        deadline = self._refresh_at
+        if self._has_rows():
+            deadline = min(deadline, self._retry_at)
+        return max(0.0, deadline - now)
+
+    def _send_batch(self) -> None:
+        with self._lock:
+            if self._inflight is None:
+                rows, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+                self._inflight = (uuid.uuid4().hex, rows)
+            batch_id, rows = self._inflight
+
+        try:
+            response = self._request("POST", "/scores", {"batch_id": batch_id, "rows": rows})
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code not in _RETRYABLE_STATUSES:
+                # The server will never take this batch; retrying would block every later score.
+                self._reject_batch(rows, e)
+                return
+            self._retry_later(rows, e)
+            return
+        except (OSError, ValueError) as e:
+            self._retry_later(rows, e)
+            return
+
+        self._failures = 0
+        self._retry_at = 0.0
+        with self._lock:
+            self._inflight = None
+            self._accepted.extend((response["version"], row) for row in rows)
+        # A new score changes the leaderboard; fetch it right away.
+        self._refresh_at = 0.0
+
+    def _retry_later(self, rows: list[tuple[Any, ...]], error: Exception) -> None:
+        self._failures += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (self._failures - 1))
+        # Jitter, so kiosks that lost the server together do not retry in lockstep.
+        delay *= random.uniform(0.5, 1.0)
+        self._retry_at = time.monotonic() + delay
+        print(f"Could not send {len(rows)} score(s) to {self.base_url} (attempt {self._failures}), retrying in {delay:.1f}s: {error}")
+
+    def _reject_batch(self, rows: list[tuple[Any, ...]], error: urllib.error.HTTPError) -> None:
+        self._failures = 0
+        self._retry_at = 0.0
+        with self._lock:
+            self._inflight = None
+        path = self._rejected_path()
+        print(f"Score server rejected {len(rows)} score(s) ({error.code} {error.reason}); not retrying")
+        if not path:
+            return
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+            print(f"Rejected score(s) saved to {path}")
+        except OSError as e:
+            print(f"Error saving rejected scores to {path}: {e}")
+
+    def _refresh_snapshot(self) -> None:
+        self._refresh_at = time.monotonic() + self.refresh_interval
+        with self._lock:
+            limit = self._snapshot_limit
+        try:
+            payload = self._request("GET", f"/snapshot?limit={limit}", etag=self._etag)
+        except (OSError, ValueError) as e:
+            print(f"Could not refresh rankings from {self.base_url}: {e}")
+            return
+        if payload is None:
+            return
+
+        snapshot = {
+            map_name: {filter_mode: [tuple(row) for row in rows] for filter_mode, rows in filters.items()}
+            for map_name, filters in payload["rankings"].items()
+        }
+        with self._lock:
+            if payload["server"] != self._server_id:
+                # A restarted server counts versions from 0 again, and everything it
+                # accepted before is already in its database.
+                self._server_id = payload["server"]
+                self._accepted = []
+            self._snapshot = snapshot
+            self._snapshot_version = payload["version"]
+            self._accepted = [(version, row) for version, row in self._accepted if version > payload["version"]]
+        for callback in self.on_update:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in rankings update callback: {e}")
+
+    def _request(self, method: str, path: str, payload: Any = None, etag: str | None = None):
+        """JSON response of one request, or None for 304 Not Modified."""
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        request.add_header("Content-Type", "application/json")
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if method == "GET":
+                    self._etag = response.headers.get("ETag")
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+
+    # --- Spool ---
+
+    def _rejected_path(self) -> str | None:
+        """Where batches the server refused are kept for inspection, next to the spool."""
+        if not self.spool_path:
+            return None
+        root, ext = os.path.splitext(self.spool_path)
+        return f"{root}.rejected{ext or '.jsonl'}"
+
+    def _load_spool(self) -> None:
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                rows = [tuple(json.loads(line)) for line in f if line.strip()]
+            os.remove(self.spool_path)
+        except (OSError, ValueError) as e:
+            print(f"Error reading unsent scores from {self.spool_path}: {e}")
+            return
+        with self._lock:
+            self._pending[:0] = rows
+        if rows:
+            print(f"Resending {len(rows)} score(s) saved while the score server was unreachable")
+
+    def _write_spool(self) -> None:
+        with self._lock:
+            rows = (self._inflight[1] if self._inflight else []) + self._pending
+        if not rows:
+            return
+        if not self.spool_path:
+            print(f"Dropped {len(rows)} score(s) that could not reach {self.base_url}")
+            return
+        try:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+            print(f"Saved {len(rows)} unsent score(s) to {self.spool_path}")
+        except OSError as e:
+            print(f"Error saving unsent scores to {self.spool_path}: {e}")
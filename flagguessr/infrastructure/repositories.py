@@ -9,19 +9,19 @@ from flagguessr.domain.models import GameSession
 class SQLiteScoreRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self.connections = db.ConnectionManager(db_path)
 
     def initialize(self) -> None:
-        db.create_scores_table(self.db_path)
+        db.create_scores_table(self.connections)
 
-    def save_score(
+    def build_row(
         self,
         session: GameSession,
         time_taken: int,
         flags_shown: int,
         mode_data: dict[str, Any],
-    ) -> None:
-        db.insert_score(
-            self.db_path,
+    ) -> tuple[Any, ...]:
+        return db.build_score_row(
             session.score,
             session.countries_sequence,
             session.wrong_countries,
@@ -32,5 +32,23 @@ class SQLiteScoreRepository:
             mode_data,
         )
 
+    def save_score(
+        self,
+        session: GameSession,
+        time_taken: int,
+        flags_shown: int,
+        mode_data: dict[str, Any],
+    ) -> None:
+        self.save_rows([self.build_row(session, time_taken, flags_shown, mode_data)])
+
+    def save_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        db.insert_scores(self.connections, rows)
+
     def get_top_scores(self, gamemode: str, filter_mode: str = "all", limit: int = 10):
-        return db.get_top_scores(self.db_path, gamemode, filter_mode, limit)
+        return db.get_top_scores(self.connections, gamemode, filter_mode, limit)
+
+    def get_maps(self) -> list[str]:
+        return db.get_score_maps(self.connections)
+
+    def close(self) -> None:
+        self.connections.close()
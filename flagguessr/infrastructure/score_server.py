@@ -0,0 +1,362 @@
+"""
+Shared leaderboard server: a small asyncio HTTP/JSON front end to one scores.db.
+
+    python -m flagguessr.infrastructure.score_server --host 0.0.0.0 --port 8765
+
+Kiosks point FLAGGUESSR_SCORE_SERVER at it (see RemoteScoreRepository).
+
+    POST /scores    {"batch_id": str, "rows": [[...], ...]}  rows from db.build_score_row()
+    GET  /snapshot?limit=N                                    top N per map and filter
+    GET  /health
+
+Concurrent submissions are group-committed: one writer task drains every
+batch that arrived meanwhile into a single transaction. Snapshots are built
+once per leaderboard version and revalidated with ETags, so idle clients
+polling it cost one header comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from flagguessr.infrastructure.repositories import SQLiteScoreRepository
+from flagguessr.shared.paths import get_user_data_path
+
+SNAPSHOT_FILTERS = ("all", "normal", "endless", "blitz")
+ROW_FIELDS = 10
+# Accepted JSON types per db.build_score_row() field; None where the column is nullable.
+ROW_TYPES = (
+    ("score", (int,)),
+    ("timestamp", (str,)),
+    ("created_at", (int,)),
+    ("gamemode", (str,)),
+    ("game_sequence", (str, type(None))),
+    ("mistakes", (str, type(None))),
+    ("game_mode", (str, type(None))),
+    ("time_taken", (int, float, type(None))),
+    ("flags_shown", (int, type(None))),
+    ("mode_data", (str, type(None))),
+)
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _check_row(row: tuple) -> None:
+    if len(row) != ROW_FIELDS:
+        raise HTTPError(400, f"score rows have {ROW_FIELDS} fields")
+    for value, (name, types) in zip(row, ROW_TYPES):
+        # bool is an int subclass, but never a valid score field.
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise HTTPError(400, f"score field {name} has the wrong type")
+
+
+class ScoreServer:
+    def __init__(
+        self,
+        repository: SQLiteScoreRepository,
+        max_body: int = 1 << 20,
+        max_snapshot_limit: int = 100,
+        remembered_batches: int = 4096,
+    ):
+        self.repository = repository
+        self.max_body = max_body
+        self.max_snapshot_limit = max_snapshot_limit
+        # Bumped on every committed batch; snapshots and ETags are keyed on it,
+        # and on the instance id, since a restarted server counts from 0 again.
+        # Only the db thread writes it, right after the commit, so a snapshot
+        # built there always matches the version it is labeled with.
+        self.version = 0
+        self.instance = uuid.uuid4().hex[:12]
+        self._snapshots: dict[int, tuple[int, bytes]] = {}
+        # Batch ids already committed, so a client retrying after a lost response
+        # does not insert its scores twice.
+        self._seen_batches: OrderedDict[str, int] = OrderedDict()
+        self._remembered_batches = remembered_batches
+        # SQLite work runs on one thread, off the event loop.
+        self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score-server-db")
+        self._pending: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> int:
+        """Listen on host:port and return the bound port (useful with port 0)."""
+        await self._run_db(self.repository.initialize)
+        self._loop = asyncio.get_running_loop()
+        self._pending = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_batches())
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer is not None:
+            self._writer.cancel()
+        await self._run_db(self.repository.close)
+        self._db.shutdown(wait=True)
+
+    def serve_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Run the server on a background event loop (tests, or a kiosk hosting it)."""
+        started = threading.Event()
+        result: dict[str, Any] = {}
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            try:
+                result["port"] = loop.run_until_complete(self.start(host, port))
+            except Exception as e:
+                result["error"] = e
+                started.set()
+                loop.close()
+                return
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.close())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="score-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if "error" in result:
+            raise result["error"]
+        return result["port"]
+
+    def stop(self) -> None:
+        """Stop a server started with serve_in_thread()."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def _run_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db, func, *args)
+
+    # --- HTTP ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await self._read_request(reader)
+                status, payload, extra = await self._dispatch(method, target, headers, body)
+            except HTTPError as e:
+                status, payload, extra = e.status, json.dumps({"error": str(e)}).encode(), {}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception as e:
+                print(f"Score server error: {e}")
+                status, payload, extra = 500, b'{"error": "internal error"}', {}
+            await self._write_response(writer, status, payload, extra)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HTTPError(400, "malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "bad Content-Length")
+        if length > self.max_body:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _write_response(self, writer, status: int, payload: bytes, extra: dict[str, str]) -> None:
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Connection: close"]
+        if status != 304:
+            head.append("Content-Type: application/json")
+            head.append(f"Content-Length: {len(payload)}")
+        head.extend(f"{name}: {value}" for name, value in extra.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if status != 304:
+            writer.write(payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _dispatch(self, method: str, target: str, headers: dict[str, str], body: bytes):
+        url = urlsplit(target)
+        if method == "POST" and url.path == "/scores":
+            return 200, json.dumps(await self._post_scores(body)).encode(), {}
+        if method == "GET" and url.path == "/snapshot":
+            return await self._get_snapshot(parse_qs(url.query), headers)
+        if method == "GET" and url.path == "/health":
+            return 200, json.dumps({"ok": True, "version": self.version}).encode(), {}
+        raise HTTPError(404, f"no route for {method} {url.path}")
+
+    # --- Ingestion ---
+
+    async def _post_scores(self, body: bytes) -> dict[str, Any]:
+        try:
+            payload = json.loads(body)
+            batch_id = str(payload["batch_id"])
+            rows = [tuple(row) for row in payload["rows"]]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, "expected {\"batch_id\": ..., \"rows\": [...]}")
+        for row in rows:
+            _check_row(row)
+
+        if batch_id in self._seen_batches:
+            return {"accepted": 0, "duplicate": True, "version": self._seen_batches[batch_id]}
+
+        done = asyncio.get_running_loop().create_future()
+        await self._pending.put((batch_id, rows, done))
+        version = await done
+        return {"accepted": len(rows), "duplicate": False, "version": version}
+
+    async def _write_batches(self) -> None:
+        while True:
+            batches = [await self._pending.get()]
+            while not self._pending.empty():
+                batches.append(self._pending.get_nowait())
+
+            # batch id -> (rows, waiters); a retry can race its own original here.
+            fresh: dict[str, tuple[list[tuple], list[asyncio.Future]]] = {}
+            for batch_id, rows, done in batches:
+                if batch_id in self._seen_batches:
+                    done.set_result(self._seen_batches[batch_id])
+                else:
+                    fresh.setdefault(batch_id, (rows, []))[1].append(done)
+            if not fresh:
+                continue
+
+            rows = [row for batch_rows, _ in fresh.values() for row in batch_rows]
+            try:
+                version = await self._run_db(self._commit, rows)
+                committed = {batch_id: version for batch_id in fresh}
+            except sqlite3.Error as e:
+                print(f"Score server could not store {len(rows)} score(s): {e}")
+                # One bad batch must not fail everyone it was grouped with.
+                committed = await self._commit_each(fresh) if len(fresh) > 1 else {}
+
+            if committed:
+                self._snapshots.clear()
+            for batch_id, (_, waiters) in fresh.items():
+                if batch_id in committed:
+                    self._remember(batch_id, committed[batch_id])
+                    for done in waiters:
+                        done.set_result(committed[batch_id])
+                else:
+                    for done in waiters:
+                        done.set_exception(HTTPError(500, "could not store scores"))
+
+    async def _commit_each(self, fresh: dict[str, tuple[list[tuple], list[asyncio.Future]]]) -> dict[str, int]:
+        """Retry a failed group commit batch by batch; returns batch id -> version for the ones stored."""
+        committed = {}
+        for batch_id, (rows, _) in fresh.items():
+            try:
+                committed[batch_id] = await self._run_db(self._commit, rows)
+            except sqlite3.Error as e:
+                print(f"Score server could not store batch {batch_id} ({len(rows)} score(s)): {e}")
+        return committed
+
+    def _commit(self, rows: list[tuple]) -> int:
+        self.repository.save_rows(rows)
+        self.version += 1
+        return self.version
+
+    def _remember(self, batch_id: str, version: int) -> None:
+        self._seen_batches[batch_id] = version
+        while len(self._seen_batches) > self._remembered_batches:
+            self._seen_batches.popitem(last=False)
+
+    # --- Reads ---
+
+    async def _get_snapshot(self, query: dict[str, list[str]], headers: dict[str, str]):
+        try:
+            limit = int(query.get("limit", ["10"])[0])
+        except ValueError:
+            raise HTTPError(400, "limit must be an integer")
+        limit = max(1, min(limit, self.max_snapshot_limit))
+
+        if headers.get("if-none-match") == self._etag(self.version, limit):
+            return 304, b"", {"ETag": self._etag(self.version, limit)}
+
+        cached = self._snapshots.get(limit)
+        if cached is None or cached[0] != self.version:
+            version, rankings = await self._run_db(self._build_snapshot, limit)
+            payload = json.dumps(
+                {"server": self.instance, "version": version, "limit": limit, "rankings": rankings}
+            ).encode()
+            cached = (version, payload)
+            self._snapshots[limit] = cached
+        return 200, cached[1], {"ETag": self._etag(cached[0], limit)}
+
+    def _etag(self, version: int, limit: int) -> str:
+        return f'"{self.instance}-{version}-{limit}"'
+
+    def _build_snapshot(self, limit: int) -> tuple[int, dict[str, dict[str, list[list[Any]]]]]:
+        """(version, rankings), read together on the db thread that bumps the version."""
+        version = self.version
+        maps = self.repository.get_maps()
+        rankings = {
+            map_name: {
+                filter_mode: [list(row) for row in self.repository.get_top_scores(map_name, filter_mode, limit)]
+                for filter_mode in SNAPSHOT_FILTERS
+            }
+            for map_name in maps
+        }
+        return version, rankings
+
+
+async def serve(db_path: str, host: str, port: int) -> None:
+    server = ScoreServer(SQLiteScoreRepository(db_path))
+    bound = await server.start(host, port)
+    print(f"Score server listening on http://{host}:{bound} (database: {db_path})")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Shared FlagGuessr leaderboard server.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (0.0.0.0 for the whole network)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=None, help="scores database (default: leaderboard.db in the user data folder)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.db or get_user_data_path("leaderboard.db"), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
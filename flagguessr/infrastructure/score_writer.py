@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any
+
+from flagguessr.domain.models import GameSession
+from flagguessr.infrastructure.repositories import SQLiteScoreRepository
+
+_STOP = object()
+
+
+class WriteBehindScoreRepository:
+    """
+    ScoreRepository that persists scores on a background writer thread.
+
+    save_score() snapshots the session into a row, queues it and returns; the
+    caller never touches the disk. The writer drains the queue in batches: it
+    appends each batch to an append-only journal (one fsync per batch), commits
+    it in one transaction and then drops the committed rows from the journal.
+    Failed batches are retried with capped backoff rather than dropped, and rows
+    still in the journal after a crash or a failed shutdown are replayed by the
+    next initialize(). A crash between a commit and the journal update can
+    replay a score twice; a score is only lost if the process dies in the short
+    gap before the writer has journaled it.
+
+    When max_pending rows are already queued, save_score() waits for the writer
+    to make room instead of writing the row itself.
+
+    get_top_scores() flushes first, so reads do not miss a score that was
+    already submitted unless the database stays unwritable past read_timeout.
+    """
+
+    def __init__(
+        self,
+        repository: SQLiteScoreRepository,
+        journal_path: str | None = None,
+        max_pending: int = 256,
+        batch_size: int = 32,
+        retry_delay: float = 0.05,
+        max_retry_delay: float = 5.0,
+        read_timeout: float = 2.0,
+    ):
+        self.repository = repository
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.read_timeout = read_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._writer: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Rows are outstanding from save_score() until their batch is settled.
+        # The condition only guards the counter; no disk I/O happens under it.
+        self._idle = threading.Condition()
+        self._outstanding = 0
+        # Rows the journal file currently holds. Only the writer thread touches
+        # the file and this list (initialize() fills it before the writer starts).
+        self._journal_rows: list[tuple[Any, ...]] = []
+
+    def initialize(self) -> None:
+        self.repository.initialize()
+        recovered = self._read_journal()
+        if self._writer is None:
+            self._journal_rows = list(recovered)
+        self._start_writer()
+        if recovered:
+            print(f"Recovering {len(recovered)} score(s) from {self.journal_path}")
+            with self._idle:
+                self._outstanding += len(recovered)
+            for row in recovered:
+                # Already in the journal, so the writer must not append them again.
+                self._queue.put((row, True))
+
+    def save_score(
+        self,
+        session: GameSession,
+        time_taken: int,
+        flags_shown: int,
+        mode_data: dict[str, Any],
+    ) -> None:
+        row = self.repository.build_row(session, time_taken, flags_shown, mode_data)
+        if self._writer is None:
+            self.repository.save_rows([row])
+            return
+
+        with self._idle:
+            self._outstanding += 1
+        try:
+            self._queue.put_nowait((row, False))
+        except queue.Full:
+            # Backpressure: wait for the writer to make room rather than writing inline.
+            print("Warning: score write queue full, waiting for the score writer")
+            self._queue.put((row, False))
+
+    def get_top_scores(self, gamemode: str, filter_mode: str = "all", limit: int = 10):
+        if not self.flush(self.read_timeout):
+            print(f"Warning: reading rankings with {self.pending()} score(s) not yet written")
+        return self.repository.get_top_scores(gamemode, filter_mode, limit)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued score has been written or deferred; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+
+    def pending(self) -> int:
+        with self._idle:
+            return self._outstanding
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            # Ends retries early; whatever is still failing stays in the journal.
+            self._stopping.set()
+            self._queue.put(_STOP)
+            writer.join()
+            atexit.unregister(self.close)
+        self.repository.close()
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._stopping.clear()
+            self._writer = threading.Thread(target=self._run, name="score-writer", daemon=True)
+            self._writer.start()
+        # Flush on interpreter exit too, for shutdowns that bypass GameController.run().
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is _STOP
+            try:
+                if not stop:
+                    batch.append(item)
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        batch.append(item)
+                if batch:
+                    self._write_batch(batch)
+            except Exception as e:
+                print(f"Error in score writer: {e}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: list[tuple[tuple[Any, ...], bool]]) -> None:
+        rows = [row for row, _ in batch]
+        committed = False
+        try:
+            self._append_journal([row for row, journaled in batch if not journaled])
+            committed = self._save_with_retry(rows)
+        except Exception as e:
+            print(f"Error writing {len(rows)} score(s), keeping them for the next start: {e}")
+        finally:
+            if committed:
+                self._forget(rows)
+            self._settle(len(rows))
+
+    def _save_with_retry(self, batch: list[tuple[Any, ...]]) -> bool:
+        delay = self.retry_delay
+        attempt = 1
+        while True:
+            try:
+                self.repository.save_rows(batch)
+                return True
+            except sqlite3.Error as e:
+                if self._stopping.is_set():
+                    print(f"Error writing {len(batch)} score(s) while closing, keeping them for the next start: {e}")
+                    return False
+                print(f"Error writing {len(batch)} score(s) (attempt {attempt}), retrying in {delay:.2f}s: {e}")
+            self._stopping.wait(delay)
+            delay = min(self.max_retry_delay, delay * 2)
+            attempt += 1
+
+    def _settle(self, count: int) -> None:
+        with self._idle:
+            self._outstanding -= count
+            self._idle.notify_all()
+
+    # --- Journal (writer thread only) ---
+
+    def _append_journal(self, rows: list[tuple[Any, ...]]) -> None:
+        if not self.journal_path or not rows:
+            return
+        self._journal_rows.extend(rows)
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error journaling {len(rows)} score(s) to {self.journal_path}: {e}")
+
+    def _forget(self, rows: list[tuple[Any, ...]]) -> None:
+        """Drop committed rows from the journal, keeping any that are still unwritten."""
+        if not self.journal_path:
+            return
+        committed = {id(row) for row in rows}
+        remaining = [row for row in self._journal_rows if id(row) not in committed]
+        if len(remaining) == len(self._journal_rows):
+            return
+        self._journal_rows = remaining
+        self._rewrite_journal(remaining)
+
+    def _rewrite_journal(self, rows: list[tuple[Any, ...]]) -> None:
+        """Replace the journal with `rows`, which is usually none: truncate it."""
+        try:
+            if not rows:
+                if os.path.exists(self.journal_path):
+                    open(self.journal_path, "w").close()
+                return
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            print(f"Error rewriting score journal {self.journal_path}: {e}")
+
+    def _read_journal(self) -> list[tuple[Any, ...]]:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        rows = []
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        rows.append(tuple(json.loads(line)))
+                    except ValueError:
+                        # A line cut short by a crash mid-write.
+                        print(f"Skipping unreadable line in {self.journal_path}")
+        except OSError as e:
+            print(f"Error reading score journal {self.journal_path}: {e}")
+        return rows
@@ -1,21 +1,32 @@
 from __future__ import annotations
 
+import time
 from typing import Type
 
 import pygame
 
 from flagguessr.application.use_cases import GameService
 from flagguessr.domain.models import GameConfig, RunningGame
+from flagguessr.presentation.profiler import FrameProfiler
 from flagguessr.presentation.states import BaseState, SplashState
+from flagguessr.shared.paths import get_user_data_path
 
 
 class GameController:
+    # Animated states run at FRAME_RATE. Static states sleep until an event
+    # arrives, waking every IDLE_TIMEOUT_MS so state that changes outside the
+    # event queue (e.g. a song finishing) still reaches the screen.
+    FRAME_RATE = 60
+    IDLE_TIMEOUT_MS = 500
+
     def __init__(
         self,
         gui,
         game_service: GameService,
         config: GameConfig,
         gamemodes: list[str],
+        profiler: FrameProfiler | None = None,
+        started_at: float | None = None,
     ):
         self.gui = gui
         self.game_service = game_service
@@ -25,8 +36,19 @@ class GameController:
         self.running = True
         self.active_game: RunningGame | None = None
         self.previous_screen_for_rankings: str | None = None
+        self.pending_game: tuple[str, str] | None = None
 
         self.clock = pygame.time.Clock()
+        self.profiler = profiler if profiler is not None else FrameProfiler.from_env()
+        if self.profiler.enabled:
+            self.profiler.instrument(gui)
+        self._overlay_rect: pygame.Rect | None = None
+
+        # `started_at` is a time.perf_counter() timestamp taken as early as possible
+        # in the process; slow startup work runs on background threads instead.
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.time_to_first_frame_ms: float | None = None
+
         self.state: BaseState = SplashState(self)
         self.state.enter()
 
@@ -35,13 +57,78 @@ class GameController:
         self.state.enter()
 
     def run(self) -> None:
-        while self.running:
-            self.state.update()
-            self.state.render()
+        profiler = self.profiler
+        try:
+            while self.running:
+                profiler.begin_frame()
+                with profiler.phase("update"):
+                    self.state.update()
+                rendered = self.state
+                with profiler.phase("render"):
+                    rendered.render()
+                if profiler.overlay_visible:
+                    self._overlay_rect = profiler.draw_overlay(self.gui)
+                if self.time_to_first_frame_ms is None:
+                    self._finish_startup()
+
+                # A state that swapped itself out while rendering has not drawn
+                # its successor yet, so never go idle on that frame.
+                with profiler.phase("idle"):
+                    events = self._next_events(block=self.state is rendered)
+                with profiler.phase("events"):
+                    for event in events:
+                        if not self._handle_profiler_hotkey(event):
+                            self.state.handle_event(event)
+                profiler.end_frame()
+
+                self.clock.tick(self.FRAME_RATE)
+        finally:
+            self.game_service.shutdown()
+            pygame.quit()
+
+    def _finish_startup(self) -> None:
+        self.time_to_first_frame_ms = (time.perf_counter() - self.started_at) * 1000
+        self.profiler.marks["time_to_first_frame_ms"] = round(self.time_to_first_frame_ms, 3)
+        print(f"First frame after {self.time_to_first_frame_ms:.0f} ms")
+
+    def _handle_profiler_hotkey(self, event: pygame.event.Event) -> bool:
+        """F3 toggles the frame-time overlay (enabling the profiler), F4 exports it."""
+        if event.type != pygame.KEYDOWN:
+            return False
+
+        if event.key == pygame.K_F3:
+            profiler = self.profiler
+            if not profiler.enabled:
+                profiler.enabled = True
+                profiler.instrument(self.gui)
+            profiler.overlay_visible = not profiler.overlay_visible
+            if not profiler.overlay_visible and self._overlay_rect is not None:
+                self.gui.frame.invalidate(self._overlay_rect)
+                self._overlay_rect = None
+            return True
+
+        if event.key == pygame.K_F4:
+            if not self.profiler.frames:
+                self.gui._flash_message("Profiler is off (set FLAGGUESSR_PROFILE=1 or press F3)", style="danger")
+                return True
+            path = get_user_data_path(f"profile-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            try:
+                self.profiler.export(path)
+            except OSError as e:
+                print(f"Error exporting profile to {path}: {e}")
+                self.gui.show_error_message("Could not export the profile.")
+            else:
+                print(f"Profile exported to {path}")
+                self.gui._flash_message("Profile exported to the user data folder.", style="success")
+            return True
 
-            for event in pygame.event.get():
-                self.state.handle_event(event)
+        return False
 
-            self.clock.tick(60)
+    def _next_events(self, block: bool = True) -> list[pygame.event.Event]:
+        if not block or self.state.is_animated():
+            return pygame.event.get()
 
-        pygame.quit()
+        event = pygame.event.wait(self.IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event, *pygame.event.get()]
@@ -1,11 +1,14 @@
 import pygame
 
 from flagguessr.presentation.ui.background import build_static_background
+from flagguessr.presentation.ui.damage import DamageTracker
 from flagguessr.presentation.ui.interactions import InteractionMixin
 from flagguessr.presentation.ui.layout import initialize_layout
 from flagguessr.presentation.ui.music import MusicMixin
 from flagguessr.presentation.ui.screens import ScreenMixin
+from flagguessr.presentation.ui.text_cache import TextCache
 from flagguessr.presentation.ui.theme import build_color_palette, build_fonts
+from flagguessr.presentation.ui.widget_cache import WidgetSurfaceCache
 from flagguessr.presentation.ui.widgets import WidgetMixin
 
 
@@ -17,6 +20,8 @@ class GUI(WidgetMixin, MusicMixin, ScreenMixin, InteractionMixin):
 
         self.colors = build_color_palette()
         self.fonts = build_fonts()
+        self.text_cache = TextCache()
+        self.widget_cache = WidgetSurfaceCache()
 
         self.font = self.fonts["body"]
         self.flag_size = (560, 360)
@@ -26,6 +31,8 @@ class GUI(WidgetMixin, MusicMixin, ScreenMixin, InteractionMixin):
         self.mouse_x, self.mouse_y = pygame.mouse.get_pos()
         self.input_text = ""
         self.input_active = True
+        self.suggestions = []
+        self.suggestion_rects = []
 
         self.selected_mode = "normal"
         self.selected_mode_map = "europe"
@@ -56,6 +63,7 @@ class GUI(WidgetMixin, MusicMixin, ScreenMixin, InteractionMixin):
         }
 
         self._build_static_background()
+        self.frame = DamageTracker(self.screen, self.background)
         self._init_layout()
 
     def _init_layout(self):
@@ -64,6 +72,10 @@ class GUI(WidgetMixin, MusicMixin, ScreenMixin, InteractionMixin):
     def _build_static_background(self):
         self.background = build_static_background(self.width, self.height, self.colors)
 
+    def invalidate(self):
+        """Repaint the whole window on the next frame (e.g. after it was exposed)."""
+        self.frame.invalidate()
+
     def get_rankings_gamemode(self):
         return self.rankings_gamemode
 
@@ -79,6 +91,9 @@ class GUI(WidgetMixin, MusicMixin, ScreenMixin, InteractionMixin):
     def set_input_text(self, new_text):
         self.input_text = new_text
 
+    def set_suggestions(self, suggestions):
+        self.suggestions = list(suggestions)
+
     def get_x_y(self):
         return self.mouse_x, self.mouse_y
 
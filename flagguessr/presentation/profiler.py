@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable
+
+import pygame
+
+PROFILE_ENV_VAR = "FLAGGUESSR_PROFILE"
+
+# Phases that add up to the work done in one frame; "idle" (waiting for
+# events) and the clock's sleep are deliberately left out.
+FRAME_PHASES = ("update", "render", "events")
+
+_NO_PHASE = nullcontext()
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """
+    Per-frame timings of the main loop, kept in a ring buffer.
+
+    The controller times its phases (update, render, idle, events); instrument()
+    additionally times every GUI show* method and each DamageTracker.present()
+    call. Nested timings are inclusive: "render" contains the show* call, which
+    contains "present". While disabled every hook is a no-op.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 600):
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.frames: deque[dict[str, float]] = deque(maxlen=capacity)
+        # One-off measurements, e.g. time_to_first_frame_ms.
+        self.marks: dict[str, float] = {}
+        self._current: dict[str, float] | None = None
+        self._instrumented: set[int] = set()
+
+    @classmethod
+    def from_env(cls) -> "FrameProfiler":
+        value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+        return cls(enabled=value not in ("", "0", "false", "no", "off"))
+
+    def begin_frame(self) -> None:
+        self._current = {} if self.enabled else None
+
+    def end_frame(self) -> None:
+        if self._current is None:
+            return
+        self._current["frame"] = sum(self._current.get(name, 0.0) for name in FRAME_PHASES)
+        self.frames.append(self._current)
+        self._current = None
+
+    def phase(self, name: str):
+        if self._current is None:
+            return _NO_PHASE
+        return self._timed_phase(name)
+
+    @contextmanager
+    def _timed_phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current = self._current
+            if current is not None:
+                current[name] = current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def instrument(self, gui) -> None:
+        """Wrap gui.show* and gui.frame.present so their cost shows up per frame."""
+        if id(gui) in self._instrumented:
+            return
+        self._instrumented.add(id(gui))
+        for name in dir(type(gui)):
+            if name.startswith("show") and callable(getattr(gui, name)):
+                setattr(gui, name, self._wrap(name, getattr(gui, name)))
+        gui.frame.present = self._wrap("present", gui.frame.present)
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        timed.__wrapped__ = func
+        return timed
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """p50/p99/max in milliseconds for every phase seen in the buffer."""
+        samples: dict[str, list[float]] = {}
+        for frame in self.frames:
+            for name, value in frame.items():
+                samples.setdefault(name, []).append(value)
+
+        result = {}
+        for name, values in samples.items():
+            values.sort()
+            result[name] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50), 3),
+                "p99_ms": round(_percentile(values, 0.99), 3),
+                "max_ms": round(values[-1], 3),
+            }
+        return result
+
+    def export(self, path: str) -> str:
+        payload = {
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "frame_phases": list(FRAME_PHASES),
+            "marks": dict(self.marks),
+            "summary": self.summary(),
+            "frames": [
+                {name: round(value, 3) for name, value in frame.items()}
+                for frame in self.frames
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=1)
+        return path
+
+    def overlay_lines(self) -> list[str]:
+        summary = self.summary()
+        frame = summary.get("frame")
+        if frame is None:
+            return ["profiler: no frames yet"]
+
+        lines = [f"frame  p50 {frame['p50_ms']:.2f}  p99 {frame['p99_ms']:.2f} ms  ({frame['count']})"]
+        for name in (*FRAME_PHASES, "present"):
+            stats = summary.get(name)
+            if stats:
+                lines.append(f"{name:<7}p50 {stats['p50_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms")
+        screens = sorted(
+            (name for name in summary if name.startswith("show")),
+            key=lambda name: summary[name]["p99_ms"],
+            reverse=True,
+        )
+        for name in screens[:3]:
+            lines.append(f"{name}  p99 {summary[name]['p99_ms']:.2f} ms")
+        return lines
+
+    def draw_overlay(self, gui) -> pygame.Rect:
+        """
+        Draw the stats straight onto the screen and push them. The area is
+        invalidated on the damage tracker so the screen below repaints it next frame.
+        """
+        lines = self.overlay_lines()
+        line_height = gui.fonts["tiny"].get_linesize()
+        width = max(gui.fonts["tiny"].size(line)[0] for line in lines) + 20
+        rect = pygame.Rect(8, 8, width, line_height * len(lines) + 16)
+
+        gui._draw_panel(rect, tone="panel")
+        for i, line in enumerate(lines):
+            label = gui.render_text("tiny", line, True, gui.colors["text"], cached=False)
+            gui.screen.blit(label, (rect.x + 10, rect.y + 8 + i * line_height))
+
+        pygame.display.update(rect)
+        gui.frame.invalidate(rect)
+        return rect
@@ -4,7 +4,9 @@ from typing import TYPE_CHECKING
 
 import pygame
 
-from flagguessr.domain.models import GameMode, GuessStatus
+from flagguessr.domain.matching import PrefixCursor
+from flagguessr.domain.models import GameMode, GuessStatus, StartGameResult
+from flagguessr.infrastructure import audio
 
 if TYPE_CHECKING:
     from flagguessr.presentation.controller import GameController
@@ -25,9 +27,21 @@ class BaseState:
     def render(self) -> None:
         return None
 
+    def is_animated(self) -> bool:
+        """
+        Whether the screen changes without input. Animated states are redrawn at
+        the full frame rate; static ones only when an event arrives.
+        """
+        # The flash overlay fades in and out on its own.
+        return self.controller.gui.error_message["active"]
+
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.QUIT:
             self.controller.running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.controller.gui.invalidate()
+        else:
+            audio.handle_event(event)
 
 
 class SplashState(BaseState):
@@ -92,27 +106,113 @@ class ModeSelectionState(BaseState):
             self.controller.change_state(SplashState)
             return
 
-        mode_value, map_name = result
         gui.set_input_text("")
         gui.clear_error_message()
+        self.controller.pending_game = result
+        self.controller.change_state(LoadingState)
+
+
+class LoadingState(BaseState):
+    """
+    Starts the selected game on the service's loader thread while the spinner keeps running.
+
+    The game is entered as soon as its first flag is decoded; the flags queued
+    after it keep loading in the background.
+    """
+
+    name = "loading"
 
-        start_result = self.controller.game_service.start_game(
-            mode_value=mode_value,
-            map_name=map_name,
-            flag_size=gui.getFlagSize(),
+    def enter(self) -> None:
+        self.mode_value, self.map_name = self.controller.pending_game
+        self.controller.pending_game = None
+        self.cancelled = False
+        self.result: StartGameResult | None = None
+        self._loading = self.controller.game_service.start_game_in_background(
+            mode_value=self.mode_value,
+            map_name=self.map_name,
+            flag_size=self.controller.gui.getFlagSize(),
             now_ms=pygame.time.get_ticks(),
         )
-        if not start_result.success:
-            gui.show_error_message(start_result.error)
+
+    def _result(self) -> StartGameResult | None:
+        """The finished start_game() result, or None while it is still loading."""
+        if self.result is None and not self.cancelled and self._loading.done():
+            try:
+                self.result = self._loading.result()
+            except Exception as e:
+                print(f"Error loading {self.mode_value} game on {self.map_name}: {e}")
+                self.result = StartGameResult(success=False, error="Unable to load the selected map.")
+        return self.result
+
+    def is_animated(self) -> bool:
+        return True
+
+    def update(self) -> None:
+        result = self._result()
+        if self.cancelled or result is None:
             return
 
-        self.controller.active_game = start_result.running_game
+        if not result.success:
+            self.controller.change_state(ModeSelectionState)
+            self.controller.gui.show_error_message(result.error)
+            return
+
+        game_service = self.controller.game_service
+        if not game_service.is_current_flag_ready(result.running_game):
+            return
+
+        game_service.begin_game(result.running_game, pygame.time.get_ticks())
+        self.controller.active_game = result.running_game
         self.controller.change_state(GamePlayState)
 
+    def render(self) -> None:
+        result = self._result()
+        if result is not None and result.success:
+            # Counts the prefetch window only; the game starts once its first flag is in.
+            ready, total = self.controller.game_service.flag_load_progress(result.running_game)
+            detail = "Preparing first flags"
+        else:
+            ready, total = 0, 0
+            detail = "Loading countries"
+        self.controller.gui.showLoading(self.mode_value, self.map_name, detail, ready, total)
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            # A load already running cannot be interrupted; its result is simply dropped.
+            self._loading.cancel()
+            self.cancelled = True
+            self.controller.change_state(ModeSelectionState)
+
 
 class GamePlayState(BaseState):
     name = "game"
 
+    def __init__(self, controller: "GameController"):
+        super().__init__(controller)
+        self.completions: PrefixCursor | None = None
+
+    def enter(self) -> None:
+        running_game = self.controller.active_game
+        gui = self.controller.gui
+        if running_game is not None and running_game.autocomplete is not None:
+            self.completions = PrefixCursor(running_game.autocomplete, gui.get_input_text())
+        self._refresh_suggestions()
+
+    def _refresh_suggestions(self) -> None:
+        gui = self.controller.gui
+        if self.completions is None:
+            gui.set_suggestions([])
+            return
+        typed = gui.get_input_text().strip().lower()
+        gui.set_suggestions([label for label in self.completions.suggestions() if label.lower() != typed])
+
+    def _accept_suggestion(self, label: str) -> None:
+        self.controller.gui.set_input_text(label)
+        if self.completions is not None:
+            self.completions.reset(label)
+        self._refresh_suggestions()
+
     def update(self) -> None:
         running_game = self.controller.active_game
         if not running_game:
@@ -124,6 +224,12 @@ class GamePlayState(BaseState):
         if timed_out:
             self.controller.change_state(GameOverState)
 
+    def is_animated(self) -> bool:
+        running_game = self.controller.active_game
+        if running_game is not None and running_game.session.mode == GameMode.BLITZ:
+            return True
+        return super().is_animated()
+
     def render(self) -> None:
         running_game = self.controller.active_game
         if not running_game:
@@ -155,6 +261,10 @@ class GamePlayState(BaseState):
             if gui.get_game_exit_button_rect().collidepoint(mouse_pos):
                 self.controller.change_state(SplashState)
                 return
+            suggestion = gui.get_suggestion_at(mouse_pos)
+            if suggestion is not None:
+                self._accept_suggestion(suggestion)
+                return
             gui.handle_game_music_click(mouse_pos)
             return
 
@@ -170,6 +280,9 @@ class GamePlayState(BaseState):
 
             if result.clear_input:
                 gui.set_input_text("")
+                if self.completions is not None:
+                    self.completions.reset()
+                self._refresh_suggestions()
 
             if result.clear_error:
                 gui.clear_error_message()
@@ -182,12 +295,25 @@ class GamePlayState(BaseState):
                 self.controller.change_state(GameOverState)
             return
 
+        if event.key == pygame.K_TAB:
+            if gui.suggestions:
+                self._accept_suggestion(gui.suggestions[0])
+            return
+
         if event.key == pygame.K_BACKSPACE:
-            gui.set_input_text(gui.get_input_text()[:-1])
+            text = gui.get_input_text()
+            if text:
+                gui.set_input_text(text[:-1])
+                if self.completions is not None:
+                    self.completions.pop()
+                self._refresh_suggestions()
             return
 
         if event.unicode:
             gui.set_input_text(gui.get_input_text() + event.unicode)
+            if self.completions is not None:
+                self.completions.push(event.unicode)
+            self._refresh_suggestions()
 
 
 class GameOverState(BaseState):
@@ -271,11 +397,19 @@ class VictoryState(BaseState):
 class RankingsState(BaseState):
     name = "rankings"
 
+    def is_animated(self) -> bool:
+        # Keep polling until background initialization lets the scores be read.
+        return not self.controller.game_service.is_ready() or super().is_animated()
+
     def render(self) -> None:
         gui = self.controller.gui
         rankings_mode = gui.get_rankings_gamemode()
+        game_service = self.controller.game_service
+        if not game_service.is_ready():
+            gui.showRankings([], rankings_mode, loading=True)
+            return
         rankings_filter = gui.selected_rankings_filter
-        top_scores = self.controller.game_service.get_rankings(rankings_mode, rankings_filter, limit=10)
+        top_scores = game_service.get_rankings(rankings_mode, rankings_filter, limit=10)
         gui.showRankings(top_scores, rankings_mode)
 
     def handle_event(self, event: pygame.event.Event) -> None:
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pygame
+
+
+def _freeze(value: Any) -> Any:
+    """Snapshot a region key so later in-place mutation of its inputs is still detected."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, pygame.Rect):
+        return ("rect", value.x, value.y, value.width, value.height)
+    return value
+
+
+def _merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        changed = True
+        while changed:
+            changed = False
+            for i, other in enumerate(merged):
+                if rect.colliderect(other):
+                    rect.union_ip(merged.pop(i))
+                    changed = True
+                    break
+        merged.append(rect)
+    return merged
+
+
+class DamageTracker:
+    """
+    Retained-mode frame composer for the pygame screens.
+
+    Each frame, a screen declares its regions in paint order: a rect, a draw
+    callable and the arguments it draws from. present() compares every region
+    with the previous frame and only repaints (background + overlapping regions,
+    clipped) the areas whose inputs changed, pushing them with
+    pygame.display.update(rects). An unchanged frame draws nothing at all.
+    """
+
+    def __init__(self, surface: pygame.Surface, background: pygame.Surface):
+        self.surface = surface
+        self.background = background
+        self._scene: str | None = None
+        self._frame: list[tuple[str, pygame.Rect, Any, Callable[..., None], tuple[Any, ...]]] = []
+        self._previous: dict[str, tuple[pygame.Rect, Any]] = {}
+        self._invalid: list[pygame.Rect] = []
+        self._full = True
+        self.last_update_rects: list[pygame.Rect] = []
+
+    def begin(self, scene: str) -> None:
+        if scene != self._scene:
+            self._scene = scene
+            self._full = True
+        self._frame = []
+
+    def region(self, region_id: str, rect, draw: Callable[..., None], *args: Any, key: Any = None) -> None:
+        """Declare a region; it is repainted only when (rect, draw, key or args) changes."""
+        rect = pygame.Rect(rect)
+        signature = (draw, _freeze(args if key is None else key))
+        self._frame.append((region_id, rect, signature, draw, args))
+
+    def invalidate(self, rect=None) -> None:
+        """Force a repaint of rect, or of the whole screen on the next present()."""
+        if rect is None:
+            self._full = True
+        else:
+            self._invalid.append(pygame.Rect(rect))
+
+    def present(self) -> list[pygame.Rect]:
+        current = {region_id: (rect, signature) for region_id, rect, signature, _, _ in self._frame}
+
+        if self._full:
+            self.surface.blit(self.background, (0, 0))
+            for _, _, _, draw, args in self._frame:
+                draw(*args)
+            pygame.display.flip()
+            areas = [self.surface.get_rect()]
+        else:
+            damaged = list(self._invalid)
+            for region_id, (rect, signature) in current.items():
+                previous = self._previous.get(region_id)
+                if previous is None:
+                    damaged.append(rect)
+                elif previous[1] != signature or previous[0] != rect:
+                    damaged.append(rect)
+                    damaged.append(previous[0])
+            for region_id, (rect, _) in self._previous.items():
+                if region_id not in current:
+                    damaged.append(rect)
+
+            screen_rect = self.surface.get_rect()
+            areas = _merge_rects([rect.clip(screen_rect) for rect in damaged])
+            for area in areas:
+                self.surface.set_clip(area)
+                self.surface.blit(self.background, area, area)
+                for _, rect, _, draw, args in self._frame:
+                    if rect.colliderect(area):
+                        draw(*args)
+            self.surface.set_clip(None)
+            if areas:
+                pygame.display.update(areas)
+
+        self._previous = current
+        self._invalid = []
+        self._full = False
+        self._frame = []
+        self.last_update_rects = areas
+        return areas
@@ -117,8 +117,6 @@ class InteractionMixin:
 
     def draw_scrollbar(self, content_rect, view_height):
         self.scroll_bar_rect = pygame.Rect(content_rect.right + 10, content_rect.y + 6, 12, view_height)
-        pygame.draw.rect(self.screen, self.colors["panel_alt"], self.scroll_bar_rect, border_radius=8)
-        pygame.draw.rect(self.screen, self.colors["border"], self.scroll_bar_rect, 1, border_radius=8)
 
         total_h = self.max_scroll_y + view_height
         handle_h = max(30, int((view_height / max(total_h, 1)) * view_height))
@@ -127,4 +125,15 @@ class InteractionMixin:
         handle_y = self.scroll_bar_rect.y + ratio * max_track
         self.scroll_handle_rect = pygame.Rect(self.scroll_bar_rect.x, handle_y, self.scroll_bar_rect.width, handle_h)
 
-        pygame.draw.rect(self.screen, self.colors["primary"], self.scroll_handle_rect, border_radius=8)
+        self.frame.region(
+            "scrollbar",
+            self.scroll_bar_rect,
+            self._paint_scrollbar,
+            self.scroll_bar_rect.copy(),
+            self.scroll_handle_rect.copy(),
+        )
+
+    def _paint_scrollbar(self, bar_rect, handle_rect):
+        pygame.draw.rect(self.screen, self.colors["panel_alt"], bar_rect, border_radius=8)
+        pygame.draw.rect(self.screen, self.colors["border"], bar_rect, 1, border_radius=8)
+        pygame.draw.rect(self.screen, self.colors["primary"], handle_rect, border_radius=8)
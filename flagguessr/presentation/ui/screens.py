@@ -11,98 +11,125 @@ class ScreenMixin:
 
     _RANKING_COL_X = [24, 112, 230, 410, 610]
 
+    def _text_rect(self, font_key, text, **anchor):
+        """Rect the text will occupy once rendered, measured without rendering it."""
+        rect = pygame.Rect((0, 0), self.fonts[font_key].size(text))
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        return rect
+
     def _draw_screen_header(self, title: str, subtitle: str, top: int = 26) -> None:
         panel = pygame.Rect(self.width // 2 - 360, top, 720, 106)
+        self.frame.region("header", panel, self._paint_screen_header, panel, title, subtitle)
+
+    def _paint_screen_header(self, panel, title, subtitle):
         self._draw_panel(panel, tone="panel")
         pygame.draw.rect(self.screen, self.colors["primary_dark"], panel, 2, border_radius=14)
 
-        title_shadow = self.fonts["heading"].render(title, True, (0, 0, 0))
-        title_surface = self.fonts["heading"].render(title, True, self.colors["text"])
-        subtitle_surface = self.fonts["small"].render(subtitle, True, self.colors["muted"])
+        title_shadow = self.render_text("heading", title, True, (0, 0, 0))
+        title_surface = self.render_text("heading", title, True, self.colors["text"])
+        subtitle_surface = self.render_text("small", subtitle, True, self.colors["muted"])
 
         self.screen.blit(title_shadow, title_shadow.get_rect(center=(panel.centerx + 2, panel.y + 34)))
         self.screen.blit(title_surface, title_surface.get_rect(center=(panel.centerx, panel.y + 32)))
         self.screen.blit(subtitle_surface, subtitle_surface.get_rect(center=(panel.centerx, panel.y + 74)))
 
     def _draw_result_screen(self, title, title_color, subtitle, body_lines):
-        self.draw_gradient_background()
-
         panel = pygame.Rect(self.width // 2 - 430, 92, 860, 470)
+        region = panel.copy()
+        region.union_ip(self._text_rect("title", title, center=(panel.centerx, panel.y + 74)))
+        region.union_ip(self._text_rect("body", subtitle, center=(panel.centerx, panel.y + 132)))
+        for text, _, x, y, font_key in body_lines:
+            region.union_ip(self._text_rect(font_key, text, topleft=(x, y)))
+
+        self.frame.region("result", region, self._paint_result_screen, panel, title, title_color, subtitle, body_lines)
+
+    def _paint_result_screen(self, panel, title, title_color, subtitle, body_lines):
         self._draw_panel(panel, tone="panel")
 
-        title_surface = self.fonts["title"].render(title, True, title_color)
+        title_surface = self.render_text("title", title, True, title_color)
         self.screen.blit(title_surface, title_surface.get_rect(center=(panel.centerx, panel.y + 74)))
 
-        subtitle_surface = self.fonts["body"].render(subtitle, True, self.colors["text"])
+        subtitle_surface = self.render_text("body", subtitle, True, self.colors["text"])
         self.screen.blit(subtitle_surface, subtitle_surface.get_rect(center=(panel.centerx, panel.y + 132)))
 
         for text, color, x, y, font_key in body_lines:
-            rendered = self.fonts[font_key].render(text, True, color)
+            rendered = self.render_text(font_key, text, True, color)
             self.screen.blit(rendered, (x, y))
 
+    def _draw_button(self, region_id, rect, text, style, hover):
+        self.frame.region(region_id, rect, self.draw_modern_button, rect, text, style, hover)
+
     def showSplashScreen(self):
-        self.draw_gradient_background()
+        self.frame.begin("splash")
 
         hero = pygame.Rect(self.width // 2 - 360, 70, 720, 190)
-        self._draw_panel(hero, tone="panel")
-
-        title = self.fonts["title"].render("FLAG GUESSR", True, self.colors["text"])
-        subtitle = self.fonts["small"].render("Guess the country from the flag", True, self.colors["muted"])
-        self.screen.blit(title, title.get_rect(center=(hero.centerx, hero.y + 76)))
-        self.screen.blit(subtitle, subtitle.get_rect(center=(hero.centerx, hero.y + 136)))
+        self.frame.region("hero", hero, self._paint_splash_hero, hero)
 
         info = pygame.Rect(70, 300, 360, 210)
-        self._draw_panel(info, tone="panel_alt")
         hints = [
             "3 lives per match",
             "Normal: complete all flags",
             "Endless: survive as long as possible",
             "Blitz: 60s speed challenge",
         ]
-        info_title = self.fonts["small"].render("How it works", True, self.colors["accent"])
-        self.screen.blit(info_title, (info.x + 18, info.y + 16))
+        info_region = info.copy()
         for i, line in enumerate(hints):
-            line_s = self.fonts["tiny"].render(f"- {line}", True, self.colors["text"])
-            self.screen.blit(line_s, (info.x + 18, info.y + 50 + i * 34))
+            info_region.union_ip(self._text_rect("tiny", f"- {line}", topleft=(info.x + 18, info.y + 50 + i * 34)))
+        self.frame.region("info", info_region, self._paint_splash_info, info, hints)
 
         mouse_pos = pygame.mouse.get_pos()
-        self.draw_modern_button(self.play_button_rect, "PLAY", "primary", self.play_button_rect.collidepoint(mouse_pos))
-        self.draw_modern_button(
+        self._draw_button("play", self.play_button_rect, "PLAY", "primary", self.play_button_rect.collidepoint(mouse_pos))
+        self._draw_button(
+            "rankings",
             self.splash_rankings_button_rect,
             "RANKINGS",
             "secondary",
             self.splash_rankings_button_rect.collidepoint(mouse_pos),
         )
-        self.draw_modern_button(self.splash_quit_button_rect, "QUIT", "danger", self.splash_quit_button_rect.collidepoint(mouse_pos))
+        self._draw_button("quit", self.splash_quit_button_rect, "QUIT", "danger", self.splash_quit_button_rect.collidepoint(mouse_pos))
 
         self.draw_music_controls()
         self.update_error_message()
         self.draw_error_message_overlay()
 
-        pygame.display.flip()
+        self.frame.present()
+
+    def _paint_splash_hero(self, hero):
+        self._draw_panel(hero, tone="panel")
+
+        title = self.render_text("title", "FLAG GUESSR", True, self.colors["text"])
+        subtitle = self.render_text("small", "Guess the country from the flag", True, self.colors["muted"])
+        self.screen.blit(title, title.get_rect(center=(hero.centerx, hero.y + 76)))
+        self.screen.blit(subtitle, subtitle.get_rect(center=(hero.centerx, hero.y + 136)))
+
+    def _paint_splash_info(self, info, hints):
+        self._draw_panel(info, tone="panel_alt")
+        info_title = self.render_text("small", "How it works", True, self.colors["accent"])
+        self.screen.blit(info_title, (info.x + 18, info.y + 16))
+        for i, line in enumerate(hints):
+            line_s = self.render_text("tiny", f"- {line}", True, self.colors["text"])
+            self.screen.blit(line_s, (info.x + 18, info.y + 50 + i * 34))
 
     def showGame(self, current_country, score, game_flags_images, lives,
                  selected_game_mode="normal", game_start_time=0, blitz_time_limit=60, flags_shown_count=0):
-        self.draw_gradient_background()
+        self.frame.begin("game")
 
         self.draw_game_hud(score, lives)
         self.draw_mode_info(selected_game_mode, game_start_time, blitz_time_limit, flags_shown_count)
 
         flag_panel = pygame.Rect(self.width // 2 - 330, 118, 660, 400)
-        self._draw_panel(flag_panel, tone="panel")
+        flag = game_flags_images.get(current_country)
+        self.frame.region("flag", flag_panel, self._paint_flag_panel, flag_panel, flag)
 
-        if current_country in game_flags_images:
-            flag = game_flags_images[current_country]
-            self.screen.blit(flag, flag.get_rect(center=flag_panel.center))
-        else:
-            missing = self.fonts["small"].render("Flag image not available", True, self.colors["danger"])
-            self.screen.blit(missing, missing.get_rect(center=flag_panel.center))
-
-        prompt = self.fonts["small"].render("Type country name and press ENTER", True, self.colors["muted"])
-        self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.input_rect.y - 22)))
+        prompt_text = "Type country name and press ENTER"
+        prompt_rect = self._text_rect("small", prompt_text, center=(self.width // 2, self.input_rect.y - 22))
+        self.frame.region("prompt", prompt_rect, self._paint_prompt, prompt_text)
 
         self.draw_modern_input_box()
-        self.draw_modern_button(
+        self.draw_input_suggestions()
+        self._draw_button(
+            "exit",
             self.game_exit_button_rect,
             "EXIT",
             "danger",
@@ -113,40 +140,66 @@ class ScreenMixin:
         self.update_error_message()
         self.draw_error_message_overlay()
 
-        pygame.display.flip()
+        self.frame.present()
+
+    def _paint_flag_panel(self, flag_panel, flag):
+        self._draw_panel(flag_panel, tone="panel")
+
+        if flag is not None:
+            self.screen.blit(flag, flag.get_rect(center=flag_panel.center))
+        else:
+            missing = self.render_text("small", "Flag image not available", True, self.colors["danger"])
+            self.screen.blit(missing, missing.get_rect(center=flag_panel.center))
+
+    def _paint_prompt(self, prompt_text):
+        prompt = self.render_text("small", prompt_text, True, self.colors["muted"])
+        self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.input_rect.y - 22)))
 
     def draw_mode_info(self, selected_game_mode, game_start_time, blitz_time_limit, flags_shown_count):
         info = pygame.Rect(28, self.height - 156, 240, 120)
-        self._draw_panel(info, tone="panel_alt")
-
-        mode_text = self.fonts["small"].render(f"Mode: {selected_game_mode.upper()}", True, self.colors["accent"])
-        self.screen.blit(mode_text, (info.x + 14, info.y + 12))
 
         if selected_game_mode == "blitz":
             elapsed = (pygame.time.get_ticks() - game_start_time) / 1000 if game_start_time > 0 else 0
             remaining = max(0.0, blitz_time_limit - elapsed)
             col = self.colors["success"] if remaining > 20 else self.colors["accent"] if remaining > 10 else self.colors["danger"]
-            timer = self.fonts["heading"].render(f"{remaining:04.1f}s", True, col)
-            self.screen.blit(timer, (info.x + 14, info.y + 46))
+            row = (f"{remaining:04.1f}s", col, "heading", 46)
         elif selected_game_mode == "endless":
-            row = self.fonts["body"].render(f"Flags shown: {flags_shown_count}", True, self.colors["text"])
-            self.screen.blit(row, (info.x + 14, info.y + 52))
+            row = (f"Flags shown: {flags_shown_count}", self.colors["text"], "body", 52)
         else:
-            row = self.fonts["small"].render("Complete all flags", True, self.colors["text"])
-            self.screen.blit(row, (info.x + 14, info.y + 56))
+            row = ("Complete all flags", self.colors["text"], "small", 56)
+
+        region = info.copy()
+        region.union_ip(self._text_rect("small", f"Mode: {selected_game_mode.upper()}", topleft=(info.x + 14, info.y + 12)))
+        region.union_ip(self._text_rect(row[2], row[0], topleft=(info.x + 14, info.y + row[3])))
+        self.frame.region("mode_info", region, self._paint_mode_info, info, selected_game_mode, *row)
+
+    def _paint_mode_info(self, info, selected_game_mode, text, color, font_key, y_offset):
+        self._draw_panel(info, tone="panel_alt")
+
+        mode_text = self.render_text("small", f"Mode: {selected_game_mode.upper()}", True, self.colors["accent"])
+        self.screen.blit(mode_text, (info.x + 14, info.y + 12))
+
+        # The blitz timer changes every tenth of a second; keep it out of the cache.
+        row = self.render_text(font_key, text, True, color, cached=selected_game_mode != "blitz")
+        self.screen.blit(row, (info.x + 14, info.y + y_offset))
 
     def draw_game_hud(self, score, lives):
         score_card = pygame.Rect(28, 20, 190, 84)
         life_card = pygame.Rect(232, 20, 220, 84)
+        region = score_card.union(life_card)
+        region.union_ip(self._text_rect("heading", str(score), topleft=(score_card.x + 14, score_card.y + 32)))
+        self.frame.region("hud", region, self._paint_game_hud, score_card, life_card, score, lives)
+
+    def _paint_game_hud(self, score_card, life_card, score, lives):
         self._draw_panel(score_card, tone="panel_alt")
         self._draw_panel(life_card, tone="panel_alt")
 
-        s_label = self.fonts["tiny"].render("SCORE", True, self.colors["muted"])
-        s_value = self.fonts["heading"].render(str(score), True, self.colors["text"])
+        s_label = self.render_text("tiny", "SCORE", True, self.colors["muted"])
+        s_value = self.render_text("heading", str(score), True, self.colors["text"])
         self.screen.blit(s_label, (score_card.x + 14, score_card.y + 10))
         self.screen.blit(s_value, (score_card.x + 14, score_card.y + 32))
 
-        l_label = self.fonts["tiny"].render("LIVES", True, self.colors["muted"])
+        l_label = self.render_text("tiny", "LIVES", True, self.colors["muted"])
         self.screen.blit(l_label, (life_card.x + 14, life_card.y + 10))
         for i in range(3):
             heart_rect = pygame.Rect(life_card.x + 14 + i * 62, life_card.y + 38, 46, 30)
@@ -155,14 +208,98 @@ class ScreenMixin:
             pygame.draw.rect(self.screen, self.colors["border"], heart_rect, 2, border_radius=8)
 
     def draw_modern_input_box(self):
+        text = self.input_text if self.input_text else ""
+        region = self.input_border.union(self._text_rect("body", text, topleft=(self.input_rect.x + 14, self.input_rect.y + 14)))
+        self.frame.region("input", region, self._paint_input_box, text)
+
+    def _paint_input_box(self, text):
         pygame.draw.rect(self.screen, self.colors["panel_alt"], self.input_border, border_radius=14)
         pygame.draw.rect(self.screen, self.colors["primary"], self.input_border, 2, border_radius=14)
         pygame.draw.rect(self.screen, (14, 19, 27), self.input_rect, border_radius=12)
 
-        text_surface = self.fonts["body"].render(self.input_text if self.input_text else "", True, self.colors["text"])
+        text_surface = self.render_text("body", text, True, self.colors["text"], cached=False)
         self.screen.blit(text_surface, (self.input_rect.x + 14, self.input_rect.y + 14))
 
+    def draw_input_suggestions(self):
+        # Laid out here rather than in the painter so clicks can be hit-tested
+        # on frames where the strip is not repainted.
+        strip = pygame.Rect(self.input_border.x, self.input_border.bottom + 6, self.input_border.width, 28)
+        self.suggestion_rects = []
+        x = strip.x
+        for label in self.suggestions:
+            width = self._text_rect("tiny", label).width + 24
+            if x + width > strip.right:
+                break
+            self.suggestion_rects.append((label, pygame.Rect(x, strip.y, width, strip.height)))
+            x += width + 8
+        self.frame.region("suggestions", strip, self._paint_input_suggestions, self.suggestion_rects)
+
+    def _paint_input_suggestions(self, suggestion_rects):
+        for label, rect in suggestion_rects:
+            self.draw_small_button(rect, self.colors["panel_alt"], label)
+
+    def get_suggestion_at(self, mouse_pos):
+        for label, rect in self.suggestion_rects:
+            if rect.collidepoint(mouse_pos):
+                return label
+        return None
+
+    def _draw_result_buttons(self):
+        mouse_pos = pygame.mouse.get_pos()
+        self._draw_button("quit", self.quit_button_rect, "QUIT", "danger", self.quit_button_rect.collidepoint(mouse_pos))
+        self._draw_button(
+            "rankings", self.rankings_button_rect, "SEE RANKINGS", "secondary", self.rankings_button_rect.collidepoint(mouse_pos)
+        )
+        self._draw_button(
+            "main_menu", self.main_menu_button_rect, "MAIN MENU", "primary", self.main_menu_button_rect.collidepoint(mouse_pos)
+        )
+
+    def showLoading(self, mode, map_name, detail, ready=0, total=0):
+        self.frame.begin("loading")
+
+        self._draw_screen_header("LOADING", f"{mode.upper()} on {map_name.upper()}")
+
+        panel = pygame.Rect(self.width // 2 - 260, 230, 520, 250)
+        self.frame.region("loading_panel", panel, self._paint_loading_panel, panel, detail, ready, total)
+
+        # Each spinner dot is 8px wide and drawn from its top-left corner.
+        spinner_center = (panel.centerx - 4, panel.y + 78)
+        spinner = pygame.Rect(0, 0, 58, 58)
+        spinner.center = (spinner_center[0] + 4, spinner_center[1] + 4)
+        self.frame.region(
+            "spinner",
+            spinner,
+            self.draw_loading_indicator,
+            *spinner_center,
+            48,
+            key=pygame.time.get_ticks() // 16,
+        )
+
+        self.update_error_message()
+        self.draw_error_message_overlay()
+        self.frame.present()
+
+    def _paint_loading_panel(self, panel, detail, ready, total):
+        self._draw_panel(panel, tone="panel")
+
+        label = f"{detail} {ready}/{total}" if total else f"{detail}..."
+        text = self.render_text("small", label, True, self.colors["text"])
+        self.screen.blit(text, text.get_rect(center=(panel.centerx, panel.y + 150)))
+
+        bar = pygame.Rect(panel.x + 40, panel.y + 186, panel.width - 80, 16)
+        pygame.draw.rect(self.screen, self.colors["panel_alt"], bar, border_radius=8)
+        if total:
+            filled = bar.copy()
+            filled.width = max(bar.height, int(bar.width * ready / total))
+            pygame.draw.rect(self.screen, self.colors["primary"], filled, border_radius=8)
+        pygame.draw.rect(self.screen, self.colors["border"], bar, 1, border_radius=8)
+
+        hint = self.render_text("tiny", "ESC to cancel", True, self.colors["muted"])
+        self.screen.blit(hint, hint.get_rect(center=(panel.centerx, panel.bottom - 24)))
+
     def showGameOver(self, score, wrong_countries, gamemode):
+        self.frame.begin("game_over")
+
         body_lines = [
             ("Mistakes", self.colors["accent"], self.width // 2 - 390, 276, "small"),
         ]
@@ -179,13 +316,12 @@ class ScreenMixin:
             body_lines,
         )
 
-        mouse_pos = pygame.mouse.get_pos()
-        self.draw_modern_button(self.quit_button_rect, "QUIT", "danger", self.quit_button_rect.collidepoint(mouse_pos))
-        self.draw_modern_button(self.rankings_button_rect, "SEE RANKINGS", "secondary", self.rankings_button_rect.collidepoint(mouse_pos))
-        self.draw_modern_button(self.main_menu_button_rect, "MAIN MENU", "primary", self.main_menu_button_rect.collidepoint(mouse_pos))
-        pygame.display.flip()
+        self._draw_result_buttons()
+        self.frame.present()
 
     def showVictory(self, score, gamemode):
+        self.frame.begin("victory")
+
         body_lines = [
             (
                 "Great run. Try endless or blitz for a new challenge.",
@@ -202,19 +338,16 @@ class ScreenMixin:
             body_lines,
         )
 
-        mouse_pos = pygame.mouse.get_pos()
-        self.draw_modern_button(self.quit_button_rect, "QUIT", "danger", self.quit_button_rect.collidepoint(mouse_pos))
-        self.draw_modern_button(self.rankings_button_rect, "SEE RANKINGS", "secondary", self.rankings_button_rect.collidepoint(mouse_pos))
-        self.draw_modern_button(self.main_menu_button_rect, "MAIN MENU", "primary", self.main_menu_button_rect.collidepoint(mouse_pos))
-        pygame.display.flip()
+        self._draw_result_buttons()
+        self.frame.present()
 
     def showModeSelection(self, gamemodes):
-        self.draw_gradient_background()
+        self.frame.begin("mode_selection")
 
         self._draw_screen_header("SELECT MODE", "Choose rules and map before starting")
 
-        map_label = self.fonts["tiny"].render("MAP", True, self.colors["accent"])
-        self.screen.blit(map_label, (self.mode_map_dropdown_rect.x, self.mode_map_dropdown_rect.y - 20))
+        map_label_pos = (self.mode_map_dropdown_rect.x, self.mode_map_dropdown_rect.y - 20)
+        self.frame.region("map_label", self._text_rect("tiny", "MAP", topleft=map_label_pos), self._paint_map_label, map_label_pos)
         self.draw_map_dropdown(gamemodes)
 
         cards = [
@@ -227,21 +360,10 @@ class ScreenMixin:
         for rect, name, desc in cards:
             selected = self.selected_mode == name.lower()
             hover = rect.collidepoint(mouse_pos)
-            self._draw_panel(rect, tone="panel_alt" if selected or hover else "panel")
-            pygame.draw.rect(
-                self.screen,
-                self.colors["accent"] if selected else self.colors["primary"] if hover else self.colors["border"],
-                rect,
-                3,
-                border_radius=14,
-            )
+            self.frame.region(f"card_{name.lower()}", rect, self._paint_mode_card, rect, name, desc, selected, hover)
 
-            top = self.fonts["heading"].render(name, True, self.colors["text"])
-            desc_s = self.fonts["small"].render(desc, True, self.colors["muted"])
-            self.screen.blit(top, top.get_rect(center=(rect.centerx, rect.y + 86)))
-            self.screen.blit(desc_s, desc_s.get_rect(center=(rect.centerx, rect.y + 150)))
-
-        self.draw_modern_button(
+        self._draw_button(
+            "back",
             self.mode_back_button_rect,
             "BACK TO MENU",
             "secondary",
@@ -250,11 +372,32 @@ class ScreenMixin:
 
         self.update_error_message()
         self.draw_error_message_overlay()
-        pygame.display.flip()
+        self.frame.present()
+
+    def _paint_map_label(self, position):
+        map_label = self.render_text("tiny", "MAP", True, self.colors["accent"])
+        self.screen.blit(map_label, position)
+
+    def _paint_mode_card(self, rect, name, desc, selected, hover):
+        self._draw_panel(rect, tone="panel_alt" if selected or hover else "panel")
+        pygame.draw.rect(
+            self.screen,
+            self.colors["accent"] if selected else self.colors["primary"] if hover else self.colors["border"],
+            rect,
+            3,
+            border_radius=14,
+        )
+
+        top = self.render_text("heading", name, True, self.colors["text"])
+        desc_s = self.render_text("small", desc, True, self.colors["muted"])
+        self.screen.blit(top, top.get_rect(center=(rect.centerx, rect.y + 86)))
+        self.screen.blit(desc_s, desc_s.get_rect(center=(rect.centerx, rect.y + 150)))
 
     def draw_map_dropdown(self, gamemodes):
         options = [g.upper() for g in gamemodes]
-        self.draw_modern_dropdown(self.mode_map_dropdown_rect, self.selected_mode_map.upper(), options, self.mode_map_dropdown_open)
+        region = self.mode_map_dropdown_rect.copy()
+        rows = []
+        self.mode_map_option_rects = []
 
         if self.mode_map_dropdown_open:
             panel = pygame.Rect(
@@ -263,13 +406,38 @@ class ScreenMixin:
                 self.mode_map_dropdown_rect.width,
                 len(options) * 36 + 8,
             )
-            self._draw_panel(panel, tone="panel")
-            self.mode_map_option_rects = []
+            region.union_ip(panel)
 
             for i, opt in enumerate(options):
                 row = pygame.Rect(panel.x + 4, panel.y + 4 + i * 36, panel.width - 8, 32)
                 hover = row.collidepoint((self.mouse_x, self.mouse_y))
                 selected = opt.lower() == self.selected_mode_map.lower()
+                rows.append((opt, row, selected, hover))
+                self.mode_map_option_rects.append((opt.lower(), row))
+
+        self.frame.region(
+            "map_dropdown",
+            region,
+            self._paint_map_dropdown,
+            options,
+            self.selected_mode_map.upper(),
+            self.mode_map_dropdown_open,
+            rows,
+        )
+
+    def _paint_map_dropdown(self, options, selected_text, dropdown_open, rows):
+        self.draw_modern_dropdown(self.mode_map_dropdown_rect, selected_text, options, dropdown_open)
+
+        if dropdown_open:
+            panel = pygame.Rect(
+                self.mode_map_dropdown_rect.x,
+                self.mode_map_dropdown_rect.bottom + 4,
+                self.mode_map_dropdown_rect.width,
+                len(options) * 36 + 8,
+            )
+            self._draw_panel(panel, tone="panel")
+
+            for opt, row, selected, hover in rows:
                 if selected:
                     bg = self.colors["primary_dark"]
                 elif hover:
@@ -278,12 +446,11 @@ class ScreenMixin:
                     bg = self.colors["panel"]
 
                 pygame.draw.rect(self.screen, bg, row, border_radius=8)
-                txt = self.fonts["tiny"].render(opt, True, self.colors["text"])
+                txt = self.render_text("tiny", opt, True, self.colors["text"])
                 self.screen.blit(txt, (row.x + 10, row.y + 7))
-                self.mode_map_option_rects.append((opt.lower(), row))
 
     def showModeSelectionScreen(self):
-        self.draw_gradient_background()
+        self.frame.begin("rankings_map_selection")
 
         self._draw_screen_header("RANKINGS MAP", "Choose a map to view top scores", top=56)
 
@@ -298,19 +465,20 @@ class ScreenMixin:
 
         mouse_pos = pygame.mouse.get_pos()
         for name, rect in buttons:
-            self.draw_modern_button(rect, name, "secondary", rect.collidepoint(mouse_pos))
+            self._draw_button(f"map_{name.lower()}", rect, name, "secondary", rect.collidepoint(mouse_pos))
 
-        self.draw_modern_button(
+        self._draw_button(
+            "back",
             self.rank_mode_main_menu_button_rect,
             "BACK",
             "primary",
             self.rank_mode_main_menu_button_rect.collidepoint(mouse_pos),
         )
 
-        pygame.display.flip()
+        self.frame.present()
 
-    def showRankings(self, scores, gamemode):
-        self.draw_gradient_background()
+    def showRankings(self, scores, gamemode, loading=False):
+        self.frame.begin("rankings")
 
         self._draw_screen_header("TOP RANKINGS", gamemode.upper(), top=18)
 
@@ -319,7 +487,6 @@ class ScreenMixin:
 
         content_rect = pygame.Rect(self.width // 2 - 470, 218, 940, 430)
         self.rankings_content_rect = content_rect
-        self._draw_panel(content_rect, tone="panel")
 
         row_height = 46
         header_height = 40
@@ -328,6 +495,45 @@ class ScreenMixin:
         self.max_scroll_y = max(0, total_content - view_h)
         self.scroll_y = max(0, min(self.scroll_y, self.max_scroll_y))
 
+        self.frame.region(
+            "rankings_table",
+            content_rect,
+            self._paint_rankings_table,
+            content_rect,
+            scores,
+            self.selected_rankings_filter,
+            int(self.scroll_y),
+            loading,
+        )
+
+        if self.max_scroll_y > 0:
+            self.draw_scrollbar(content_rect, view_h)
+
+        self._draw_button(
+            "back",
+            self.rankings_back_button_rect,
+            "BACK",
+            "secondary",
+            self.rankings_back_button_rect.collidepoint(mouse_pos),
+        )
+        self._draw_button(
+            "main_menu",
+            self.rank_sel_main_menu_button_rect,
+            "MAIN MENU",
+            "primary",
+            self.rank_sel_main_menu_button_rect.collidepoint(mouse_pos),
+        )
+
+        self.frame.present()
+
+    def _paint_rankings_table(self, content_rect, scores, rankings_filter, scroll_y, loading=False):
+        self._draw_panel(content_rect, tone="panel")
+
+        row_height = 46
+        header_height = 40
+        total_content = header_height + len(scores) * row_height
+        view_h = content_rect.height - 12
+
         table_surface = pygame.Surface((content_rect.width - 12, max(view_h, total_content)), pygame.SRCALPHA)
         self.draw_mode_specific_headers(8, table_surface)
 
@@ -340,33 +546,16 @@ class ScreenMixin:
             self.draw_mode_specific_data(row_rect, row, i + 1, table_surface)
 
         if not scores:
-            empty = self.fonts["small"].render("No scores yet for this filter.", True, self.colors["muted"])
+            message = "Loading rankings..." if loading else "No scores yet for this filter."
+            empty = self.render_text("small", message, True, self.colors["muted"])
             table_surface.blit(empty, empty.get_rect(center=(table_surface.get_width() // 2, 130)))
 
         self.screen.blit(
             table_surface,
             (content_rect.x + 6, content_rect.y + 6),
-            pygame.Rect(0, int(self.scroll_y), table_surface.get_width(), view_h),
+            pygame.Rect(0, scroll_y, table_surface.get_width(), view_h),
         )
 
-        if self.max_scroll_y > 0:
-            self.draw_scrollbar(content_rect, view_h)
-
-        self.draw_modern_button(
-            self.rankings_back_button_rect,
-            "BACK",
-            "secondary",
-            self.rankings_back_button_rect.collidepoint(mouse_pos),
-        )
-        self.draw_modern_button(
-            self.rank_sel_main_menu_button_rect,
-            "MAIN MENU",
-            "primary",
-            self.rank_sel_main_menu_button_rect.collidepoint(mouse_pos),
-        )
-
-        pygame.display.flip()
-
     def draw_mode_specific_headers(self, y_offset, surface):
         headers = ["RANK", "SCORE"]
         if self.selected_rankings_filter == "normal":
@@ -379,7 +568,7 @@ class ScreenMixin:
             headers += ["MODE", "STAT", "DATE"]
 
         for header, x in zip(headers, self._RANKING_COL_X):
-            text = self.fonts["tiny"].render(header, True, self.colors["muted"])
+            text = self.render_text("tiny", header, True, self.colors["muted"])
             surface.blit(text, (x, y_offset))
 
     def draw_mode_specific_data(self, card_rect, row, rank, surface):
@@ -423,9 +612,9 @@ class ScreenMixin:
 
         values = base + extra
         for i, value in enumerate(values):
-            font = self.fonts["small"] if i < 2 else self.fonts["tiny"]
+            font_key = "small" if i < 2 else "tiny"
             color = self.colors["text"] if i < 2 else self.colors["muted"]
-            txt = font.render(str(value), True, color)
+            txt = self.render_text(font_key, str(value), True, color)
             surface.blit(txt, txt.get_rect(centery=card_rect.centery, x=self._RANKING_COL_X[i]))
 
     def draw_ranking_filter_tabs(self, mouse_pos):
@@ -440,4 +629,4 @@ class ScreenMixin:
             selected = self.selected_rankings_filter == key
             hover = rect.collidepoint(mouse_pos)
             style = "primary" if selected else "secondary"
-            self.draw_modern_button(rect, name, style, hover)
+            self._draw_button(f"filter_{key}", rect, name, style, hover)
@@ -6,15 +6,49 @@ import pygame
 
 
 class WidgetMixin:
+    def render_text(self, font_key, text, antialias, color, cached=True):
+        """font.render() through the GUI's text cache; callers must not mutate the result."""
+        if not cached:
+            return self.fonts[font_key].render(text, antialias, color)
+        return self.text_cache.render(self.fonts[font_key], font_key, text, antialias, color)
+
     def draw_gradient_background(self):
         self.screen.blit(self.background, (0, 0))
 
     def _draw_panel(self, rect, tone="panel", border=True):
-        pygame.draw.rect(self.screen, self.colors[tone], rect, border_radius=14)
+        rect = pygame.Rect(rect)
+        surface = self.widget_cache.get(
+            ("panel", rect.size, tone, border),
+            rect.size,
+            lambda target: self._paint_panel(target, tone, border),
+        )
+        self.screen.blit(surface, rect.topleft)
+
+    def _paint_panel(self, target, tone, border):
+        local = target.get_rect()
+        pygame.draw.rect(target, self.colors[tone], local, border_radius=14)
         if border:
-            pygame.draw.rect(self.screen, self.colors["border"], rect, 2, border_radius=14)
+            pygame.draw.rect(target, self.colors["border"], local, 2, border_radius=14)
+
+    def _button_surface(self, rect, text, style, hover, disabled):
+        return self.widget_cache.get(
+            ("button", rect.size, style, hover, disabled, text),
+            rect.size,
+            lambda target: self._paint_button(target, text, style, hover, disabled),
+        )
 
     def draw_modern_button(self, rect, text, style="primary", hover=False, disabled=False):
+        rect = pygame.Rect(rect)
+        self.screen.blit(self._button_surface(rect, text, style, hover, disabled), rect.topleft)
+
+    def draw_modern_button_with_alpha(self, rect, text, style="primary", hover=False, alpha=255):
+        rect = pygame.Rect(rect)
+        surface = self._button_surface(rect, text, style, hover, False)
+        surface.set_alpha(alpha)
+        self.screen.blit(surface, rect.topleft)
+        surface.set_alpha(None)
+
+    def _paint_button(self, target, text, style, hover, disabled):
         if disabled:
             bg = (66, 78, 92)
             border = (96, 108, 120)
@@ -36,34 +70,36 @@ class WidgetMixin:
             border = self.colors["border"]
             fg = self.colors["text"]
 
-        pygame.draw.rect(self.screen, bg, rect, border_radius=12)
-        pygame.draw.rect(self.screen, border, rect, 2, border_radius=12)
-        label = self.fonts["small"].render(text, True, fg)
-        self.screen.blit(label, label.get_rect(center=rect.center))
-
-    def draw_modern_button_with_alpha(self, rect, text, style="primary", hover=False, alpha=255):
-        temp = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        old_screen = self.screen
-        self.screen = temp
-        self.draw_modern_button(pygame.Rect(0, 0, rect.width, rect.height), text, style, hover)
-        self.screen = old_screen
-        temp.set_alpha(alpha)
-        self.screen.blit(temp, rect.topleft)
+        local = target.get_rect()
+        pygame.draw.rect(target, bg, local, border_radius=12)
+        pygame.draw.rect(target, border, local, 2, border_radius=12)
+        label = self.render_text("small", text, True, fg)
+        target.blit(label, label.get_rect(center=local.center))
 
     def draw_small_button(self, rect, color, text):
-        pygame.draw.rect(self.screen, color, rect, border_radius=10)
-        pygame.draw.rect(self.screen, self.colors["border"], rect, 2, border_radius=10)
-        lbl = self.fonts["tiny"].render(text, True, self.colors["text"])
-        self.screen.blit(lbl, lbl.get_rect(center=rect.center))
+        rect = pygame.Rect(rect)
+        surface = self.widget_cache.get(
+            ("small_button", rect.size, tuple(color), text),
+            rect.size,
+            lambda target: self._paint_small_button(target, color, text),
+        )
+        self.screen.blit(surface, rect.topleft)
+
+    def _paint_small_button(self, target, color, text):
+        local = target.get_rect()
+        pygame.draw.rect(target, color, local, border_radius=10)
+        pygame.draw.rect(target, self.colors["border"], local, 2, border_radius=10)
+        lbl = self.render_text("tiny", text, True, self.colors["text"])
+        target.blit(lbl, lbl.get_rect(center=local.center))
 
     def draw_modern_dropdown(self, rect, selected_text, options, dropdown_open=None):
         is_open = self.mode_map_dropdown_open if dropdown_open is None else dropdown_open
         self._draw_panel(rect, tone="panel_alt")
-        text = self.fonts["small"].render(selected_text, True, self.colors["text"])
+        text = self.render_text("small", selected_text, True, self.colors["text"])
         self.screen.blit(text, (rect.x + 14, rect.y + 10))
 
         arrow = "^" if is_open else "v"
-        arrow_s = self.fonts["small"].render(arrow, True, self.colors["muted"])
+        arrow_s = self.render_text("small", arrow, True, self.colors["muted"])
         self.screen.blit(arrow_s, arrow_s.get_rect(center=(rect.right - 16, rect.centery)))
 
     def _flash_message(self, text, style="danger", duration=2600):
@@ -106,14 +142,18 @@ class WidgetMixin:
         else:
             alpha = 255
 
-        msg = self.error_message["text"]
+        msg = self.error_message["text"][:64]
         tone = self.colors["danger"] if self.error_message["style"] == "danger" else self.colors["success"]
 
-        text = self.fonts["small"].render(msg[:64], True, self.colors["text"])
-        box_w = max(420, text.get_width() + 40)
+        text_w, _ = self.fonts["small"].size(msg)
+        box_w = max(420, text_w + 40)
         box_h = 56
         box = pygame.Rect(self.width // 2 - box_w // 2, self.height - 164, box_w, box_h)
+        self.frame.region("error_overlay", box, self._paint_error_overlay, box, msg, tone, alpha)
 
+    def _paint_error_overlay(self, box, msg, tone, alpha):
+        # Copy: set_alpha below must not leak into the shared cached surface.
+        text = self.render_text("small", msg, True, self.colors["text"]).copy()
         overlay = pygame.Surface((box.width, box.height), pygame.SRCALPHA)
         pygame.draw.rect(overlay, (18, 25, 36, alpha), overlay.get_rect(), border_radius=12)
         pygame.draw.rect(overlay, (*tone, alpha), overlay.get_rect(), 2, border_radius=12)
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+try:
+    import pygame
+except ModuleNotFoundError:
+    pygame = None
+
+if pygame is not None:
+    from flagguessr.infrastructure import audio
+    from flagguessr.infrastructure.audio import MusicPlayer, SongIndex, estimate_mp3_duration
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz frame header.
+MP3_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+
+
+def write_mp3(path, size):
+    with open(path, "wb") as f:
+        f.write(MP3_FRAME_HEADER + bytes(size - len(MP3_FRAME_HEADER)))
+
+
+class TestSongIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if pygame is None:
+            raise unittest.SkipTest("pygame is not installed in this environment")
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.music_dir = self._tmpdir.name
+        write_mp3(os.path.join(self.music_dir, "Game OST - Theme.mp3"), 16000)
+        write_mp3(os.path.join(self.music_dir, "Boss__Fight.mp3"), 32000)
+        open(os.path.join(self.music_dir, "notes.txt"), "w").close()
+
+    def test_estimates_constant_bitrate_duration(self):
+        path = os.path.join(self.music_dir, "Boss__Fight.mp3")
+        self.assertAlmostEqual(estimate_mp3_duration(path), 2.0)
+
+    def test_index_scans_once_and_rescans_on_directory_change(self):
+        index = SongIndex(self.music_dir, poll_interval=0)
+
+        self.assertEqual(index.names(), ["Boss - Fight", "Game Theme"])
+        self.assertEqual(index.find("game theme").filename, "Game OST - Theme.mp3")
+        self.assertEqual(index.find("Boss__Fight.mp3").size_bytes, 32000)
+        self.assertAlmostEqual(index.find("Boss - Fight").duration_seconds, 2.0)
+        self.assertIsNone(index.find("missing"))
+        self.assertFalse(index.refresh())
+
+        write_mp3(os.path.join(self.music_dir, "Credits.mp3"), 8000)
+        stat = os.stat(self.music_dir)
+        os.utime(self.music_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertIn("Credits", index.names())
+
+
+class TestMusicPlayer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if pygame is None:
+            raise unittest.SkipTest("pygame is not installed in this environment")
+        pygame.init()
+        try:
+            pygame.mixer.init()
+        except pygame.error as exc:
+            raise unittest.SkipTest(f"Audio mixer unavailable: {exc}")
+        pygame.mixer.music.set_endevent(audio.MUSIC_END_EVENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def pump(self, player, until, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for event in pygame.event.get():
+                player.handle_event(event)
+            if until():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_playlist_preloads_queues_and_advances(self):
+        index = SongIndex(audio.music_dir)
+        if len(index.songs()) < 2:
+            self.skipTest("needs at least two bundled songs")
+        player = MusicPlayer(index, fade_ms=0)
+        pygame.event.clear()
+
+        self.assertTrue(player.play(song_name=index.names()[0]))
+        self.assertEqual(player.current, index.songs()[0])
+        self.assertTrue(self.pump(player, lambda: player._queued is not None))
+        self.assertTrue(player.is_playing())
+        self.assertIs(player._queued, player.playlist[1])
+
+        # The mixer starts the queued track itself and then posts the end event.
+        player.handle_event(pygame.event.Event(audio.MUSIC_END_EVENT))
+        self.assertIs(player.current, player.playlist[1])
+        self.assertTrue(self.pump(player, lambda: player._queued is not None))
+
+        player.stop()
+        self.assertIsNone(player.current)
+        self.pump(player, lambda: False, timeout=0.1)
+        self.assertIsNone(player.current)
+        self.assertFalse(player.is_playing())
+
+    def test_play_during_background_start_waits_for_the_mixer_worker(self):
+        index = SongIndex(audio.music_dir)
+        if len(index.songs()) < 2:
+            self.skipTest("needs at least two bundled songs")
+        player = MusicPlayer(index, fade_ms=0)
+        ensure_mixer = player.ensure_mixer
+        gate = threading.Event()
+        callers = []
+
+        def slow_ensure_mixer():
+            callers.append(threading.current_thread().name)
+            gate.wait(5)
+            return ensure_mixer()
+
+        player.ensure_mixer = slow_ensure_mixer
+        pygame.event.clear()
+        worker = player.play_in_background()
+
+        # Picked while the worker still opens the device: deferred, not opened here.
+        self.assertTrue(player.play(song_name=index.names()[1]))
+        self.assertIsNone(player.current)
+        gate.set()
+        worker.join(5)
+        self.assertTrue(self.pump(player, player.is_playing))
+        self.assertIs(player.current, index.songs()[1])
+        self.assertEqual(callers[0], "music-init")
+        player.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
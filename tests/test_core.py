@@ -1,10 +1,31 @@
+import json
 import os
+import random
+import socket
 import sqlite3
 import tempfile
+import threading
+import time
 import unittest
+import urllib.error
+import urllib.request
 from unittest.mock import patch
 
+from flagguessr.domain.matching import (
+    AnswerMatcher,
+    PrefixCursor,
+    PrefixTrie,
+    TrigramIndex,
+    bounded_levenshtein,
+    normalize_answer,
+)
+from flagguessr.domain.models import GameMode, GameSession
+from flagguessr.domain.strategies import NormalModeStrategy
 from flagguessr.infrastructure import db
+from flagguessr.infrastructure.remote_scores import RemoteScoreRepository
+from flagguessr.infrastructure.repositories import SQLiteScoreRepository
+from flagguessr.infrastructure.score_server import ScoreServer
+from flagguessr.infrastructure.score_writer import WriteBehindScoreRepository
 from flagguessr.shared import paths
 
 
@@ -49,6 +70,127 @@ class TestCoreLogic(unittest.TestCase):
 
             self.assertEqual(rows, [("france", "europe"), ("italy", "europe")])
 
+    def test_populate_flags_database_skips_unchanged_assets(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            flags_root = os.path.join(tmpdir, "data", "flags")
+            for continent in ["africa", "america", "asia", "europe", "oceania"]:
+                os.makedirs(os.path.join(flags_root, continent), exist_ok=True)
+            open(os.path.join(flags_root, "europe", "italy.png"), "wb").close()
+            db_path = os.path.join(tmpdir, "flags.db")
+
+            with patch("flagguessr.infrastructure.db.resource_path", side_effect=lambda rel: os.path.join(tmpdir, rel)):
+                db.populate_flags_database(db_path)
+                with patch("flagguessr.infrastructure.db.os.listdir", wraps=os.listdir) as listdir:
+                    db.populate_flags_database(db_path)
+                self.assertEqual(listdir.call_count, 0)
+
+                # Touching a directory without changing its listing keeps the table as-is.
+                os.utime(os.path.join(flags_root, "europe"), ns=(1, 1))
+                db.populate_flags_database(db_path)
+
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute("SELECT country, continent FROM flags").fetchall()
+            manifest = conn.execute("SELECT file_count FROM flags_manifest").fetchone()
+            conn.close()
+            self.assertEqual(rows, [("italy", "europe")])
+            self.assertEqual(manifest, (1,))
+
+    def test_flag_aliases_are_seeded_for_bundled_countries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            flags_root = os.path.join(tmpdir, "data", "flags")
+            for continent in ["africa", "america", "asia", "europe", "oceania"]:
+                os.makedirs(os.path.join(flags_root, continent), exist_ok=True)
+            open(os.path.join(flags_root, "europe", "united kingdom.png"), "wb").close()
+            open(os.path.join(flags_root, "europe", "Bosnia and Herzegovina.png"), "wb").close()
+            db_path = os.path.join(tmpdir, "flags.db")
+
+            with patch("flagguessr.infrastructure.db.resource_path", side_effect=lambda rel: os.path.join(tmpdir, rel)):
+                db.populate_flags_database(db_path)
+                db.populate_flags_database(db_path)
+
+            aliases = db.get_country_aliases(db_path)
+            conn = sqlite3.connect(db_path)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.close()
+
+        self.assertEqual(version, len(db.FLAGS_MIGRATIONS))
+        self.assertEqual(set(aliases), {"united kingdom", "Bosnia and Herzegovina"})
+        self.assertIn("uk", aliases["united kingdom"])
+        self.assertEqual(aliases["Bosnia and Herzegovina"], ["bosnia"])
+
+    def test_answer_matcher_folds_accents_typos_and_aliases(self):
+        matcher = AnswerMatcher(
+            {
+                "united kingdom": ["uk", "great britain"],
+                "Bosnia and Herzegovina": ["bosnia"],
+                "the bahamas": [],
+                "niger": [],
+                "nigeria": [],
+                "austria": [],
+                "australia": [],
+                "sao tome and principe": [],
+            }
+        )
+
+        self.assertEqual(normalize_answer("  Côte d'Ivoire "), "cote divoire")
+        self.assertEqual(matcher.resolve("UK"), "united kingdom")
+        self.assertEqual(matcher.resolve("Great-Britain"), "united kingdom")
+        self.assertEqual(matcher.resolve("bosnia & herzegovina"), "Bosnia and Herzegovina")
+        self.assertEqual(matcher.resolve("Bahamas"), "the bahamas")
+        self.assertEqual(matcher.resolve("São Tomé & Príncipe"), "sao tome and principe")
+        self.assertEqual(matcher.resolve("austrailia"), "australia")
+        self.assertEqual(matcher.resolve("untied kingdom"), "united kingdom")
+
+        # Exact names of other countries never count, and short keys allow no typos.
+        self.assertFalse(matcher.matches("niger", "nigeria"))
+        self.assertFalse(matcher.matches("austria", "australia"))
+        self.assertIsNone(matcher.resolve("ukk"))
+        self.assertIsNone(matcher.resolve("nigera"))
+        self.assertTrue(matcher.matches("nigera", "nigeria"))
+        self.assertIsNone(matcher.resolve("narnia"))
+
+    def test_prefix_trie_keeps_the_best_completions_per_prefix(self):
+        trie = PrefixTrie(
+            {
+                "united kingdom": ["uk"],
+                "united states of america": ["usa"],
+                "uganda": [],
+                "the bahamas": [],
+                "sao tome and principe": [],
+            },
+            top_k=2,
+        )
+
+        self.assertEqual(trie.complete("u"), ["united kingdom", "united states of america"])
+        self.assertEqual(trie.complete("United  S"), ["united states of america"])
+        self.assertEqual(trie.complete("bah"), ["the bahamas"])
+        self.assertEqual(trie.complete("The Ba"), ["the bahamas"])
+        self.assertEqual(trie.complete("São Tomé &"), ["sao tome and principe"])
+        self.assertEqual(trie.complete("x"), [])
+        self.assertEqual(trie.complete(""), [])
+
+        cursor = PrefixCursor(trie)
+        for char in "ug":
+            cursor.push(char)
+        self.assertEqual(cursor.suggestions(), ["uganda"])
+        cursor.pop()
+        self.assertEqual(cursor.suggestions(), ["united kingdom", "united states of america"])
+        cursor.reset("usa")
+        self.assertEqual(cursor.suggestions(), ["united states of america"])
+
+    def test_trigram_index_agrees_with_a_linear_scan(self):
+        rng = random.Random(5)
+        keys = ["".join(rng.choice("abcde ") for _ in range(rng.randint(1, 14))).strip() or "a" for _ in range(400)]
+        index = TrigramIndex(keys)
+
+        for _ in range(200):
+            query = "".join(rng.choice("abcde ") for _ in range(rng.randint(1, 14)))
+            for limit in (0, 1, 2):
+                expected = sorted(
+                    {(bounded_levenshtein(query, key, limit), key) for key in keys} - {(limit + 1, key) for key in keys}
+                )
+                self.assertEqual(index.search(query, limit), expected)
+
     def test_scores_insert_and_filter(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = os.path.join(tmpdir, "scores.db")
@@ -85,6 +227,309 @@ class TestCoreLogic(unittest.TestCase):
             self.assertEqual(len(normal_scores), 1)
             self.assertEqual(normal_scores[0][5], "normal")
 
+    def test_connection_manager_reuses_per_thread_connections(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = db.ConnectionManager(os.path.join(tmpdir, "scores.db"))
+            db.create_scores_table(manager)
+
+            conn = manager.connection()
+            self.assertIs(manager.connection(), conn)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+            worker_conns = []
+            worker = threading.Thread(target=lambda: worker_conns.append(manager.connection()))
+            worker.start()
+            worker.join()
+            self.assertIsNot(worker_conns[0], conn)
+            # A finished thread's connection is closed, not kept until close().
+            self.assertEqual(manager._connections, [conn])
+            with self.assertRaises(sqlite3.ProgrammingError):
+                worker_conns[0].execute("SELECT 1")
+
+            db.insert_score(manager, 7, ["italy"], [], "europe", "normal", 0, 1, {})
+            self.assertEqual(db.get_top_scores(manager, "europe")[0][0], 7)
+
+            manager.close()
+            self.assertTrue(manager.closed)
+            with self.assertRaises(sqlite3.ProgrammingError):
+                manager.connection()
+
+    def test_scores_migrations_upgrade_legacy_table(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "scores.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE scores (id integer PRIMARY KEY, score integer NOT NULL, timestamp text NOT NULL, "
+                "gamemode text NOT NULL, game_sequence text, mistakes text, game_mode text, time_taken real, "
+                "flags_shown integer, mode_data text)"
+            )
+            conn.execute(
+                "INSERT INTO scores(score, timestamp, gamemode, game_mode) VALUES(4, '2025-01-02 10:00:00', 'europe', 'normal')"
+            )
+            conn.commit()
+            conn.close()
+
+            db.create_scores_table(db_path)
+            db.create_scores_table(db_path)
+
+            conn = sqlite3.connect(db_path)
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], len(db.SCORES_MIGRATIONS))
+            self.assertGreater(conn.execute("SELECT created_at FROM scores").fetchone()[0], 0)
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT score FROM scores WHERE gamemode = ? AND game_mode = ? "
+                "ORDER BY score DESC, created_at DESC LIMIT 10",
+                ("europe", "normal"),
+            ).fetchall()
+            conn.close()
+            self.assertIn("idx_scores_map_mode_rank", " ".join(row[-1] for row in plan))
+            self.assertNotIn("TEMP B-TREE", " ".join(row[-1] for row in plan))
+
+            self.assertEqual(db.get_top_scores(db_path, "europe", "normal")[0][0], 4)
+
+    def test_write_behind_repository_flushes_before_reads_and_on_close(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "scores.db")
+            repository = WriteBehindScoreRepository(SQLiteScoreRepository(db_path), batch_size=4)
+            repository.initialize()
+
+            for score in range(10):
+                session = GameSession(mode=GameMode.ENDLESS, map_name="asia", score=score, lives=0)
+                session.countries_sequence.append("japan")
+                repository.save_score(session, time_taken=0, flags_shown=1, mode_data={})
+
+            top = repository.get_top_scores("asia", "endless", limit=3)
+            self.assertEqual([row[0] for row in top], [9, 8, 7])
+
+            session = GameSession(mode=GameMode.BLITZ, map_name="asia", score=42, lives=0)
+            repository.save_score(session, time_taken=60, flags_shown=50, mode_data={})
+            repository.close()
+
+            self.assertEqual(db.get_top_scores(db_path, "asia", "blitz")[0][0], 42)
+
+    def test_write_behind_repository_never_writes_on_the_caller_thread(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "scores.db")
+            sqlite_repository = SQLiteScoreRepository(db_path)
+            save_rows = sqlite_repository.save_rows
+            gate = threading.Event()
+            writers = set()
+
+            def slow_save_rows(rows):
+                gate.wait(5)
+                writers.add(threading.current_thread().name)
+                save_rows(rows)
+
+            sqlite_repository.save_rows = slow_save_rows
+            repository = WriteBehindScoreRepository(
+                sqlite_repository,
+                journal_path=os.path.join(tmpdir, "scores.journal"),
+                max_pending=2,
+                batch_size=1,
+            )
+            repository.initialize()
+
+            def play():
+                for score in range(5):
+                    session = GameSession(mode=GameMode.ENDLESS, map_name="asia", score=score, lives=0)
+                    repository.save_score(session, time_taken=0, flags_shown=1, mode_data={})
+
+            # A full queue makes the caller wait for room, not write the row itself.
+            caller = threading.Thread(target=play, name="caller")
+            caller.start()
+            caller.join(0.2)
+            self.assertTrue(caller.is_alive())
+            gate.set()
+            caller.join(5)
+            repository.close()
+
+            self.assertEqual(writers, {"score-writer"})
+            self.assertEqual(len(db.get_top_scores(db_path, "asia", "endless")), 5)
+
+    def test_write_behind_repository_retries_and_replays_its_journal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "scores.db")
+            journal_path = os.path.join(tmpdir, "scores.journal")
+            session = GameSession(mode=GameMode.ENDLESS, map_name="asia", score=7, lives=0)
+            session.countries_sequence.append("japan")
+
+            # A row journaled by a run that crashed before committing it.
+            crashed = SQLiteScoreRepository(db_path).build_row(session, 0, 1, {})
+            with open(journal_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(crashed) + "\n")
+
+            sqlite_repository = SQLiteScoreRepository(db_path)
+            save_rows = sqlite_repository.save_rows
+            failures = [sqlite3.OperationalError("database is locked")] * 2
+
+            def flaky_save_rows(rows):
+                if failures:
+                    raise failures.pop(0)
+                save_rows(rows)
+
+            sqlite_repository.save_rows = flaky_save_rows
+            repository = WriteBehindScoreRepository(sqlite_repository, journal_path=journal_path, retry_delay=0.01)
+            repository.initialize()
+            # Locked twice, then written: the recovered row is retried, not dropped.
+            self.assertTrue(repository.flush(timeout=5))
+            self.assertEqual([row[0] for row in repository.get_top_scores("asia", "endless")], [7])
+
+            # An unexpected error keeps the row in the journal and the writer alive.
+            failures.append(RuntimeError("boom"))
+            session.score = 8
+            repository.save_score(session, time_taken=0, flags_shown=1, mode_data={})
+            self.assertTrue(repository.flush(timeout=5))
+            session.score = 9
+            repository.save_score(session, time_taken=0, flags_shown=1, mode_data={})
+            self.assertEqual([row[0] for row in repository.get_top_scores("asia", "endless")], [9, 7])
+            repository.close()
+
+            with open(journal_path, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line)[0] for line in f], [8])
+
+            repository = WriteBehindScoreRepository(SQLiteScoreRepository(db_path), journal_path=journal_path)
+            repository.initialize()
+            self.assertEqual([row[0] for row in repository.get_top_scores("asia", "endless")], [9, 8, 7])
+            repository.close()
+            self.assertEqual(os.path.getsize(journal_path), 0)
+
+    def test_remote_scores_are_batched_to_a_shared_leaderboard(self):
+        def wait_for(predicate):
+            deadline = time.monotonic() + 5
+            while not predicate():
+                self.assertLess(time.monotonic(), deadline, "timed out")
+                time.sleep(0.02)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            server = ScoreServer(SQLiteScoreRepository(os.path.join(tmpdir, "leaderboard.db")))
+            port = server.serve_in_thread()
+            url = f"http://127.0.0.1:{port}"
+            kiosk_a = RemoteScoreRepository(url, flush_delay=0, refresh_interval=0.05)
+            kiosk_b = RemoteScoreRepository(url, flush_delay=0, refresh_interval=0.05)
+            try:
+                kiosk_a.initialize()
+                kiosk_b.initialize()
+                for score in (3, 9, 5):
+                    kiosk_a.save_score(GameSession(mode=GameMode.BLITZ, map_name="asia", score=score, lives=0), 60, score, {})
+
+                # Local scores show up at once, before the server has them.
+                self.assertEqual([row[0] for row in kiosk_a.get_top_scores("asia", "blitz")], [9, 5, 3])
+                self.assertTrue(kiosk_a.flush(timeout=5))
+                wait_for(lambda: [row[0] for row in kiosk_b.get_top_scores("asia", "all")] == [9, 5, 3])
+                self.assertEqual(kiosk_b.get_top_scores("asia", "normal"), [])
+
+                # Retried batches are stored once.
+                row = db.build_score_row(1, ["japan"], [], "asia", "normal", 0, 1, {})
+                body = json.dumps({"batch_id": "retry", "rows": [row]}).encode()
+                for _ in range(2):
+                    request = urllib.request.Request(url + "/scores", data=body, method="POST")
+                    with urllib.request.urlopen(request, timeout=5) as response:
+                        json.load(response)
+                wait_for(lambda: len(kiosk_a.get_top_scores("asia", "all")) == 4)
+            finally:
+                kiosk_a.close()
+                kiosk_b.close()
+                server.stop()
+
+    def test_score_server_isolates_bad_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "leaderboard.db")
+            repository = SQLiteScoreRepository(db_path)
+            save_rows = repository.save_rows
+            gate = threading.Event()
+
+            def guarded_save_rows(rows):
+                gate.wait(5)
+                if any(row[0] < 0 for row in rows):
+                    raise sqlite3.IntegrityError("CHECK constraint failed: score")
+                save_rows(rows)
+
+            repository.save_rows = guarded_save_rows
+            server = ScoreServer(repository)
+            port = server.serve_in_thread()
+            statuses = {}
+
+            def post(batch_id, row):
+                body = json.dumps({"batch_id": batch_id, "rows": [row]}).encode()
+                request = urllib.request.Request(f"http://127.0.0.1:{port}/scores", data=body, method="POST")
+                try:
+                    with urllib.request.urlopen(request, timeout=5) as response:
+                        statuses[batch_id] = response.status
+                except urllib.error.HTTPError as e:
+                    statuses[batch_id] = e.code
+
+            try:
+                good = db.build_score_row(5, ["japan"], [], "asia", "normal", 0, 1, {})
+                # Wrong field types are rejected up front, before they reach a commit.
+                post("malformed", [5, "now", 0, "asia", ["japan"], "", "normal", 0, 1, "{}"])
+                self.assertEqual(statuses["malformed"], 400)
+
+                # The first commit holds the writer so the rest arrive as one group.
+                posters = [threading.Thread(target=post, args=("first", good))]
+                posters[0].start()
+                time.sleep(0.1)
+                for batch_id, score in (("good", 7), ("bad", -1), ("also-good", 9)):
+                    row = db.build_score_row(score, ["japan"], [], "asia", "normal", 0, 1, {})
+                    posters.append(threading.Thread(target=post, args=(batch_id, row)))
+                    posters[-1].start()
+                time.sleep(0.1)
+                gate.set()
+                for poster in posters:
+                    poster.join(5)
+            finally:
+                server.stop()
+
+            self.assertEqual(statuses, {"malformed": 400, "first": 200, "good": 200, "bad": 500, "also-good": 200})
+            self.assertEqual([row[0] for row in db.get_top_scores(db_path, "asia")], [9, 7, 5])
+
+    def test_remote_scores_are_spooled_while_the_server_is_unreachable(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            free_port = probe.getsockname()[1]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spool = os.path.join(tmpdir, "unsent.jsonl")
+            offline = RemoteScoreRepository(f"http://127.0.0.1:{free_port}", spool_path=spool, flush_delay=0, timeout=0.5)
+            offline.initialize()
+            offline.save_score(GameSession(mode=GameMode.NORMAL, map_name="europe", score=7, lives=1), 0, 7, {})
+            self.assertEqual([row[0] for row in offline.get_top_scores("europe")], [7])
+            offline.close()
+            self.assertTrue(os.path.exists(spool))
+
+            server = ScoreServer(SQLiteScoreRepository(os.path.join(tmpdir, "leaderboard.db")))
+            port = server.serve_in_thread()
+            online = RemoteScoreRepository(f"http://127.0.0.1:{port}", spool_path=spool, flush_delay=0)
+            try:
+                online.initialize()
+                self.assertTrue(online.flush(timeout=5))
+            finally:
+                online.close()
+                server.stop()
+
+            self.assertFalse(os.path.exists(spool))
+            self.assertEqual(db.get_top_scores(os.path.join(tmpdir, "leaderboard.db"), "europe")[0][0], 7)
+
+    def test_normal_strategy_draws_each_country_once_reproducibly(self):
+        countries = [f"country-{i}" for i in range(500)]
+
+        def run(seed):
+            strategy = NormalModeStrategy(random.Random(seed))
+            shown = []
+            while (country := strategy.next_country(countries, shown)) is not None:
+                shown.append(country)
+            return shown
+
+        sequence = run(7)
+        self.assertEqual(sorted(sequence), sorted(countries))
+        self.assertEqual(sequence, run(7))
+        self.assertNotEqual(sequence, run(8))
+
+    def test_normal_strategy_respects_an_existing_sequence(self):
+        strategy = NormalModeStrategy(random.Random(1))
+        countries = ["italy", "france", "spain"]
+
+        self.assertEqual(strategy.next_country(countries, ["italy", "spain"]), "france")
+        self.assertIsNone(strategy.next_country(countries, ["italy", "spain", "france"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import pygame
+except ModuleNotFoundError:
+    pygame = None
+
+if pygame is not None:
+    from flagguessr.infrastructure.countries import CountryLoader, LazyFlagImages
+    from flagguessr.infrastructure.flag_disk_cache import FlagDiskCache
+    from flagguessr.infrastructure.surface_cache import SurfaceCache
+
+
+class TestFlagAssets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if pygame is None:
+            raise unittest.SkipTest("pygame is not installed in this environment")
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.loader = CountryLoader()
+        self.loader.base_flags_path = os.path.join(self._tmpdir.name, "flags")
+        os.makedirs(os.path.join(self.loader.base_flags_path, "europe"))
+        for country, color in (("italy", (0, 146, 70)), ("france", (0, 85, 164))):
+            surface = pygame.Surface((30, 20))
+            surface.fill(color)
+            pygame.image.save(surface, os.path.join(self.loader.base_flags_path, "europe", f"{country}.png"))
+
+    def test_flag_images_decode_lazily(self):
+        countries = {"italy": "europe", "france": "europe", "atlantis": "europe"}
+        flags = self.loader.load_flag_images(countries, (12, 8), cache=SurfaceCache())
+
+        self.assertIsInstance(flags, LazyFlagImages)
+        self.assertEqual(len(flags), 3)
+        self.assertEqual(flags.loaded_count(), 0)
+
+        self.assertEqual(flags["italy"].get_size(), (12, 8))
+        self.assertEqual(flags.loaded_count(), 1)
+
+        flags.prefetch(["france"])
+        self.assertEqual(flags["france"].get_at((0, 0))[:3], (0, 85, 164))
+
+        self.assertIn("atlantis", flags)
+        self.assertIsNone(flags.get("atlantis"))
+        self.assertFalse(flags.is_available("atlantis"))
+        self.assertTrue(flags.is_available("italy"))
+
+    def test_replaying_a_map_reuses_cached_surfaces(self):
+        cache = SurfaceCache()
+        decoded = []
+        original = self.loader.load_flag_image
+
+        def counting_load(country, flag_path, size):
+            decoded.append(country)
+            return original(country, flag_path, size)
+
+        self.loader.load_flag_image = counting_load
+        countries = {"italy": "europe", "france": "europe"}
+
+        first = self.loader.load_flag_images(countries, (12, 8), cache=cache)
+        for country in countries:
+            first[country]
+        second = self.loader.load_flag_images(countries, (12, 8), cache=cache)
+        for country in countries:
+            self.assertIs(second[country], first[country])
+
+        self.assertEqual(sorted(decoded), ["france", "italy"])
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_surface_cache_evicts_least_recently_used_by_bytes(self):
+        one_flag = pygame.Surface((10, 10), pygame.SRCALPHA)
+        cache = SurfaceCache(max_bytes=one_flag.get_pitch() * 10 * 2)
+
+        cache.put(("italy", (10, 10)), one_flag)
+        cache.put(("france", (10, 10)), pygame.Surface((10, 10), pygame.SRCALPHA))
+        cache.get(("italy", (10, 10)))
+        cache.put(("spain", (10, 10)), pygame.Surface((10, 10), pygame.SRCALPHA))
+
+        self.assertIsNotNone(cache.get(("italy", (10, 10))))
+        self.assertIsNone(cache.get(("france", (10, 10))))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+
+    def test_disk_cache_serves_prescaled_pixels_and_rebuilds_when_source_changes(self):
+        cache_dir = os.path.join(self._tmpdir.name, "flag_cache")
+        self.loader.disk_cache = FlagDiskCache(cache_dir)
+        flag_path = self.loader.flag_path("italy", "europe")
+
+        first = self.loader.load_flag_image("italy", flag_path, (12, 8))
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        cached = self.loader.load_flag_image("italy", flag_path, (12, 8))
+        self.assertEqual(cached.get_size(), (12, 8))
+        self.assertEqual(cached.get_at((0, 0))[:3], first.get_at((0, 0))[:3])
+
+        replacement = pygame.Surface((30, 20))
+        replacement.fill((206, 43, 55))
+        pygame.image.save(replacement, flag_path)
+
+        rebuilt = self.loader.load_flag_image("italy", flag_path, (12, 8))
+        self.assertEqual(rebuilt.get_at((0, 0))[:3], (206, 43, 55))
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,26 @@
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
 import unittest
 
+from flagguessr.application.headless import (
+    MemoryScoreRepository,
+    RandomPlayer,
+    ScriptedPlayer,
+    create_headless_engine,
+)
 from flagguessr.application.use_cases import GameService
+from flagguessr.app import simulate
 from flagguessr.domain.models import GameConfig, GuessStatus
 
 
 class FakeScoreRepository:
     def __init__(self):
         self.saved = []
+        self.queries = 0
 
     def initialize(self):
         return None
@@ -24,12 +38,20 @@ class FakeScoreRepository:
         )
 
     def get_top_scores(self, gamemode, filter_mode="all", limit=10):
-        return []
+        self.queries += 1
+        return [row for row in self.saved if row["map"] == gamemode][:limit]
+
+    def close(self):
+        return None
 
 
 class FakeFlagCatalog:
-    def __init__(self, countries_map):
+    def __init__(self, countries_map, aliases=None, broken=()):
         self.countries_map = countries_map
+        self.aliases = aliases or {}
+        # Countries whose flag image fails to decode.
+        self.broken = set(broken)
+        self.prefetched = []
 
     def initialize(self):
         return None
@@ -40,6 +62,21 @@ class FakeFlagCatalog:
     def load_flag_images(self, countries, size):
         return {name: object() for name in countries.keys()}
 
+    def prefetch_flags(self, flag_images, countries):
+        self.prefetched.append(list(countries))
+
+    def is_flag_ready(self, flag_images, country):
+        return country in flag_images
+
+    def is_flag_available(self, flag_images, country):
+        return country in flag_images and country not in self.broken
+
+    def load_aliases(self):
+        return self.aliases
+
+    def close(self):
+        return None
+
 
 class TestGameService(unittest.TestCase):
     def test_start_game_normal_initializes_session(self):
@@ -84,6 +121,197 @@ class TestGameService(unittest.TestCase):
         self.assertEqual(result.status, GuessStatus.GAME_OVER)
         self.assertEqual(len(score_repo.saved), 1)
 
+    def test_guesses_accept_aliases_and_typos(self):
+        score_repo = FakeScoreRepository()
+        flags = FakeFlagCatalog(
+            {"united kingdom": "europe", "netherlands": "europe", "niger": "africa", "nigeria": "africa"},
+            aliases={"united kingdom": ["uk"], "netherlands": ["holland"]},
+        )
+        service = GameService(score_repo, flags, GameConfig(max_lives=5))
+        running_game = service.start_game("endless", "europe", (100, 60), now_ms=0).running_game
+
+        answers = {"united kingdom": " UK ", "netherlands": "Hollnd", "nigeria": "nigera", "niger": "Niger"}
+        for _ in range(4):
+            result = service.submit_guess(running_game, answers[running_game.current_country], now_ms=0)
+            self.assertIn(result.status, (GuessStatus.CORRECT, GuessStatus.VICTORY))
+
+        self.assertEqual(running_game.autocomplete.complete("holl"), ["netherlands"])
+
+        wrong = {"united kingdom": "ireland", "netherlands": "niger", "nigeria": "niger", "niger": "nigeria"}
+        result = service.submit_guess(running_game, wrong[running_game.current_country], now_ms=0)
+        self.assertEqual(result.status, GuessStatus.WRONG)
+
+    def test_rankings_are_cached_until_a_matching_score_is_saved(self):
+        score_repo = FakeScoreRepository()
+        flags = FakeFlagCatalog({"italy": "europe"})
+        service = GameService(score_repo, flags, GameConfig(max_lives=1))
+
+        service.get_rankings("europe", "all")
+        service.get_rankings("europe", "all")
+        service.get_rankings("asia", "blitz")
+        self.assertEqual(score_repo.queries, 2)
+        self.assertEqual(service.rankings_cache.stats()["hits"], 1)
+
+        start = service.start_game("endless", "europe", (100, 60), now_ms=1000)
+        service.submit_guess(start.running_game, "spain", now_ms=1200)
+
+        self.assertEqual(len(service.get_rankings("europe", "all")), 1)
+        service.get_rankings("asia", "blitz")
+        self.assertEqual(score_repo.queries, 3)
+
+    def test_running_game_keeps_one_strategy_and_prefetches_upcoming_flags(self):
+        countries = {f"country-{i}": "europe" for i in range(20)}
+        score_repo = FakeScoreRepository()
+        flags = FakeFlagCatalog(countries)
+        service = GameService(score_repo, flags, GameConfig(flag_prefetch_count=2), rng=random.Random(3))
+
+        running_game = service.start_game("normal", "europe", (100, 60), now_ms=0).running_game
+        strategy = running_game.strategy
+        index = running_game.country_index
+
+        result = None
+        while result is None or result.status == GuessStatus.CORRECT:
+            upcoming = flags.prefetched[-1][1:]
+            result = service.submit_guess(running_game, running_game.current_country, now_ms=0)
+            if result.status == GuessStatus.CORRECT:
+                self.assertEqual(running_game.current_country, upcoming[0])
+
+        self.assertEqual(result.status, GuessStatus.VICTORY)
+        self.assertIs(running_game.strategy, strategy)
+        self.assertIs(running_game.country_index, index)
+        self.assertEqual(sorted(running_game.session.countries_sequence), sorted(countries))
+
+    def test_flags_that_fail_to_decode_are_never_drawn(self):
+        countries = {f"country-{i}": "europe" for i in range(8)}
+        broken = {"country-2", "country-5"}
+        flags = FakeFlagCatalog(countries, broken=broken)
+        service = GameService(FakeScoreRepository(), flags, GameConfig(), rng=random.Random(11))
+
+        running_game = service.start_game("normal", "europe", (100, 60), now_ms=0).running_game
+        result = None
+        while result is None or result.status == GuessStatus.CORRECT:
+            result = service.submit_guess(running_game, running_game.current_country, now_ms=0)
+
+        self.assertEqual(result.status, GuessStatus.VICTORY)
+        self.assertEqual(sorted(running_game.session.countries_sequence), sorted(set(countries) - broken))
+        self.assertFalse(broken & set(running_game.country_index))
+
+    def test_autocomplete_tries_are_shared_per_map_and_bounded(self):
+        flags = FakeFlagCatalog({"italy": "europe", "france": "europe"})
+        service = GameService(FakeScoreRepository(), flags, GameConfig())
+        service.autocomplete_cache.max_entries = 2
+
+        first = service.start_game("normal", "europe", (100, 60), now_ms=0).running_game
+        second = service.start_game("endless", "europe", (100, 60), now_ms=0).running_game
+        self.assertIs(first.autocomplete, second.autocomplete)
+
+        for map_name in ("asia", "africa", "oceania"):
+            service.start_game("normal", map_name, (100, 60), now_ms=0)
+        self.assertEqual(list(service.autocomplete_cache.entries), ["africa", "oceania"])
+        self.assertEqual(service.autocomplete_cache.stats()["hits"], 1)
+
+    def test_loading_progress_and_timer_start_when_the_game_is_shown(self):
+        score_repo = FakeScoreRepository()
+        flags = FakeFlagCatalog({f"country-{i}": "europe" for i in range(10)})
+        service = GameService(score_repo, flags, GameConfig(flag_prefetch_count=3))
+
+        running_game = service.start_game("blitz", "europe", (100, 60), now_ms=100).running_game
+
+        self.assertTrue(service.is_current_flag_ready(running_game))
+        self.assertEqual(service.flag_load_progress(running_game), (4, 4))
+        service.begin_game(running_game, now_ms=2500)
+        self.assertEqual(running_game.session.start_time_ms, 2500)
+
+        # Background starts all run on one persistent loader thread.
+        loaders = []
+        for _ in range(3):
+            future = service.start_game_in_background("normal", "europe", (100, 60), now_ms=0)
+            self.assertTrue(future.result(timeout=5).success)
+            loaders.append(service._loader)
+        self.assertEqual(len(set(map(id, loaders))), 1)
+        self.assertEqual(len([t for t in threading.enumerate() if t.name.startswith("game-loader")]), 1)
+        service.shutdown()
+
+    def test_background_initialization_is_awaited_before_loading_data(self):
+        release = threading.Event()
+        initialized = []
+
+        class SlowScoreRepository(FakeScoreRepository):
+            def initialize(self):
+                release.wait(5)
+                initialized.append(True)
+
+        service = GameService(SlowScoreRepository(), FakeFlagCatalog({"italy": "europe"}), GameConfig())
+        service.initialize_in_background()
+        self.assertFalse(service.wait_until_ready(timeout=0))
+        self.assertFalse(service.is_ready())
+
+        release.set()
+        result = service.start_game("normal", "europe", (100, 60), now_ms=0)
+
+        self.assertTrue(result.success)
+        self.assertTrue(service.is_ready())
+        self.assertEqual(initialized, [True])
+
+
+class TestHeadlessEngine(unittest.TestCase):
+    COUNTRIES = {f"country-{i:02d}": "europe" if i % 2 else "asia" for i in range(40)}
+
+    def test_scripted_blitz_runs_out_of_time_on_the_injected_clock(self):
+        scores = MemoryScoreRepository()
+        engine = create_headless_engine(self.COUNTRIES, score_repository=scores, seed=1)
+
+        result = engine.play("blitz", "europe", ScriptedPlayer([(True, 3000)] * 100))
+
+        # Guesses land every 3 s; the 20th arrives at the 60 s limit and is refused.
+        self.assertEqual(result.outcome, "timed_out")
+        self.assertEqual(result.score, 19)
+        self.assertEqual(result.duration_ms, 60_000)
+        self.assertEqual(scores.saved[-1]["time_taken"], 60)
+
+    def test_scripted_mistakes_end_the_game(self):
+        engine = create_headless_engine(self.COUNTRIES, seed=1)
+
+        result = engine.play("endless", "asia", ScriptedPlayer([(True, 500), ("nope", 500), (False, 500), (False, 500)]))
+
+        self.assertEqual((result.outcome, result.score, result.guesses, result.wrong), ("game_over", 1, 4, 3))
+        self.assertEqual(engine.play("normal", "asia", ScriptedPlayer([])).outcome, "gave_up")
+
+    def test_seeded_batches_are_reproducible(self):
+        def run():
+            engine = create_headless_engine(self.COUNTRIES, seed=42)
+            return engine.run_batch("normal", "europe", RandomPlayer(accuracy=0.9, typo_rate=0.5), sessions=50)
+
+        first, second = run(), run()
+
+        self.assertEqual(first.sessions, second.sessions)
+        summary = first.summary()
+        self.assertEqual(summary["sessions"], 50)
+        self.assertEqual(sum(summary["outcomes"].values()), 50)
+        self.assertIn("victory", summary["outcomes"])
+
+    def test_simulation_results_do_not_depend_on_the_worker_count(self):
+        player = RandomPlayer(accuracy=0.85)
+        tasks = simulate.plan_tasks(["normal", "blitz"], "europe", 30, 8, 7, player, GameConfig())
+
+        inline = simulate.run_simulation(tasks, self.COUNTRIES, {}, workers=1)
+        pooled = simulate.run_simulation(tasks, self.COUNTRIES, {}, workers=2)
+
+        self.assertEqual(inline.columns(), pooled.columns())
+        modes = inline.columns()["modes"]
+        self.assertEqual(modes["mode"], ["blitz", "normal"])
+        self.assertEqual(modes["games"], [30, 30])
+        countries = inline.columns()["countries"]
+        self.assertEqual(sum(countries["wrong"]), sum(inline.modes[mode].wrong for mode in modes["mode"]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json.gz")
+            simulate.write_results(path, inline, {"games": inline.games})
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        self.assertEqual(payload["format"], simulate.FORMAT)
+        self.assertEqual(payload["scores"], inline.columns()["scores"])
+
 
 if __name__ == "__main__":
     unittest.main()
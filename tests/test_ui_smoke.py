@@ -1,5 +1,8 @@
+import json
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 # Use headless video backend for CI/local smoke tests without opening windows.
 os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -10,7 +13,12 @@ except ModuleNotFoundError:
     pygame = None
 
 if pygame is not None:
+    from flagguessr.domain.matching import PrefixTrie
+    from flagguessr.domain.models import GameConfig, GameMode, GameSession, RunningGame
+    from flagguessr.presentation.controller import GameController
     from flagguessr.presentation.gui import GUI
+    from flagguessr.presentation.profiler import FrameProfiler
+    from flagguessr.presentation.states import GamePlayState
 
 
 class TestUISmoke(unittest.TestCase):
@@ -54,10 +62,113 @@ class TestUISmoke(unittest.TestCase):
         self.ui.showRankings(sample_scores, "europe")
         self.ui.showGameOver(5, ["spain", "france"], "europe")
         self.ui.showVictory(10, "europe")
+        self.ui.showLoading("normal", "europe", "Loading flags", 1, 4)
 
         # Ensure event queue stays healthy after multiple renders.
         pygame.event.pump()
 
+    def test_unchanged_frames_push_no_pixels(self):
+        with patch("pygame.mouse.get_pos", return_value=(0, 0)):
+            self.ui.showSplashScreen()
+            self.assertEqual(self.ui.frame.last_update_rects, [self.ui.screen.get_rect()])
+
+            self.ui.showSplashScreen()
+            self.assertEqual(self.ui.frame.last_update_rects, [])
+
+        with patch("pygame.mouse.get_pos", return_value=self.ui.play_button_rect.center):
+            self.ui.showSplashScreen()
+        self.assertEqual(self.ui.frame.last_update_rects, [self.ui.play_button_rect])
+
+    def test_repainting_reuses_cached_text_surfaces(self):
+        self.ui.showRankings([], "europe")
+        misses = self.ui.text_cache.misses
+
+        self.ui.invalidate()
+        self.ui.showRankings([], "europe")
+
+        self.assertEqual(self.ui.text_cache.misses, misses)
+        self.assertGreater(self.ui.text_cache.hits, 0)
+
+    def test_buttons_and_panels_are_rasterized_once_per_state(self):
+        self.ui.showModeSelection(["global", "europe"])
+        cached = len(self.ui.widget_cache)
+        misses = self.ui.widget_cache.misses
+
+        self.ui.invalidate()
+        self.ui.showModeSelection(["global", "europe"])
+
+        self.assertGreater(cached, 0)
+        self.assertEqual(self.ui.widget_cache.misses, misses)
+
+    def test_static_screens_idle_until_an_event_arrives(self):
+        controller = GameController(self.ui, game_service=None, config=GameConfig(), gamemodes=["europe"])
+        controller.IDLE_TIMEOUT_MS = 10
+
+        self.assertFalse(controller.state.is_animated())
+        pygame.event.clear()
+        self.assertEqual(controller._next_events(), [])
+
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        self.assertEqual([event.type for event in controller._next_events()], [pygame.USEREVENT])
+
+        self.ui.show_error_message("Wrong!")
+        self.assertTrue(controller.state.is_animated())
+
+    def test_typing_updates_suggestions_under_the_input_box(self):
+        countries = {"united kingdom": "europe", "ukraine": "europe", "italy": "europe"}
+        controller = GameController(self.ui, game_service=None, config=GameConfig(), gamemodes=["europe"])
+        controller.active_game = RunningGame(
+            session=GameSession(mode=GameMode.NORMAL, map_name="europe", score=0, lives=3),
+            countries=countries,
+            flag_images={name: pygame.Surface(self.ui.getFlagSize()) for name in countries},
+            current_country="italy",
+            autocomplete=PrefixTrie({"united kingdom": ["uk"], "ukraine": [], "italy": []}),
+        )
+        controller.change_state(GamePlayState)
+
+        def key(char, code=None):
+            event = pygame.event.Event(pygame.KEYDOWN, key=code or ord(char), unicode=char)
+            controller.state.handle_event(event)
+
+        for char in "Uk":
+            key(char)
+        self.assertEqual(self.ui.suggestions, ["united kingdom", "ukraine"])
+        controller.state.render()
+        self.assertEqual(len(self.ui.suggestion_rects), 2)
+        self.assertTrue(all(rect.top > self.ui.input_border.bottom for _, rect in self.ui.suggestion_rects))
+
+        key("r")
+        self.assertEqual(self.ui.suggestions, ["ukraine"])
+        key("", pygame.K_BACKSPACE)
+        key("", pygame.K_TAB)
+        self.assertEqual(self.ui.get_input_text(), "united kingdom")
+        self.assertEqual(self.ui.suggestions, [])
+
+    def test_profiler_records_screen_costs_and_exports_json(self):
+        profiler = FrameProfiler(enabled=True, capacity=4)
+        profiler.instrument(self.ui)
+        for _ in range(6):
+            profiler.begin_frame()
+            with profiler.phase("render"):
+                self.ui.showSplashScreen()
+            profiler.end_frame()
+
+        summary = profiler.summary()
+        self.assertEqual(summary["frame"]["count"], 4)
+        self.assertIn("showSplashScreen", summary)
+        self.assertIn("present", summary)
+
+        overlay = profiler.draw_overlay(self.ui)
+        self.ui.showSplashScreen()
+        self.assertTrue(any(rect.colliderect(overlay) for rect in self.ui.frame.last_update_rects))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = profiler.export(os.path.join(tmp, "profile.json"))
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        self.assertEqual(len(payload["frames"]), 4)
+        self.assertIn("p99_ms", payload["summary"]["render"])
+
 
 if __name__ == "__main__":
     unittest.main()